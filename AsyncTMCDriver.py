@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from TMCDriver import TMCDriver
+from TMCStatus import TMCStatus
+
+_executors: {str: ThreadPoolExecutor} = {}
+
+
+def bus_executor(spi_bus, spi_device) -> ThreadPoolExecutor:
+    # One worker per /dev/spidevX.Y serialises every coroutine's transfers on that device
+    path = f'/dev/spidev{spi_bus}.{spi_device}'
+
+    if path not in _executors:
+        _executors[path] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=path)
+
+    return _executors[path]
+
+
+class AsyncTMCDriver():
+    def __init__(self, driver, executor: ThreadPoolExecutor):
+        self.__driver = driver
+        self.__executor = executor
+        self.__names = {RegisterClass.name for RegisterClass in driver.REGISTERS}
+        self.__readable = driver.readable()
+        self.__pending_names = set()
+        self.__pending_futures = []
+
+    @classmethod
+    async def open(cls, spi_bus, spi_device, driver_class = TMCDriver):
+        executor = bus_executor(spi_bus, spi_device)
+        driver = await asyncio.get_running_loop().run_in_executor(executor, driver_class, spi_bus, spi_device)
+        return cls(driver, executor)
+
+    @property
+    def driver(self):
+        return self.__driver
+
+    def __getattr__(self, name):
+        # Registers and status flags are served from the last values read. Registers come back as
+        # read-only copies of the cached word, so a field access never does blocking I/O on the
+        # event loop, whatever the register's ttl; await refresh() or read() to update them
+        if name in self.__names:
+            return getattr(self.__driver, name).cached()
+
+        return getattr(self.__driver, name)
+
+    async def read(self, *names):
+        # Reads requested by any coroutine during the same loop iteration are merged into
+        # one pipelined batch on the bus worker
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if len(self.__pending_futures) == 0:
+            loop.call_soon(self.__dispatch_reads)
+
+        self.__pending_names.update(names or [None])
+        self.__pending_futures.append(future)
+
+        await future
+
+    async def refresh(self, *names):
+        # Reads the given registers, or all of them, that are not loaded yet or whose ttl has
+        # expired, as one batch on the bus worker
+        stale = [name for name in (names or self.__readable) if getattr(self.__driver, name).stale]
+        if len(stale) > 0:
+            await self.read(*stale)
+
+    async def assign(self, name: str, values: {str: object}, dirty: bool = None) -> bool:
+        # Sets fields for the next flush; runs on the bus worker since it may load the register first
+        register = getattr(self.__driver, name)
+        return await self.__run(register.assign, values, dirty)
+
+    async def flush(self, verify = False):
+        await self.__run(self.__driver.flush, verify)
+
+    async def close(self):
+        await self.__run(self.__driver.close)
+
+    async def changes(self, name: str, interval: float):
+        # Yields the fields of a register whose values changed since the previous read
+        register = getattr(self.__driver, name)
+        previous = None
+
+        while True:
+            await self.read(name)
+            values = register.cached().values()
+
+            if previous is None:
+                yield values
+            else:
+                changed = {field: value for field, value in values.items() if previous[field] != value}
+                if len(changed) > 0:
+                    yield changed
+
+            previous = values
+            await asyncio.sleep(interval)
+
+    async def status_changes(self, interval: float):
+        # Every reply carries the status byte, so a single status transfer refreshes the flags
+        previous = None
+
+        while True:
+            status = await self.__run(self.__driver.poll_status)
+
+            if previous is not None and status != previous:
+                yield {flag.name.lower(): bool(status & flag) for flag in TMCStatus if (status ^ previous) & flag}
+
+            previous = status
+            await asyncio.sleep(interval)
+
+    async def __run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    def __dispatch_reads(self):
+        names, futures = self.__pending_names, self.__pending_futures
+        self.__pending_names, self.__pending_futures = set(), []
+
+        # A request without names asks for the full sweep, which covers everything else
+        names = () if None in names else tuple(names)
+        task = asyncio.ensure_future(self.__run(self.__driver.read, *names))
+        task.add_done_callback(lambda task: AsyncTMCDriver.__resolve(task, futures))
+
+    @staticmethod
+    def __resolve(task: asyncio.Future, futures: [asyncio.Future]):
+        for future in futures:
+            if future.cancelled():
+                continue
+            if task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(None)
@@ -0,0 +1,91 @@
+import json
+import os
+import zlib
+
+DEFAULT_REGISTERS = ['chopconf', 'coolconf', 'ihold_irun', 'pwmconf', 'drv_conf', 'global_scaler']
+
+
+class ConfigProfile():
+    # Register configuration keyed by register and field names from the value_maps, e.g.
+    # {"chopconf": {"toff": 3, "tbl": 2}, "ihold_irun": {"irun": 20}}
+    def __init__(self, values: {str: {str: object}}):
+        self.values = values
+
+    @classmethod
+    def capture(cls, driver, names = DEFAULT_REGISTERS):
+        # Takes the writable fields of the given registers from the driver's current shadow copy.
+        # Write-only registers are left out until they have been assigned or written through this
+        # driver, since their shadow starts as zeros; the profile's values name the registers taken
+        values = {}
+
+        for name in names:
+            register = getattr(driver, name)
+            if not register.known:
+                continue
+            values[name] = {field: value for field, value in register.values().items() if _writable(register, field)}
+
+        return cls(values)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.values, f, indent=2)
+
+    def checksum(self) -> int:
+        return zlib.crc32(json.dumps(self.values, sort_keys=True).encode())
+
+    def apply(self, driver, verify = True, state_path: str = None, key: str = 'default') -> [str]:
+        # Reads the current words of the readable registers in one batch and writes only those
+        # that differ. Write-only registers cannot be compared, so they are skipped only when the
+        # state file says this profile was applied and the chip has not reset since.
+        # Returns the names of the registers that were written
+        registers = {name: getattr(driver, name) for name in self.values}
+
+        for name, fields in self.values.items():
+            for field in fields:
+                if field not in registers[name]._fields or not _writable(registers[name], field):
+                    raise Exception(f"{name}.{field} is not a writable field")
+
+        readable = [name for name, register in registers.items() if not register.writeonly]
+        driver.read(*(readable or ['gconf']))
+
+        checksum = self.checksum()
+        state = _load_state(state_path)
+        skip_writeonly = state.get(key) == checksum and not driver.reset_flag
+
+        written = []
+        for name, register in registers.items():
+            dirty = (not skip_writeonly) if register.writeonly else None
+            if register.assign(self.values[name], dirty):
+                written.append(name)
+
+        driver.flush(verify=verify)
+
+        if driver.reset_flag and hasattr(driver, 'gstat'):
+            # Acknowledge the reset so the next warm start can trust the write-only registers
+            gstat = driver.gstat
+            gstat.assign({field: field == 'reset' for field in gstat._fields}, True)
+            gstat.write()
+
+        if state_path is not None:
+            state[key] = checksum
+            with open(state_path, 'w') as f:
+                json.dump(state, f, indent=2)
+
+        return written
+
+
+def _writable(register, field: str) -> bool:
+    return getattr(type(register), field).fset is not None
+
+
+def _load_state(path: str) -> {str: int}:
+    if path is None or not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+import numpy as np
+from timing import sleep_until
+
+# Coil currents are 9-bit signed values
+COIL_MAX = 255
+
+
+def sine_table(samples: int, amplitude: int = 248) -> (np.ndarray, np.ndarray):
+    # One electrical period of a sine/cosine microstep table, for coil A and coil B
+    phase = 2 * np.pi * np.arange(samples) / samples
+    return np.rint(amplitude * np.sin(phase)).astype(np.int16), np.rint(amplitude * np.cos(phase)).astype(np.int16)
+
+
+class DirectModeStream():
+    # Drives the coil currents of a TMC2240 from the host: waveform tables are turned into
+    # complete write datagrams for the direct_mode register once, when loaded, and a thread
+    # clocks them out at a fixed rate with no read-backs. A late sample delays the rest of the
+    # table rather than bursting to catch up; one that went out a whole period late counts as
+    # an underrun. Transfers go straight to the transport, so metrics and trace do not see them
+    def __init__(self, driver, rate: float, spin = 0.0002):
+        if not any(RegisterClass.name == 'direct_mode' and RegisterClass.address == 0x2D for RegisterClass in driver.REGISTERS):
+            raise Exception(f"{type(driver).__name__} has no direct mode coil register")
+        if not hasattr(driver.spi, 'writer'):
+            raise Exception(f"{type(driver.spi).__name__} cannot stream; use TMCSPIWrapper or TMCSPIArbiter")
+
+        self.__driver = driver
+        self.__period = 1.0 / rate
+        self.__spin = spin
+        self.__frames = []
+        self.__words = None
+
+        self.__thread = None
+        self.__abort = threading.Event()
+        self.__stats = None
+        self.__error = None
+
+    def load(self, coil_a: np.ndarray, coil_b: np.ndarray):
+        coil_a = np.asarray(coil_a)
+        coil_b = np.asarray(coil_b)
+
+        if coil_a.shape != coil_b.shape or coil_a.ndim != 1 or len(coil_a) == 0:
+            raise Exception("Coil tables must be one-dimensional and of equal, non-zero length")
+        if np.abs(coil_a).max() > COIL_MAX or np.abs(coil_b).max() > COIL_MAX:
+            raise Exception(f"Coil currents must lie within -{COIL_MAX}..{COIL_MAX}")
+        if self.running:
+            raise Exception("Cannot load a table while streaming")
+
+        words = ((coil_b.astype(np.int64) & 0x1FF) << 16) | (coil_a.astype(np.int64) & 0x1FF)
+
+        datagrams = np.empty((len(words), 5), dtype=np.uint8)
+        datagrams[:, 0] = self.__driver.direct_mode.address | 0x80
+        for index, shift in enumerate([24, 16, 8, 0]):
+            datagrams[:, index + 1] = (words >> shift) & 0xFF
+
+        # One view per sample into a single buffer, sliced here so the stream loop allocates nothing
+        buffer = memoryview(datagrams.tobytes())
+        self.__frames = [buffer[offset:offset + 5] for offset in range(0, len(buffer), 5)]
+        self.__words = words
+
+    def start(self, repeat: int = None):
+        # Streams the loaded table, repeat times or until stop() when repeat is None. The chip
+        # stays in direct mode, holding the last sample, until stop()
+        if self.running:
+            raise Exception("Already streaming")
+        if len(self.__frames) == 0:
+            raise Exception("No table loaded")
+
+        driver = self.__driver
+        driver.gconf.assign({'direct_mode': True})
+        driver.flush()
+
+        self.__abort.clear()
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__stream, args=(repeat,), name='DirectModeStream', daemon=True)
+        self.__thread.start()
+
+    def wait(self, timeout: float = None) -> {str: float}:
+        # Raises if the stream failed; the chip has then already been taken out of direct mode
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+        if self.__error is not None:
+            raise Exception("Direct mode stream failed") from self.__error
+
+        return self.stats
+
+    def stop(self):
+        # Returns the chip to its own sequencer
+        self.__abort.set()
+        try:
+            self.wait()
+        finally:
+            self.__leave_direct_mode()
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def stats(self) -> {str: float}:
+        return self.__stats
+
+    def __stream(self, repeat: int):
+        try:
+            with self.__driver.spi.writer() as write:
+                sent = self.__emit(write, repeat)
+
+            # The chip now holds the last sample that went out; keep the shadow copy in step with
+            # it. This may read the register, so it waits until the bus has been handed back
+            if sent > 0:
+                word = int(self.__words[(sent - 1) % len(self.__frames)])
+                self.__driver.direct_mode.assign({'direct_coil_a': word & 0x1FF, 'direct_coil_b': word >> 16}, False)
+        except Exception as error:
+            logging.exception("Direct mode stream failed")
+            self.__error = error
+            self.__leave_direct_mode()
+
+    def __leave_direct_mode(self):
+        driver = self.__driver
+        driver.gconf.assign({'direct_mode': False})
+        driver.flush()
+
+    def __emit(self, write, repeat: int) -> int:
+        frames = self.__frames
+        period = self.__period
+        spin = self.__spin
+        abort = self.__abort
+
+        sent = 0
+        underruns = 0
+        max_lateness = 0.0
+        start = time.perf_counter()
+        deadline = start
+        passes = 0
+
+        while (repeat is None or passes < repeat) and not abort.is_set():
+            for frame in frames:
+                if abort.is_set():
+                    break
+                sleep_until(deadline, spin)
+                write(frame)
+                lateness = time.perf_counter() - deadline
+                if lateness > max_lateness:
+                    max_lateness = lateness
+                if lateness > period:
+                    underruns += 1
+                    deadline += lateness
+                deadline += period
+                sent += 1
+            passes += 1
+
+        elapsed = time.perf_counter() - start
+
+        self.__stats = {
+            'samples':          sent,
+            'duration_s':       elapsed,
+            'requested_hz':     1.0 / period,
+            'achieved_hz':      sent / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_s':      sent * 5 / elapsed if elapsed > 0 else 0.0,
+            'underruns':        underruns,
+            'max_lateness_us':  max_lateness * 1e6,
+        }
+        return sent
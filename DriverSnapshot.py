@@ -0,0 +1,52 @@
+from typing import NamedTuple
+from TMCStatus import TMCStatus
+
+
+class DriverSnapshot(NamedTuple):
+    # Raw register words in the order of the driver's REGISTERS, plus the status byte and the
+    # perf_counter time they were taken at. Fields are only decoded when asked for
+    layout: tuple
+    words: tuple
+    status: int
+    timestamp: float
+
+    def word(self, name: str) -> int:
+        return self.words[self.__index(name)]
+
+    def fields(self, name: str) -> {str: object}:
+        index = self.__index(name)
+        return _decode(self.layout[index], self.words[index])
+
+    def diff(self, other: 'DriverSnapshot') -> {str: {str: (object, object)}}:
+        # Fields whose values differ from an earlier snapshot, as {register: {field: (old, new)}}
+        if self.layout != other.layout:
+            raise Exception("Snapshots were taken from different register maps")
+
+        changes = {}
+
+        for RegisterClass, old_word, new_word in zip(self.layout, other.words, self.words):
+            if old_word == new_word:
+                continue
+
+            old, new = _decode(RegisterClass, old_word), _decode(RegisterClass, new_word)
+            changes[RegisterClass.name] = {field: (old[field], new[field]) for field in new if old[field] != new[field]}
+
+        if self.status != other.status:
+            changed = self.status ^ other.status
+            changes['status'] = {
+                flag.name.lower(): (bool(other.status & flag), bool(self.status & flag))
+                for flag in TMCStatus if changed & flag
+            }
+
+        return changes
+
+    def __index(self, name: str) -> int:
+        for index, RegisterClass in enumerate(self.layout):
+            if RegisterClass.name == name:
+                return index
+
+        raise Exception(f"No register named {name}")
+
+
+def _decode(RegisterClass, word: int) -> {str: object}:
+    return RegisterClass.decode(word).values()
@@ -0,0 +1,185 @@
+import threading
+import time
+import numpy as np
+from Motor import Motor
+from timing import sleep_until
+
+
+def trapezoidal_profile(steps: int, vmax: float, accel: float) -> np.ndarray:
+    # Time at which each step is reached, inverted from the position curve of a
+    # constant-acceleration ramp; returns the interval before each pulse
+    position = np.arange(1, steps + 1, dtype=np.float64)
+
+    ramp_steps = vmax * vmax / (2 * accel)
+    if 2 * ramp_steps > steps:
+        # Triangular move: vmax is never reached
+        ramp_steps = steps / 2
+        vmax = np.sqrt(accel * steps)
+
+    ramp_time = vmax / accel
+    total_time = 2 * ramp_time + (steps - 2 * ramp_steps) / vmax
+
+    times = np.where(
+        position <= ramp_steps,
+        np.sqrt(2 * position / accel),
+        np.where(
+            position <= steps - ramp_steps,
+            ramp_time + (position - ramp_steps) / vmax,
+            total_time - np.sqrt(2 * np.maximum(steps - position, 0) / accel)))
+
+    return np.diff(times, prepend=0.0)
+
+
+def s_curve_profile(steps: int, vmax: float, accel: float, jerk: float) -> np.ndarray:
+    # Jerk-limited ramp: integrate the seven-segment velocity curve on a grid a few
+    # points per step wide, then interpolate the time each step is crossed
+    def ramp(velocity):
+        if velocity >= accel * accel / jerk:
+            jerk_time = accel / jerk
+            accel_time = velocity / accel - jerk_time
+        else:
+            jerk_time = np.sqrt(velocity / jerk)
+            accel_time = 0.0
+        ramp_time = 2 * jerk_time + accel_time
+        return jerk_time, accel_time, ramp_time, velocity * ramp_time / 2
+
+    jerk_time, accel_time, ramp_time, ramp_steps = ramp(vmax)
+    if 2 * ramp_steps > steps:
+        low, high = 0.0, vmax
+        for _ in range(60):
+            vmax = (low + high) / 2
+            if 2 * ramp(vmax)[3] > steps:
+                high = vmax
+            else:
+                low = vmax
+        vmax = low
+        jerk_time, accel_time, ramp_time, ramp_steps = ramp(vmax)
+
+    cruise_time = (steps - 2 * ramp_steps) / vmax
+    total_time = 2 * ramp_time + cruise_time
+
+    grid = np.linspace(0.0, total_time, 4 * steps + 1)
+    peak_accel = jerk * jerk_time
+
+    def ramp_velocity(t):
+        return np.where(
+            t < jerk_time,
+            jerk * t * t / 2,
+            np.where(
+                t < jerk_time + accel_time,
+                jerk * jerk_time * jerk_time / 2 + peak_accel * (t - jerk_time),
+                vmax - jerk * (ramp_time - np.minimum(t, ramp_time)) ** 2 / 2))
+
+    velocity = np.where(
+        grid < ramp_time,
+        ramp_velocity(grid),
+        np.where(grid <= ramp_time + cruise_time, vmax, ramp_velocity(np.maximum(total_time - grid, 0.0))))
+
+    travelled = np.concatenate(([0.0], np.cumsum((velocity[1:] + velocity[:-1]) / 2 * np.diff(grid))))
+    travelled *= steps / travelled[-1]
+
+    times = np.interp(np.arange(1, steps + 1, dtype=np.float64), travelled, grid)
+    return np.diff(times, prepend=0.0)
+
+
+class MotionEngine():
+    def __init__(self, motor: Motor, spin = 0.0002, slip = 0.0001):
+        self.__motor = motor
+        self.__spin = spin
+        self.__slip = slip
+        self.__thread = None
+        self.__abort = threading.Event()
+        self.__stats = None
+
+    def move(self, steps: int, vmax: float, accel: float, jerk: float = None):
+        # Checked here as well as in run(): a rejected move must not flip DIR under the running one
+        if self.running:
+            raise Exception("A move is already running")
+
+        if steps < 0:
+            self.__motor.back()
+        else:
+            self.__motor.forward()
+
+        if jerk is None:
+            intervals = trapezoidal_profile(abs(steps), vmax, accel)
+        else:
+            intervals = s_curve_profile(abs(steps), vmax, accel, jerk)
+
+        self.run(intervals)
+
+    def run(self, intervals: np.ndarray):
+        if self.__thread is not None and self.__thread.is_alive():
+            raise Exception("A move is already running")
+
+        self.__abort.clear()
+        self.__thread = threading.Thread(target=self.__emit, args=(np.asarray(intervals, dtype=np.float64),), name='MotionEngine', daemon=True)
+        self.__thread.start()
+
+    def wait(self, timeout: float = None) -> {str: float}:
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+        return self.stats
+
+    def stop(self):
+        self.__abort.set()
+        self.wait()
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def stats(self) -> {str: float}:
+        return self.__stats
+
+    def __emit(self, intervals: np.ndarray):
+        pulse = self.__motor.pulse
+        spin = self.__spin
+        slip = self.__slip
+        abort = self.__abort
+
+        start = time.perf_counter()
+        deadlines = (start + np.cumsum(intervals)).tolist()
+        scheduled = np.empty(len(deadlines), dtype=np.float64)
+        actual = np.empty(len(deadlines), dtype=np.float64)
+
+        # A pulse that went out late delays the rest of the table rather than letting the
+        # following pulses burst out to catch up, which would break the acceleration limit
+        offset = 0.0
+        count = 0
+        for deadline in deadlines:
+            if abort.is_set():
+                break
+            deadline += offset
+            sleep_until(deadline, spin)
+            pulse()
+            now = time.perf_counter()
+            if now - deadline > slip:
+                offset += now - deadline
+            scheduled[count] = deadline
+            actual[count] = now
+            count += 1
+
+        self.__stats = MotionEngine.__statistics(intervals[:count], scheduled[:count], actual[:count])
+
+    @staticmethod
+    def __statistics(intervals: np.ndarray, scheduled: np.ndarray, actual: np.ndarray) -> {str: float}:
+        if len(actual) < 2:
+            return {'steps': len(actual)}
+
+        lateness = actual - scheduled
+        periods = np.diff(actual)
+        requested_periods = intervals[1:]
+
+        return {
+            'steps':                  len(actual),
+            'duration_s':             float(actual[-1] - actual[0]),
+            'mean_rate_hz':           float(len(periods) / (actual[-1] - actual[0])),
+            'peak_rate_hz':           float(1 / periods.min()),
+            'requested_peak_rate_hz': float(1 / requested_periods.min()),
+            'mean_lateness_us':       float(lateness.mean() * 1e6),
+            'max_lateness_us':        float(lateness.max() * 1e6),
+            'jitter_us':              float(np.std(periods - requested_periods) * 1e6),
+        }
@@ -10,20 +10,32 @@ class Motor():
 
         self.pins = [stepPin, dirPin]
 
+        # Steps commanded so far, counting forward as positive
+        self.position = 0
+        self.direction = 1
+
         GPIO.setmode(GPIO.BOARD)    
         GPIO.setup(self.pins, GPIO.OUT, initial=GPIO.LOW)
 
     def back(self):
         GPIO.output(self.dirPin, GPIO.HIGH)
+        self.direction = -1
 
     def forward(self):
         GPIO.output(self.dirPin, GPIO.LOW)
+        self.direction = 1
 
     def close(self): 
         GPIO.cleanup(self.pins)
 
+    def pulse(self):
+        GPIO.output(self.stepPin, GPIO.HIGH)
+        GPIO.output(self.stepPin, GPIO.LOW)
+        self.position += self.direction
+
     def step(self, delay = 3*MICROSECONDS):
         GPIO.output(self.stepPin, GPIO.HIGH)
         time.sleep(delay)
         GPIO.output(self.stepPin, GPIO.LOW)
+        self.position += self.direction
         time.sleep(delay)
\ No newline at end of file
@@ -0,0 +1,170 @@
+import json
+import os
+import random
+import time
+from TMCStatus import TMCStatus
+
+# Candidate clocks, slowest first; those above the driver's MAX_SPI_HZ are left out
+SPEEDS = [500000, 1000000, 2000000, 3000000, 4000000, 5000000, 6000000, 8000000, 10000000]
+
+# Registers that take arbitrary test patterns and are restored afterwards. The TMC2240 coil
+# currents are a true scratch register as long as direct mode is off. The TMC5160 has none, so
+# its encoder counter stands in: counts arriving during calibration would be overwritten by the
+# restore, so the axis must be at standstill with the encoder idle
+SCRATCH_REGISTERS = ['direct_mode', 'x_enc']
+
+# How long the encoder must hold still before x_enc is borrowed
+IDLE_WINDOW = 0.05
+
+PATTERNS = [0xAAAAAAAA, 0x55555555, 0xFFFFFFFF, 0x00000000]
+
+
+class SPIClockCalibration():
+    # Steps the SPI clock up through the candidate speeds and checks each one with trials of
+    # a write/read-back of a scratch register, with ioin.version read in between. The first
+    # speed with an error ends the search; the result is the fastest clean speed less a safety
+    # margin, re-verified. Results can be saved per bus and device, and loaded when opening
+    # the bus later:
+    #
+    #   speed_hz = SPIClockCalibration.load('spi_clock.json', 0, 0)
+    #   driver = TMCDriver(spi=TMCSPIWrapper(0, 0, speed_hz=speed_hz))
+    #
+    # On a chip opened through TMCBus the clock is that of the whole chain. Every frame passes
+    # through every chip, so calibrating any one of them covers the chain's chip select
+    def __init__(self, driver, speeds: [int] = SPEEDS, trials = 64, margin = 0.2):
+        self.__driver = driver
+        self.__speeds = sorted(speed for speed in speeds if speed <= driver.MAX_SPI_HZ)
+        if len(self.__speeds) == 0:
+            raise Exception(f"No candidate clock within the {driver.MAX_SPI_HZ} Hz limit of {type(driver).__name__}")
+        self.__trials = trials
+        self.__margin = margin
+
+        scratch = [name for name in SCRATCH_REGISTERS if any(RegisterClass.name == name for RegisterClass in driver.REGISTERS)]
+        if len(scratch) == 0:
+            raise Exception(f"{type(driver).__name__} has no scratch register to test with")
+
+        self.__scratch = getattr(driver, scratch[0])
+        self.__ioin = driver.ioin
+
+    def run(self) -> {str: object}:
+        spi = self.__driver.spi
+        safe_speed = spi.speed_hz
+        scratch, ioin = self.__scratch, self.__ioin
+        self.__check_idle()
+
+        # The reference values come from the clock the bus was opened with
+        original, reference = spi.read_many([scratch.address, ioin.address])
+        original = _word(original)
+        version = _word(reference) >> 24
+        if version == 0:
+            raise Exception("No chip answered at the starting clock")
+
+        results = []
+        try:
+            for speed in self.__speeds:
+                spi.speed_hz = speed
+                errors, rate = self.__trial(version)
+                results.append({'speed_hz': speed, 'errors': errors, 'bytes_per_s': rate})
+                if errors > 0:
+                    break
+        finally:
+            spi.speed_hz = safe_speed
+            spi.write(scratch.address, _bytes(original))
+
+        passed = [result['speed_hz'] for result in results if result['errors'] == 0]
+        if len(passed) == 0:
+            raise Exception(f"Errors at every clock, the slowest was {self.__speeds[0]} Hz")
+
+        fastest = max(passed)
+        speed = max(self.__speeds[0], int(fastest * (1 - self.__margin)))
+
+        try:
+            spi.speed_hz = speed
+            errors, rate = self.__trial(version)
+        finally:
+            spi.write(scratch.address, _bytes(original))
+
+        if errors > 0:
+            spi.speed_hz = safe_speed
+            raise Exception(f"Errors at the chosen clock of {speed} Hz")
+
+        if scratch.name == 'x_enc' and not self.__driver.poll_status() & TMCStatus.STANDSTILL:
+            raise Exception("The axis moved during calibration; x_enc may have lost counts")
+
+        return {
+            'speed_hz':    speed,
+            'fastest_hz':  fastest,
+            'bytes_per_s': rate,
+            'version':     version,
+            'speeds':      results,
+        }
+
+    @staticmethod
+    def save(path: str, bus, device, result: {str: object}):
+        calibrations = _load(path)
+        calibrations[f"{bus}.{device}"] = dict(result, calibrated_at=time.time())
+
+        with open(path, 'w') as f:
+            json.dump(calibrations, f, indent=2)
+
+    @staticmethod
+    def load(path: str, bus, device) -> int:
+        # The calibrated clock for /dev/spidev<bus>.<device>, or None if it was never calibrated
+        calibration = _load(path).get(f"{bus}.{device}")
+        return calibration['speed_hz'] if calibration is not None else None
+
+    def __check_idle(self):
+        driver = self.__driver
+
+        if self.__scratch.name == 'direct_mode':
+            driver.read('gconf')
+            if driver.gconf.direct_mode:
+                raise Exception("Direct mode is on, so test patterns would drive the coils")
+            return
+
+        if not driver.poll_status() & TMCStatus.STANDSTILL:
+            raise Exception("The axis must be at standstill to borrow x_enc")
+
+        before = driver.spi.read(self.__scratch.address)
+        time.sleep(IDLE_WINDOW)
+        if driver.spi.read(self.__scratch.address)[1:] != before[1:]:
+            raise Exception("The encoder is counting, so x_enc cannot be borrowed")
+
+    def __trial(self, version: int) -> (int, float):
+        # Returns the number of failed trials and the bytes/s the trials achieved
+        spi = self.__driver.spi
+        address, mask = self.__scratch.address, self.__scratch._write_mask
+        ioin = self.__ioin.address
+
+        errors = 0
+        transfers = 0
+        start = time.perf_counter()
+
+        for index in range(self.__trials):
+            pattern = (PATTERNS[index] if index < len(PATTERNS) else random.getrandbits(32)) & mask
+
+            spi.write(address, _bytes(pattern))
+            written, reference = spi.read_many([address, ioin])
+            transfers += 4
+
+            if (_word(written) ^ pattern) & mask or _word(reference) >> 24 != version:
+                errors += 1
+
+        elapsed = time.perf_counter() - start
+        return errors, transfers * 5 / elapsed if elapsed > 0 else 0.0
+
+
+def _word(data: [hex, hex, hex, hex, hex]) -> int:
+    return (data[1] << 24) | (data[2] << 16) | (data[3] << 8) | data[4]
+
+
+def _bytes(word: int) -> [hex, hex, hex, hex]:
+    return [(word >> 24) & 0xFF, (word >> 16) & 0xFF, (word >> 8) & 0xFF, word & 0xFF]
+
+
+def _load(path: str) -> {str: dict}:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
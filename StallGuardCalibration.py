@@ -0,0 +1,188 @@
+import time
+import numpy as np
+from typing import Callable
+from bulk_decode import decode_array
+from ConfigProfile import ConfigProfile
+
+# Full scale of sg_result and sg4_result
+SG_RESULT_MAX = 1023
+
+# sgt is searched for the most sensitive value that keeps the no-load reading above this fraction of
+# full scale, so a stall pulls sg_result to zero while normal load does not
+SGT_MIN = -64
+SGT_MAX = 63
+NO_LOAD_MARGIN = 0.1
+
+# A velocity whose reading spreads more than this (std / mean) is too slow for StallGuard to be useful
+MAX_SPREAD = 0.15
+
+# StallGuard4 reports a stall once SG4_RESULT <= 2 * SG4_THRS; the threshold is put at this fraction
+# of the lowest no-load reading
+SG4_STALL_FRACTION = 0.5
+
+# CoolStep raises the current below SEMIN * 32 and lowers it above (SEMIN + SEMAX + 1) * 32. The band
+# is placed at these fractions of the no-load reading, so an unloaded motor settles at reduced current
+COOLSTEP_LOW = 0.25
+COOLSTEP_HIGH = 0.5
+
+# tcoolthrs and thigh are widened by this fraction beyond the slowest and fastest usable velocity
+TSTEP_MARGIN = 0.1
+TSTEP_MAX = (1 << 20) - 1
+
+
+class StallGuardCalibration():
+    # Runs the motor at each of the given velocities, samples the StallGuard result together with
+    # tstep in pipelined batches, and recommends coolconf.sgt, sg4_thrs, the CoolStep band and the
+    # tcoolthrs/thigh velocity window. SpreadCycle is calibrated on sg_result by searching sgt;
+    # stealthChop (TMC2240 only) on sg4_result. Run it unloaded, and the result is a ConfigProfile
+    # that can be saved or applied.
+    #
+    # drive(velocity) must start the motor at a constant velocity, in any unit, and drive(0) stop
+    # it. Drivers with move_velocity (TMC5160) are driven directly when drive is not given
+    def __init__(self, driver, velocities: [float], drive: Callable[[float], None] = None,
+                 settle = 0.2, samples = 64):
+        if drive is None:
+            if not hasattr(driver, 'move_velocity'):
+                raise Exception("A drive function is needed for drivers without a ramp generator")
+            drive = lambda velocity: driver.move_velocity(int(velocity))
+
+        self.__driver = driver
+        self.__velocities = sorted(velocities)
+        self.__drive = drive
+        self.__settle = settle
+        self.__samples = samples
+
+        self.__sg4 = any(RegisterClass.name == 'sg4_result' for RegisterClass in driver.REGISTERS)
+        self.__results = []
+
+    @property
+    def results(self) -> [{str: float}]:
+        # Per-velocity readings of the last calibration, at the recommended sgt
+        return list(self.__results)
+
+    def calibrate(self, apply = False) -> ConfigProfile:
+        driver = self.__driver
+        driver.read('gconf')
+        stealth = driver.gconf.en_pwm_mode
+
+        if stealth and not self.__sg4:
+            raise Exception(f"{type(driver).__name__} has no StallGuard in stealthChop; calibrate in spreadCycle")
+
+        source = 'sg4_result' if stealth else 'sg_result'
+        coolconf = driver.coolconf
+        restore = {'semin': coolconf.semin, 'sgt': coolconf.sgt}
+
+        # CoolStep would move the current while it is being measured against
+        coolconf.assign({'semin': 0})
+        driver.flush()
+
+        try:
+            sgt = restore['sgt'] if stealth else self.__search_sgt()
+            self.__set_sgt(sgt)
+            self.__results = [self.__measure(velocity, source) for velocity in self.__velocities]
+        finally:
+            self.__drive(0)
+            coolconf.assign(restore)
+            driver.flush()
+
+        usable = [result for result in self.__results if result['usable']]
+        if len(usable) == 0:
+            raise Exception(f"No velocity gave a usable {source} reading")
+
+        profile = ConfigProfile(self.__recommend(usable, sgt, stealth))
+        if apply:
+            profile.apply(driver)
+
+        return profile
+
+    def __search_sgt(self) -> int:
+        # Lower sgt makes StallGuard more sensitive and sg_result smaller. Each velocity is searched
+        # for the lowest sgt that keeps its no-load reading above the margin, and the highest of those
+        # wins; velocities that cannot reach the margin at all are left out
+        floor = NO_LOAD_MARGIN * SG_RESULT_MAX
+        found = []
+
+        for velocity in self.__velocities:
+            self.__drive(velocity)
+            time.sleep(self.__settle)
+
+            low, high = SGT_MIN, SGT_MAX
+            self.__set_sgt(high)
+            if self.__sample('sg_result')[1].min() < floor:
+                continue
+
+            while low < high:
+                middle = (low + high) // 2
+                self.__set_sgt(middle)
+                if self.__sample('sg_result')[1].min() >= floor:
+                    high = middle
+                else:
+                    low = middle + 1
+
+            found.append(high)
+
+        if len(found) == 0:
+            raise Exception("sg_result stays below the no-load margin at every velocity, even at the highest sgt")
+
+        return max(found)
+
+    def __measure(self, velocity: float, source: str) -> {str: float}:
+        self.__drive(velocity)
+        time.sleep(self.__settle)
+
+        tstep, values = self.__sample(source)
+        mean = float(values.mean())
+        spread = float(values.std()) / mean if mean > 0 else float('inf')
+        low = float(np.percentile(values, 5))
+
+        return {
+            'velocity': velocity,
+            'tstep':    int(np.median(tstep)),
+            'mean':     mean,
+            'std':      float(values.std()),
+            'min':      int(values.min()),
+            'p5':       low,
+            'usable':   spread <= MAX_SPREAD and low > 0,
+        }
+
+    def __sample(self, source: str) -> (np.ndarray, np.ndarray):
+        # Back-to-back pipelined reads of tstep and the result register; the words are decoded in bulk
+        driver = self.__driver
+        register = 'sg4_result' if source == 'sg4_result' else 'drv_status'
+        tstep, result = driver.tstep, getattr(driver, register)
+
+        tstep_words = np.empty(self.__samples, dtype=np.uint32)
+        result_words = np.empty(self.__samples, dtype=np.uint32)
+
+        for index in range(self.__samples):
+            driver.read('tstep', register)
+            tstep_words[index] = tstep.word
+            result_words[index] = result.word
+
+        return decode_array(type(tstep), tstep_words)['tstep'], decode_array(type(result), result_words)[source]
+
+    def __set_sgt(self, sgt: int):
+        self.__driver.coolconf.assign({'sgt': sgt})
+        self.__driver.flush()
+
+    def __recommend(self, usable: [{str: float}], sgt: int, stealth: bool) -> {str: {str: int}}:
+        baseline = min(result['mean'] for result in usable)
+
+        semin = int(np.clip(round(baseline * COOLSTEP_LOW / 32), 1, 15))
+        semax = int(np.clip(int(baseline * COOLSTEP_HIGH / 32) - semin - 1, 0, 15))
+        coolconf = {'semin': semin, 'semax': semax}
+
+        values = {'coolconf': coolconf}
+        if stealth:
+            lowest = min(result['p5'] for result in usable)
+            values['sg4_thrs'] = {'sg4_thrs': int(np.clip(lowest * SG4_STALL_FRACTION / 2, 0, 255))}
+        else:
+            coolconf['sgt'] = sgt
+
+        # StallGuard and CoolStep are active while tstep lies between thigh and tcoolthrs
+        slowest = max(result['tstep'] for result in usable)
+        fastest = min(result['tstep'] for result in usable)
+        values['tcoolthrs'] = {'tcoolthrs': min(TSTEP_MAX, int(slowest * (1 + TSTEP_MARGIN)))}
+        values['thigh'] = {'thigh': int(fastest * (1 - TSTEP_MARGIN))}
+
+        return values
@@ -0,0 +1,231 @@
+import gc
+import math
+import multiprocessing
+import os
+import time
+import weakref
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+
+# Slots of the control block; each is an int64 written by one side only. A command or stats
+# record is published by writing its slot and then bumping the head, both under the shared
+# lock, and read under the same lock: the lock's barriers keep the other CPU from seeing the
+# new head before the slot. Single slots such as POSITION are read without it
+COMMAND_HEAD = 0   # parent: commands queued
+COMMAND_TAIL = 1   # child: commands taken
+STATS_HEAD = 2     # child: moves recorded in the stats ring
+POSITION = 3       # child: Motor.position, published by every pulse
+RUNNING = 4        # child: 1 while a move is being stepped
+ABORT = 5          # parent: bumped to abort the running move and drop queued ones
+READY = 6          # child: 1 once the GPIO pins are set up
+SHUTDOWN = 7       # parent: set to make the child exit
+CONTROL_SLOTS = 8
+
+MOVE = 1
+
+COMMAND_DTYPE = np.dtype([('kind', '<i8'), ('steps', '<i8'), ('vmax', '<f8'), ('accel', '<f8'), ('jerk', '<f8')])
+
+# The statistics MotionEngine reports for each move
+STATS_DTYPE = np.dtype([
+    ('steps', '<i8'),
+    ('duration_s', '<f8'),
+    ('mean_rate_hz', '<f8'),
+    ('peak_rate_hz', '<f8'),
+    ('requested_peak_rate_hz', '<f8'),
+    ('mean_lateness_us', '<f8'),
+    ('max_lateness_us', '<f8'),
+    ('jitter_us', '<f8'),
+])
+
+# How often the child looks for commands while idle, and for an abort while stepping
+POLL_INTERVAL = 0.001
+ABORT_INTERVAL = 0.01
+
+
+def _views(buffer, capacity: int) -> (np.ndarray, np.ndarray, np.ndarray):
+    # The control block, command ring and stats ring laid out back to back in one shared block
+    control = np.ndarray((CONTROL_SLOTS,), dtype='<i8', buffer=buffer)
+    offset = control.nbytes
+    commands = np.ndarray((capacity,), dtype=COMMAND_DTYPE, buffer=buffer, offset=offset)
+    offset += commands.nbytes
+    stats = np.ndarray((capacity,), dtype=STATS_DTYPE, buffer=buffer, offset=offset)
+    return control, commands, stats
+
+
+class StepGeneratorProcess():
+    # Runs the Motor pulse loop in its own process, optionally pinned to one CPU, so SPI
+    # traffic and decoding in this process cannot delay step pulses. Moves go through a
+    # shared-memory command ring; the position and per-move timing statistics come back
+    # through shared memory as well, readable without a round trip. The child is spawned, so
+    # the calling script needs an if __name__ == '__main__' guard
+    def __init__(self, step_pin, dir_pin, cpu: int = None, capacity = 64, spin = 0.0002, slip = 0.0001):
+        self.__capacity = capacity
+        size = CONTROL_SLOTS * 8 + capacity * (COMMAND_DTYPE.itemsize + STATS_DTYPE.itemsize)
+
+        self.__memory = SharedMemory(create=True, size=size)
+        self.__control, self.__commands, self.__stats = _views(self.__memory.buf, capacity)
+        self.__control[:] = 0
+
+        # spawn, so the child does not inherit this process's threads or open SPI devices
+        context = multiprocessing.get_context('spawn')
+        self.__lock = context.Lock()
+        self.__process = context.Process(
+            target=_run,
+            args=(self.__memory.name, capacity, step_pin, dir_pin, cpu, spin, slip, self.__lock),
+            name='StepGenerator',
+            daemon=True)
+
+        # Stops the child and unlinks the /dev/shm segment if close() is never called
+        self.__finalizer = weakref.finalize(self, _release, self.__memory, self.__process)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self, timeout = 10.0):
+        self.__process.start()
+
+        deadline = time.monotonic() + timeout
+        while not self.__control[READY]:
+            if not self.__process.is_alive() or time.monotonic() > deadline:
+                raise Exception("Step generator process failed to start")
+            time.sleep(POLL_INTERVAL)
+
+    def move(self, steps: int, vmax: float, accel: float, jerk: float = None):
+        # Queues a move; the sign of steps sets the direction, as with MotionEngine.move
+        with self.__lock:
+            head = int(self.__control[COMMAND_HEAD])
+            if head - int(self.__control[COMMAND_TAIL]) >= self.__capacity:
+                raise Exception("Command ring is full")
+
+            self.__commands[head % self.__capacity] = (MOVE, steps, vmax, accel, math.nan if jerk is None else jerk)
+            self.__control[COMMAND_HEAD] = head + 1
+
+    def abort(self):
+        # Stops the running move and drops the queued ones
+        self.__control[ABORT] += 1
+
+    def wait(self, timeout: float = None) -> bool:
+        # Waits until every queued move has been stepped; returns False on timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self.busy:
+            if not self.__process.is_alive():
+                raise Exception("Step generator process died")
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+
+        return True
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.__control[RUNNING]) or self.__control[COMMAND_TAIL] != self.__control[COMMAND_HEAD]
+
+    @property
+    def position(self) -> int:
+        return int(self.__control[POSITION])
+
+    @property
+    def moves(self) -> int:
+        return int(self.__control[STATS_HEAD])
+
+    def stats(self, index: int = -1) -> {str: float}:
+        # Timing statistics of a completed move, by index in completion order (default: the last)
+        with self.__lock:
+            count = self.moves
+            if index < 0:
+                index += count
+            if not max(0, count - self.__capacity) <= index < count:
+                return None
+
+            record = self.__stats[index % self.__capacity]
+            return {name: record[name].item() for name in STATS_DTYPE.names}
+
+    def close(self):
+        if not self.__finalizer.alive:
+            return
+
+        if self.__process.is_alive():
+            self.__control[SHUTDOWN] = 1
+            self.__process.join()
+
+        # Drop the views before releasing the buffer they point into
+        self.__control = self.__commands = self.__stats = None
+        self.__memory.close()
+        self.__finalizer()
+
+
+def _release(memory: SharedMemory, process):
+    # Runs once, from close() or when the object is collected; the views may still point into
+    # the buffer then, so only the name is unlinked and the mapping goes with the last view
+    if process.is_alive():
+        np.ndarray((CONTROL_SLOTS,), dtype='<i8', buffer=memory.buf)[SHUTDOWN] = 1
+        process.join()
+    memory.unlink()
+
+
+def _run(name: str, capacity: int, step_pin, dir_pin, cpu: int, spin: float, slip: float, lock):
+    from Motor import Motor
+    from MotionEngine import MotionEngine
+
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+
+    # Nothing here builds reference cycles, and a collection in the middle of a move is a stall
+    gc.disable()
+
+    memory = SharedMemory(name=name)
+    control, commands, stats = _views(memory.buf, capacity)
+
+    class SharedPositionMotor(Motor):
+        # Publishing from the pulse itself keeps a second thread from polling the position
+        # and contending for the GIL with the pulse loop
+        def pulse(self):
+            Motor.pulse(self)
+            control[POSITION] = self.position
+
+    motor = SharedPositionMotor(step_pin, dir_pin)
+    engine = MotionEngine(motor, spin, slip)
+    aborted = int(control[ABORT])
+    control[READY] = 1
+
+    try:
+        while not control[SHUTDOWN]:
+            if control[ABORT] != aborted:
+                aborted = int(control[ABORT])
+                control[COMMAND_TAIL] = control[COMMAND_HEAD]
+
+            tail = int(control[COMMAND_TAIL])
+            if tail == control[COMMAND_HEAD]:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            with lock:
+                kind, steps, vmax, accel, jerk = commands[tail % capacity].tolist()
+
+            # Raise RUNNING before taking the command, so the parent never sees an idle gap
+            control[RUNNING] = 1
+            control[COMMAND_TAIL] = tail + 1
+
+            engine.move(steps, vmax, accel, None if math.isnan(jerk) else jerk)
+            while engine.running:
+                # Blocks without the GIL, waking rarely to check for an abort
+                engine.wait(ABORT_INTERVAL)
+                if control[ABORT] != aborted or control[SHUTDOWN]:
+                    engine.stop()
+                    break
+
+            result = engine.wait() or {}
+            with lock:
+                stats[int(control[STATS_HEAD]) % capacity] = tuple(result.get(field, math.nan) for field in STATS_DTYPE.names)
+                control[STATS_HEAD] += 1
+            control[POSITION] = motor.position
+            control[RUNNING] = 0
+    finally:
+        motor.close()
+        control = commands = stats = None
+        memory.close()
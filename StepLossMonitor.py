@@ -0,0 +1,186 @@
+import threading
+import time
+import numpy as np
+
+ENCODER = 'encoder'
+MICROSTEP = 'microstep'
+
+
+class StepLossMonitor():
+    # Compares the steps commanded through a Motor with what the driver reports: mscnt shows
+    # the steps the driver actually took (missed STEP pulses), x_enc the steps the shaft
+    # actually made (stalls). Samples are taken at a fixed rate and checked in numpy batches,
+    # so a loss is reported within batch / rate seconds.
+    #
+    # callback(source, deviation) runs on the monitor thread when the deviation, in steps,
+    # crosses threshold; it is re-armed once the deviation falls below half the threshold.
+    # counts_per_step scales x_enc to steps (negative if the encoder counts the other way),
+    # reverse flips the commanded direction for both comparisons
+    def __init__(self, driver, motor, threshold: float, callback = None, rate = 1000.0, batch = 8,
+                 counts_per_step = 1.0, encoder = True, reverse = False):
+        self.__driver = driver
+        self.__motor = motor
+        self.__threshold = threshold
+        self.__callback = callback
+        self.__period = 1.0 / rate
+        self.__batch = batch
+        self.__counts_per_step = counts_per_step
+        self.__sign = -1 if reverse else 1
+        self.__names = ['x_enc', 'mscnt'] if encoder else ['mscnt']
+
+        self.__timestamps = np.zeros(batch, dtype=np.float64)
+        self.__commanded = np.zeros(batch, dtype=np.float64)
+        self.__encoder = np.zeros(batch, dtype=np.uint32)
+        self.__mscnt = np.zeros(batch, dtype=np.uint32)
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+        self.__deviation = {source: 0.0 for source in self.sources}
+        self.__max_deviation = {source: 0.0 for source in self.sources}
+        self.__alarmed = {source: False for source in self.sources}
+        self.__alarms = 0
+        self.__samples = 0
+        self.__batches = 0
+
+    @property
+    def sources(self) -> [str]:
+        return [ENCODER, MICROSTEP] if 'x_enc' in self.__names else [MICROSTEP]
+
+    def start(self):
+        if self.__thread is not None:
+            raise Exception("Monitor already running")
+
+        self.__baseline()
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='StepLossMonitor', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        if self.__thread is None:
+            return
+
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def reset(self):
+        # Takes the current positions as the new zero, e.g. after homing
+        running = self.__thread is not None
+        self.stop()
+        with self.__lock:
+            self.__deviation = {source: 0.0 for source in self.sources}
+            self.__alarmed = {source: False for source in self.sources}
+        if running:
+            self.start()
+
+    @property
+    def deviation(self) -> {str: float}:
+        # Latest deviation per source: commanded minus actual position, in steps
+        with self.__lock:
+            return dict(self.__deviation)
+
+    @property
+    def alarmed(self) -> bool:
+        with self.__lock:
+            return any(self.__alarmed.values())
+
+    def stats(self) -> {str: object}:
+        with self.__lock:
+            return {
+                'samples':       self.__samples,
+                'batches':       self.__batches,
+                'alarms':        self.__alarms,
+                'deviation':     dict(self.__deviation),
+                'max_deviation': dict(self.__max_deviation),
+            }
+
+    def __baseline(self):
+        driver = self.__driver
+        driver.read('chopconf', *self.__names)
+
+        # mscnt moves 1024 per electrical period of four full steps; mres 0 is 256 microsteps
+        self.__mscnt_per_step = 1 << driver.chopconf.mres
+
+        self.__commanded_zero = self.__sign * self.__motor.position
+        self.__last_commanded = self.__commanded_zero
+        self.__encoder_zero = int(np.uint32(driver.x_enc.word).view(np.int32)) if 'x_enc' in self.__names else 0
+        self.__last_mscnt = driver.mscnt.word & 0x3FF
+        self.__mscnt_deviation = 0.0
+
+    def __run(self):
+        driver, motor, names = self.__driver, self.__motor, self.__names
+        mscnt = driver.mscnt
+        x_enc = driver.x_enc if 'x_enc' in names else None
+
+        count = 0
+        deadline = time.perf_counter()
+
+        while not self.__stop.is_set():
+            # The motor keeps stepping during the read, so charge the samples to the midpoint
+            before = motor.position
+            driver.read(*names)
+            after = motor.position
+
+            self.__timestamps[count] = time.perf_counter()
+            self.__commanded[count] = self.__sign * (before + after) / 2
+            self.__mscnt[count] = mscnt.word
+            if x_enc is not None:
+                self.__encoder[count] = x_enc.word
+
+            count += 1
+            if count == self.__batch:
+                self.__evaluate(count)
+                count = 0
+
+            deadline += self.__period
+            now = time.perf_counter()
+            if deadline < now:
+                deadline = now
+            self.__stop.wait(deadline - now)
+
+        if count > 0:
+            self.__evaluate(count)
+
+    def __evaluate(self, count: int):
+        commanded = self.__commanded[:count]
+        deviation = {}
+
+        # Unwrap mscnt against the commanded motion: whatever the counter did not follow is lost
+        expected = np.diff(commanded, prepend=self.__last_commanded) * self.__mscnt_per_step
+        moved = np.diff(self.__mscnt[:count].astype(np.int64) & 0x3FF, prepend=self.__last_mscnt)
+        residual = (moved - expected + 512) % 1024 - 512
+        mscnt_deviation = self.__mscnt_deviation - np.cumsum(residual) / self.__mscnt_per_step
+        deviation[MICROSTEP] = mscnt_deviation
+
+        self.__last_commanded = commanded[-1]
+        self.__last_mscnt = int(self.__mscnt[count - 1]) & 0x3FF
+        self.__mscnt_deviation = float(mscnt_deviation[-1])
+
+        if 'x_enc' in self.__names:
+            encoder = self.__encoder[:count].view(np.int32).astype(np.int64) - self.__encoder_zero
+            deviation[ENCODER] = (commanded - self.__commanded_zero) - encoder / self.__counts_per_step
+
+        fired = []
+        with self.__lock:
+            self.__samples += count
+            self.__batches += 1
+
+            for source, values in deviation.items():
+                magnitude = np.abs(values)
+                peak = int(np.argmax(magnitude))
+
+                self.__deviation[source] = float(values[-1])
+                self.__max_deviation[source] = max(self.__max_deviation[source], float(magnitude[peak]))
+
+                if not self.__alarmed[source] and magnitude[peak] >= self.__threshold:
+                    self.__alarmed[source] = True
+                    self.__alarms += 1
+                    fired.append((source, float(values[peak])))
+                elif self.__alarmed[source] and magnitude[-1] < self.__threshold / 2:
+                    self.__alarmed[source] = False
+
+        if self.__callback is not None:
+            for source, value in fired:
+                self.__callback(source, value)
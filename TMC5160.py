@@ -1,109 +1,119 @@
-from TMCDriver import TMCRegister, TMCSPIWrapper
-from typing import Callable
-from tabulate import tabulate
-
-class GlobalConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x00, 'gconf', spi, status_cb, [
-            ['test_mode',           17, 1, bool],  # 2
-            ['direct_mode',         16, 1, bool],  # 1
-
-            ['stop_enable',         15, 1, bool],  # 8
-            ['small_hysteresis',    14, 1, bool],  # 4
-            ['diag1_pushpull',      13, 1, bool],  # 2
-            ['diag0_pushpull',      12, 1, bool],  # 1
-
-            ['diag1_steps_skipped', 11, 1, bool],  # 8
-            ['diag1_onstate',       10, 1, bool],  # 4
-            ['diag1_index',          9, 1, bool],  # 2
-            ['diag1_stall',          8, 1, bool],  # 1
-
-            ['diag0_stall',          7, 1, bool],  # 8
-            ['diag0_otpw',           6, 1, bool],  # 4
-            ['diag0_error',          5, 1, bool],  # 2
-            ['shaft',                4, 1, bool],  # 1
-
-            ['multistep_filt',       3, 1, bool],  # 8
-            ['en_pwm_mode',          2, 1, bool],  # 4
-            ['fast_standstill',      1, 1, bool],  # 2
-            ['recalibrate',          0, 1, bool]   # 1
-        ])
-
-
-class TMC5160():
-    def __init__(self, spi_bus, spi_device):
-        self.__spi: TMCSPIWrapper = TMCSPIWrapper(spi_bus, spi_device)
-        self.spi = self.__spi
-
-        registers = [
-            GlobalConfigRegister
-        ]
-
-        self.__registers = {}
-
-        for RegisterClass in registers:
-            register = RegisterClass(self.__spi, self.__set_status)
-            name = register.name
-            self.__registers[name] = register
-            getter = lambda self, name=name: self.__registers[name]
-            setattr(self.__class__, name, property(getter))
-
-    def read(self):
-        for name in self.__registers:
-            self.__registers[name].read()
-
-    def close(self):
-        self.__spi.close()
-        self = None
-
-    def __set_status(self, status: hex):
-        self.__status = {
-            'status_stop_r':   bool((status >> 7) & 1),
-            'status_stop_l':   bool((status >> 6) & 1),
-            'position_reached':   bool((status >> 5) & 1),
-            'velocity_reached':   bool((status >> 4) & 1),
-            'standstill':   bool((status >> 3) & 1),
-            'sg2':          bool((status >> 2) & 1),
-            'driver_error': bool((status >> 1) & 1),
-            'reset_flag':   bool(status & 1)
-        }
+import threading
+import time
+from TMCDriver import TMCDriver, TMCSPIWrapper
+from TMCStatus import TMCStatus, RISING
+import _tmc5160_registers
+
+# The register classes are generated from register_maps.py by regmapgen.py
+from _tmc5160_registers import *
+
+
+class TMC5160(TMCDriver):
+    REGISTERS = _tmc5160_registers.REGISTERS
+
+    # The upper four status bits come from the ramp generator
+    STATUS_MASK = 0xFF
+
+    # Datasheet limit for the SPI clock when running from the internal oscillator
+    MAX_SPI_HZ = 4000000
+
+    # RAMPMODE values
+    POSITIONING = 0
+    VELOCITY_POSITIVE = 1
+    VELOCITY_NEGATIVE = 2
+    HOLD = 3
+
+    # Ramp generator parameters accepted by configure_ramp, move_to and move_velocity
+    RAMP_PARAMETERS = ['vstart', 'a1', 'v1', 'amax', 'vmax', 'dmax', 'd1', 'vstop']
+
+    def __init__(self, spi_bus = None, spi_device = None, spi: TMCSPIWrapper = None):
+        super().__init__(spi_bus, spi_device, spi)
+
+        # Status flag that tells the last move is complete, and whether any transfer has seen it
+        # rise since the move started
+        self.__target_flag = TMCStatus.POSITION_REACHED
+        self.__reached = threading.Event()
+        self.subscribe(TMCStatus.POSITION_REACHED | TMCStatus.VELOCITY_REACHED, self.__on_reached, RISING)
+
+    def configure_ramp(self, **ramp):
+        # Writes the given ramp parameters in chip units, e.g. configure_ramp(amax=500, vmax=20000).
+        # Positioning needs non-zero d1 and vstop; the registers are write-only, so that is on the caller
+        self.__assign_ramp(ramp)
+        self.flush()
+
+    def move_to(self, position: int, **ramp):
+        # Starts a move to an absolute microstep position; the chip generates the steps.
+        # flush writes in map order, so rampmode and the ramp go out before xtarget starts the move
+        self.__assign_ramp(ramp)
+        self.rampmode.assign({'rampmode': TMC5160.POSITIONING})
+        self.xtarget.assign({'xtarget': position}, True)
+        self.__start(TMCStatus.POSITION_REACHED)
+
+    def move_velocity(self, velocity: int, **ramp):
+        # Runs at a signed velocity until told otherwise, accelerating with amax
+        ramp['vmax'] = abs(velocity)
+        self.__assign_ramp(ramp)
+        self.rampmode.assign({'rampmode': TMC5160.VELOCITY_POSITIVE if velocity >= 0 else TMC5160.VELOCITY_NEGATIVE})
+        self.__start(TMCStatus.VELOCITY_REACHED)
+
+    def stop(self):
+        # Decelerates to standstill with amax
+        self.move_velocity(0)
+
+    def wait_until_reached(self, timeout: float = None, interval = 0.001) -> bool:
+        # Waits for position_reached after move_to, or velocity_reached after move_velocity.
+        # A status byte brought back by other traffic counts, and wakes the wait early; otherwise
+        # each check costs one transfer, which only carries the status byte back.
+        # Returns False on timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while not self.__reached.is_set() and not self.poll_status() & self.__target_flag:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.__reached.wait(interval)
+
+        return True
 
     @property
-    def standstill(self):
-        return self.__status['standstill']
-    
-    @property
-    def sg2(self):
-        return self.__status['sg2']
+    def position(self) -> int:
+        self.read('xactual')
+        return self.xactual.xactual
 
     @property
-    def driver_error(self):
-        return self.__status['driver_error']
+    def velocity(self) -> int:
+        self.read('vactual')
+        return self.vactual.vactual
+
+    def __start(self, flag: TMCStatus):
+        # The replies to the flush still carry the status from before the move, so only edges
+        # seen after it count
+        self.__target_flag = flag
+        self.flush()
+        self.__reached.clear()
+
+    def __on_reached(self, flag: TMCStatus, state: bool):
+        if flag & self.__target_flag:
+            self.__reached.set()
+
+    def __assign_ramp(self, ramp: {str: int}):
+        for name, value in ramp.items():
+            if name not in TMC5160.RAMP_PARAMETERS:
+                raise Exception(f"{name} is not a ramp parameter")
+
+            getattr(self, name).assign({name: value}, True)
 
-    @property
-    def reset_flag(self):
-        return self.__status['reset_flag']
-    
     @property
     def status_stop_r(self):
-        return self.__status['status_stop_r']
-    
+        return TMCStatus.STATUS_STOP_R in self.status
+
+    @property
+    def status_stop_l(self):
+        return TMCStatus.STATUS_STOP_L in self.status
+
     @property
     def position_reached(self):
-        return self.__status['position_reached']
-    
+        return TMCStatus.POSITION_REACHED in self.status
+
     @property
     def velocity_reached(self):
-        return self.__status['velocity_reached']
-    
-    @property
-    def reset_flag(self):
-        return self.__status['reset_flag']
-
-    def __str__(self):
-        if self.__status == None:
-            return 'Status not yet read.'
-
-        return tabulate(list(self.__status.items()), headers=['Status Flags', ''], tablefmt='pretty') + '\n\n' \
-            + '\n\n'.join([str(register) for _, register in self.__registers.items()])
-
+        return TMCStatus.VELOCITY_REACHED in self.status
@@ -0,0 +1,160 @@
+import threading
+from contextlib import contextmanager
+from TMCDriver import TMCSPIWrapper, TMCTransport
+
+NOP = [0x00, 0x00, 0x00, 0x00, 0x00]  # A read request for gconf, harmless to any chip
+
+
+class TMCBus():
+    def __init__(self, bus):
+        self.__bus = bus
+        self.__handles = {}
+        self.__chains = {}
+        self.__locks = {}
+        self.__locks_lock = threading.Lock()
+
+    def attach(self, device, transport: TMCTransport):
+        # Uses the given transport for a chip select instead of opening its spidev node
+        self.__handles[device] = transport
+
+    def chain(self, device, length: int):
+        # Declares `length` chips daisy-chained behind one chip select; position 0 is the chip
+        # whose SDI is wired to the host
+        self.__chains[device] = length
+
+    def chain_length(self, device) -> int:
+        return self.__chains.get(device, 1)
+
+    def chip(self, device, position = 0) -> TMCSPIWrapper:
+        if position >= self.chain_length(device):
+            raise Exception(f"No chip at position {position} on /dev/spidev{self.__bus}.{device}")
+
+        return _ChipSPIWrapper(self, device, _ChipTransport(self, device, position))
+
+    def lock(self, device) -> threading.RLock:
+        # Held for every frame on a chip select and across whole pipelined sequences: a frame for
+        # one chip sends NOPs to the others, which would overwrite a reply they have pending
+        with self.__locks_lock:
+            if device not in self.__locks:
+                self.__locks[device] = threading.RLock()
+            return self.__locks[device]
+
+    def speed_hz(self, device) -> int:
+        return self.__handle(device).max_speed_hz
+
+    def set_speed_hz(self, device, speed_hz: int):
+        # The clock belongs to the chip select, so it applies to every chip on the chain
+        with self.lock(device):
+            self.__handle(device).max_speed_hz = int(speed_hz)
+
+    def read_all(self, device, address: hex) -> [[hex, hex, hex, hex, hex]]:
+        return [replies[0] for replies in self.read_many_all(device, [address])]
+
+    def read_many_all(self, device, addresses: [hex]) -> [[[hex, hex, hex, hex, hex]]]:
+        # Same pipelining as TMCSPIWrapper.read_many, but every transfer addresses the whole chain,
+        # so reading N registers from all chips costs N+1 transfers regardless of chain length
+        length = self.chain_length(device)
+        replies = [[] for _ in range(length)]
+        if len(addresses) == 0:
+            return replies
+
+        with self.lock(device):
+            self.transfer(device, [[addresses[0], 0x00, 0x00, 0x00, 0x00]] * length)
+            for address in addresses[1:] + [None]:
+                datagram = [address, 0x00, 0x00, 0x00, 0x00] if address is not None else NOP
+                for position, reply in enumerate(self.transfer(device, [datagram] * length)):
+                    replies[position].append(reply)
+
+        return replies
+
+    def write_all(self, device, address: hex, data: [[hex, hex, hex, hex]]) -> [[hex, hex, hex, hex, hex]]:
+        # One transfer writes the register on every chip; data holds one word per chain position
+        return self.transfer(device, [[address | 0x80, *word] for word in data])
+
+    def read_registers(self, device, drivers, *names):
+        # Refreshes the same registers on every driver of a chain, given in chain position order
+        registers = [[getattr(driver, name) for name in names] for driver in drivers]
+        replies = self.read_many_all(device, [register.address for register in registers[0]])
+
+        for chip_registers, chip_replies in zip(registers, replies):
+            for register, data in zip(chip_registers, chip_replies):
+                register._update(data)
+
+    def transfer(self, device, datagrams: [[hex, hex, hex, hex, hex]]) -> [[hex, hex, hex, hex, hex]]:
+        # The first datagram clocked out travels furthest down the chain, and the first reply
+        # clocked in comes from the last chip, so both are sent and received in reverse order
+        frame = []
+        for datagram in reversed(datagrams):
+            frame.extend(datagram)
+
+        with self.lock(device):
+            reply = self.__handle(device).xfer2(frame)
+        length = len(datagrams)
+        return [reply[(length - 1 - position) * 5:(length - position) * 5] for position in range(length)]
+
+    def close(self):
+        for handle in self.__handles.values():
+            handle.close()
+        self.__handles = {}
+
+    def __handle(self, device):
+        if device not in self.__handles:
+            self.__handles[device] = TMCSPIWrapper.initialize_spi(self.__bus, device)
+
+        return self.__handles[device]
+
+
+class _ChipTransport(TMCTransport):
+    # Presents one chip of the bus as a spidev-like transport for TMCSPIWrapper; other chips
+    # on the same chain receive a NOP datagram
+    def __init__(self, bus: TMCBus, device, position: int):
+        self.__bus = bus
+        self.__device = device
+        self.__position = position
+
+    def xfer2(self, datagram: [hex, hex, hex, hex, hex]) -> [hex, hex, hex, hex, hex]:
+        datagrams = [NOP] * self.__bus.chain_length(self.__device)
+        datagrams[self.__position] = datagram
+        return self.__bus.transfer(self.__device, datagrams)[self.__position]
+
+    @property
+    def max_speed_hz(self) -> int:
+        return self.__bus.speed_hz(self.__device)
+
+    @max_speed_hz.setter
+    def max_speed_hz(self, speed_hz: int):
+        self.__bus.set_speed_hz(self.__device, speed_hz)
+
+    def close(self):
+        # The handle belongs to the bus
+        pass
+
+
+class _ChipSPIWrapper(TMCSPIWrapper):
+    # Holds the chain's lock for each whole operation, including the trailing frame that
+    # collects a pipelined read's last reply
+    def __init__(self, bus: TMCBus, device, transport: _ChipTransport):
+        super().__init__(transport=transport)
+        self.__lock = bus.lock(device)
+
+    def read_many(self, addresses: [hex]) -> [[hex, hex, hex, hex, hex]]:
+        with self.__lock:
+            return super().read_many(addresses)
+
+    def write(self, address: hex, data: [hex, hex, hex, hex]) -> [hex, hex, hex, hex, hex]:
+        with self.__lock:
+            return super().write(address, data)
+
+    def write_many(self, writes: [[hex, [hex, hex, hex, hex]]]) -> [[hex, hex, hex, hex, hex]]:
+        with self.__lock:
+            return super().write_many(writes)
+
+    def status(self) -> hex:
+        with self.__lock:
+            return super().status()
+
+    @contextmanager
+    def writer(self):
+        with self.__lock:
+            with super().writer() as write:
+                yield write
@@ -1,36 +1,157 @@
 import logging
-import spidev
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from tabulate import tabulate
 from typing import Callable
+from DriverSnapshot import DriverSnapshot
+from TMCRegister import TMCRegisterType, TMCRegister
+from TMCStatus import TMCStatus, RISING, FALLING, BOTH
+import _tmc2240_registers
 
+# The register classes are generated from register_maps.py by regmapgen.py
+from _tmc2240_registers import *
+
+
+class TMCTransport(ABC):
+    # The byte-level link under TMCSPIWrapper: the subset of spidev.SpiDev the stack relies on
+    max_speed_hz = 0
+
+    @abstractmethod
+    def xfer2(self, data: [hex]) -> [hex]:
+        pass
+
+    def close(self):
+        pass
 
 class TMCSPIWrapper:
-    def __init__(self, bus, device):
-        self.__spi = TMCSPIWrapper.__initialize_spi(bus, device)
+    # Conservative clock that works on long cables; SPIClockCalibration finds a faster one
+    DEFAULT_SPEED_HZ = 500000
+
+    def __init__(self, bus = None, device = None, transport: TMCTransport = None, speed_hz: int = None):
+        # Without a transport, open /dev/spidev<bus>.<device>
+        self.__spi = transport if transport is not None else TMCSPIWrapper.initialize_spi(bus, device)
+        if speed_hz is not None:
+            self.speed_hz = speed_hz
+
+        # A TMCMetrics and a TMCTrace.TraceRecorder; while both are None, transfers take the
+        # unobserved path
+        self.metrics = None
+        self.trace = None
 
     def read(self, address: hex) -> [hex, hex, hex, hex, hex]:
-        # Read twice because the response will be from the last operation we sent
-        data_to_send = [address, 0x00, 0x00, 0x00, 0x00]
-        dummy_data = [0x00, 0x00, 0x00, 0x00, 0x00]
-        
-        self.__spi.xfer2(data_to_send)
-        return self.__spi.xfer2(dummy_data)
+        return self.read_many([address])[0]
+
+    def read_many(self, addresses: [hex]) -> [[hex, hex, hex, hex, hex]]:
+        # The response to each transfer is from the last operation we sent, so every transfer
+        # requests the next address while collecting the previous reply: N reads cost N+1 transfers
+        if self.metrics is not None or self.trace is not None:
+            return self.__read_many_observed(addresses)
+
+        replies = []
+        if len(addresses) == 0:
+            return replies
+
+        self.__spi.xfer2([addresses[0], 0x00, 0x00, 0x00, 0x00])
+        for address in addresses[1:]:
+            replies.append(self.__spi.xfer2([address, 0x00, 0x00, 0x00, 0x00]))
+        replies.append(self.__spi.xfer2([0x00, 0x00, 0x00, 0x00, 0x00]))
+
+        return replies
 
     def write(self, address: hex, data: [hex, hex, hex, hex]) -> [hex, hex, hex, hex, hex]:
-        self.__spi.xfer2([address | 0x80, data[0], data[1], data[2], data[3]])
+        if self.metrics is None and self.trace is None:
+            return self.__spi.xfer2([address | 0x80, data[0], data[1], data[2], data[3]])
+
+        start = time.perf_counter()
+        reply = self.__spi.xfer2([address | 0x80, data[0], data[1], data[2], data[3]])
+        latency = time.perf_counter() - start
+
+        if self.metrics is not None:
+            self.metrics.record_write(address, latency, reply[0])
+        if self.trace is not None:
+            self.trace.record(1, address, data, reply[0])
+
+        return reply
+
+    def write_many(self, writes: [[hex, [hex, hex, hex, hex]]]) -> [[hex, hex, hex, hex, hex]]:
+        return [self.write(address, data) for address, data in writes]
+
+    def status(self) -> hex:
+        # Every reply leads with the status byte, so a single dummy read of gconf fetches it
+        if self.metrics is None and self.trace is None:
+            return self.__spi.xfer2([0x00, 0x00, 0x00, 0x00, 0x00])[0]
+
+        start = time.perf_counter()
+        reply = self.__spi.xfer2([0x00, 0x00, 0x00, 0x00, 0x00])
+        latency = time.perf_counter() - start
+
+        if self.metrics is not None:
+            self.metrics.record_overhead(latency, reply[0])
+        if self.trace is not None:
+            self.trace.record(0, 0x00, reply[1:], reply[0])
+
+        return reply[0]
+
+    @property
+    def speed_hz(self) -> int:
+        return self.__spi.max_speed_hz
+
+    @speed_hz.setter
+    def speed_hz(self, speed_hz: int):
+        self.__spi.max_speed_hz = int(speed_hz)
+
+    @contextmanager
+    def writer(self):
+        # Raw datagram output for streaming, without metrics or trace. spidev's writebytes2 clocks
+        # a buffer out without building a reply list; other transports fall back to xfer2. The
+        # wrapper has no lock of its own: a stream that shares the bus with other threads must
+        # go through TMCSPIArbiter.writer
+        write = getattr(self.__spi, 'writebytes2', None)
+        yield write if write is not None else self.__spi.xfer2
 
     def close(self):
         self.__spi.close()
 
+    def __read_many_observed(self, addresses: [hex]) -> [[hex, hex, hex, hex, hex]]:
+        # Each register is charged for the transfer that brought its reply back
+        replies = []
+        if len(addresses) == 0:
+            return replies
+
+        metrics, trace = self.metrics, self.trace
+        pending = None
+        for address in list(addresses) + [None]:
+            start = time.perf_counter()
+            reply = self.__spi.xfer2([address if address is not None else 0x00, 0x00, 0x00, 0x00, 0x00])
+            latency = time.perf_counter() - start
+
+            if pending is None:
+                if metrics is not None:
+                    metrics.record_overhead(latency, reply[0])
+            else:
+                if metrics is not None:
+                    metrics.record_read(pending, latency, reply[0])
+                if trace is not None:
+                    trace.record(0, pending, reply[1:], reply[0])
+                replies.append(reply)
+
+            pending = address
+
+        return replies
+
     @staticmethod
-    def __initialize_spi(bus, device):
+    def initialize_spi(bus, device):
+        # Imported here so the stack can run on a simulated transport without spidev installed
+        import spidev
+
         spi = spidev.SpiDev()
 
         # Open SPI bus 0, device 0 (i.e., /dev/spidev0.0)
         spi.open(bus, device)
 
         # Set SPI speed and mode
-        spi.max_speed_hz = 500000
+        spi.max_speed_hz = TMCSPIWrapper.DEFAULT_SPEED_HZ
         spi.mode = 0b11  # SPI_MODE3: CPOL = 1, CPHA = 1
 
         # Set MSB of the byte as the first one
@@ -39,424 +160,194 @@ class TMCSPIWrapper:
         # clear the spi buffer
         return spi
 
-class TMCRegister():
-    READONLY = 0x01
+class TMCDriver():
+    REGISTERS = _tmc2240_registers.REGISTERS
 
-    def __init__(self, address: hex, name: str, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int], value_map):
-        if (address == None):
-            raise Exception("Must specify the register address")
-        self.address: hex = address
-        self.name: str = name
+    # Status byte bits this chip reports
+    STATUS_MASK = int(TMCStatus.RESET_FLAG | TMCStatus.DRIVER_ERROR | TMCStatus.SG2 | TMCStatus.STANDSTILL)
 
-        self.__spi: TMCSPIWrapper = spi
-        self.__status_cb: Callable[[hex], None] = status_cb
+    # Datasheet limit for the SPI clock
+    MAX_SPI_HZ = 10000000
 
-        self._values = {}
-        self._value_map = value_map
+    def __init__(self, spi_bus = None, spi_device = None, spi: TMCSPIWrapper = None):
+        self.__spi: TMCSPIWrapper = spi if spi is not None else TMCSPIWrapper(spi_bus, spi_device)
 
-        for name, _, _, _, *optional in self._value_map:
-            getter = lambda self, name=name: self._values[name]
-    
-            prop = property(getter)
+        self.__classes = {RegisterClass.name: RegisterClass for RegisterClass in self.REGISTERS}
+        self.__readable = self.readable()
+        self.__registers = {}
+        self.__ttl = {}
 
-            if (len(optional) == 0 or optional[0] != TMCRegister.READONLY):
-                setter = lambda self, value, name=name: self._values.__setitem__(name, value)
-                prop = prop.setter(setter)
+        self.__status_byte = None
+        self.__subscribers = []
 
-            setattr(self.__class__, name, prop)
+    def __getattr__(self, name):
+        # Registers are instantiated on first access and read on first field access. The instance
+        # is then stored as a plain attribute, so later lookups do not come back here
+        if name.startswith('_') or name not in self.__classes:
+            raise AttributeError(f"{type(self).__name__} has no attribute or register {name}")
 
-        self.read()
+        return self.__register(name)
 
-    def read(self):
-        data = self.__spi.read(self.address)
+    @classmethod
+    def readable(cls) -> [str]:
+        # Names of the registers that can be read back, in map order
+        return [RegisterClass.name for RegisterClass in cls.REGISTERS if not RegisterClass.flags & TMCRegister.WRITEONLY]
 
-        formatted_data = "".join([f"{format(i, '02X')}" for i in data])
-        logging.debug(f"Read from 0x{format(self.address, '02X')} : 0x{formatted_data}")
+    @property
+    def spi(self) -> TMCSPIWrapper:
+        return self.__spi
 
-        self.__status_cb(data[0])
-        self._decode(data[1:])
+    def read(self, *names):
+        instances = self.__registers
+        registers = [instances.get(name) or self.__register(name) for name in (names or self.__readable)]
+        if names:
+            registers = [register for register in registers if not register.writeonly]
+        replies = self.__spi.read_many([register.address for register in registers])
 
-    def _decode(self, data: [hex, hex, hex, hex]):
-        data_word = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
-        
-        for name, start, length, T in self._value_map:
-            mask = (1 << length) - 1
-            self._values[name] = T(data_word >> (start - length + 1) & mask)
+        for register, data in zip(registers, replies):
+            register._update(data)
 
-    def _encode(self) -> hex:
-        raise Exception("Not Implemented")
+    def snapshot(self, refresh = True) -> DriverSnapshot:
+        if refresh:
+            self.read()
 
-    def __str__(self):
-        return tabulate(list(self._values.items()), headers=[self.name, ''], tablefmt='pretty')
-
-class GlobalConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x00, 'gconf', spi, status_cb, [
-            ['direct_mode',      16, 1, bool],
-            ['stop_enable',      15, 1, bool],
-            ['small_hysteresis', 14, 1, bool],
-            ['diag1_pushpull',   13, 1, bool],
-            ['diag0_pushpull',   12, 1, bool],
-            ['diag1_onstate',    10, 1, bool],
-            ['diag1_index',       9, 1, bool],
-            ['diag1_stall',       8, 1, bool],
-            ['diag0_stall',       7, 1, bool],
-            ['diag0_otpw',        6, 1, bool],
-            ['diag0_error',       5, 1, bool],
-            ['shaft',             4, 1, bool],
-            ['multistep_filt',    3, 1, bool],
-            ['en_pwm_mode',       2, 1, bool],
-            ['fast_standstill',   1, 1, bool]
-        ])
-
-class GlobalStatusRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x01, 'gstat', spi, status_cb, [
-            ['vm_uvlo',        4, 1, bool],
-            ['register_reset', 3, 1, bool],
-            ['uv_cp',          2, 1, bool],
-            ['drv_err',        1, 1, bool],
-            ['reset',          0, 1, bool]
-        ])
-
-class IOInputRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x04, 'ioin', spi, status_cb, [
-            ['version',     31, 8, int,  TMCRegister.READONLY],
-            ['silicon_rev', 18, 3, int,  TMCRegister.READONLY],
-            ['adc_err',     15, 1, bool, TMCRegister.READONLY],
-            ['ext_clk',     14, 1, bool, TMCRegister.READONLY],
-            ['ext_res_det', 13, 1, bool, TMCRegister.READONLY],
-            ['output',      12, 1, bool],
-            ['comp_b1_b2',  11, 1, bool, TMCRegister.READONLY],
-            ['comp_a1_a2',  10, 1, bool, TMCRegister.READONLY],
-            ['comp_b',      9,  1, bool, TMCRegister.READONLY],
-            ['comp_a',      8,  1, bool, TMCRegister.READONLY],
-            ['uart_en',     6,  1, bool, TMCRegister.READONLY],
-            ['encn',        5,  1, bool, TMCRegister.READONLY],
-            ['drv_enn',     4,  1, bool, TMCRegister.READONLY],
-            ['enca',        3,  1, bool, TMCRegister.READONLY],  
-            ['encb',        2,  1, bool, TMCRegister.READONLY],
-            ['dir',         1,  1, bool, TMCRegister.READONLY],
-            ['step',        0,  1, bool, TMCRegister.READONLY]
-        ])
-
-class DriveConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x0A, 'drv_conf', spi, status_cb, [
-            ['slope_control', 5, 2, int],
-            ['current_range', 1, 2, int]
-        ])
-
-class GlobalScalerRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x0B, 'global_scaler', spi, status_cb, [
-            ['globalscaler', 7, 8, int]
-        ])
-
-class CurrentRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x10, 'ihold_irun', spi, status_cb, [
-            ['irundelay',  27, 4, int],
-            ['iholddelay', 19, 4, int],
-            ['irun',       12, 5, int],
-            ['irundelay',   4, 5, int]
-        ])
-
-class PowerdownRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x11, 'tpowerdown', spi, status_cb, [
-            ['tpowerdown',  7, 8, int]
-        ])
-
-class TStepRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x12, 'tstep', spi, status_cb, [
-            ['tstep',  19, 20, int, TMCRegister.READONLY]
-        ])
-
-class TPWMThresholdRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x13, 'tpwmthrs', spi, status_cb, [
-            ['tpwmthrs',  19, 20, int]
-        ])
-
-class TCoolThreshold(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x14, 'tcoolthrs', spi, status_cb, [
-            ['tpwmthrs',  19, 20, int]
-        ])
-
-class THighRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x15, 'thigh', spi, status_cb, [
-            ['thigh',  19, 20, int]
-        ])
-
-class DirectModeRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x2D, 'direct_mode', spi, status_cb, [
-            ['direct_coil_b',  24, 9, int],
-            ['direct_coil_a',  8, 9, int],
-        ])
-
-class EncoderModeRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x38, 'encmode', spi, status_cb, [
-            ['enc_sel_decimal',  10, 1, bool],
-            ['clr_enc_x',         8, 1, bool],
-            ['pos_neg_edge',      7, 2, int],
-            ['clr_once',          5, 1, bool],
-            ['clr_cont',          4, 1, bool],
-            ['ignore_ab',         3, 1, bool],
-            ['pol_n',             2, 1, bool],
-            ['pol_b',             1, 1, bool],
-            ['pol_a',             1, 1, bool],
-        ])
-
-class XEncoderRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x39, 'x_enc', spi, status_cb, [
-            ['x_enc',  31, 32, int]
-        ])
-
-class EncoderConstantRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x3A, 'enc_const', spi, status_cb, [
-            ['enc_const',  31, 32, int] # or float, based on enc_sel_decimal
-        ])
-
-class EncoderStatusRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x3B, 'enc_status', spi, status_cb, [
-            ['n_event',  0, 1, bool]
-        ])
-
-class EncoderLatchRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x3C, 'enc_latch', spi, status_cb, [
-            ['enc_const',  31, 32, int, TMCRegister.READONLY]
-        ])
-
-class ADCRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x50, 'adc_vsupply_ain', spi, status_cb, [
-            ['adc_ain',      28, 13, int, TMCRegister.READONLY],
-            ['adc_vsupply',  12, 13, int, TMCRegister.READONLY],
-        ])
-
-class ADCTempRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x51, 'adc_temp', spi, status_cb, [
-            ['adc_temp',     12, 13, int, TMCRegister.READONLY],
-        ])
-
-class OvertempOvervoltageRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x52, 'otw_ov_vth', spi, status_cb, [
-            ['overtempprewarning_vth', 28, 13, int],
-            ['overvoltage_vth', 12, 13, int]
-        ])
-
-class MicrostepCounterRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x6A, 'mscnt', spi, status_cb, [
-            ['mscnt', 9, 10, int, TMCRegister.READONLY],
-        ])
-
-class MicrostepCurrentRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x6B, 'mscuract', spi, status_cb, [
-            ['cur_a', 24, 9, int, TMCRegister.READONLY],
-            ['cur_b', 8, 9, int, TMCRegister.READONLY],
-        ])
-
-class ChopperConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x6C, 'chopconf', spi, status_cb, [
-            ['diss2vs',     31, 1, bool],
-            ['diss2g',      30, 1, bool],
-            ['dedge',       29, 1, bool],
-            ['intpol',      28, 1, bool],
-            ['mres',        27, 4, int],
-            ['tpfd',        23, 4, int],
-            ['vhighchm',    19, 1, bool],
-            ['vhighfs',     18, 1, bool],
-            ['tbl',         16, 2, int],
-            ['chm',         14, 1, bool],
-            ['disfdcc',     12, 1, bool],
-            ['fd3',         11, 1, bool],
-            ['hend_offset', 10, 4, int],
-            ['hstrt_tfd210', 6, 3, int],
-            ['toff',         3, 4, int],
-        ])
-
-class CoolstepConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x6D, 'coolconf', spi, status_cb, [
-            ['sfilt',  24, 1, bool],
-            ['sgt',    22, 7, int],
-            ['seimin', 15, 1, bool],
-            ['sedn',   14, 2, int],
-            ['semax',  11, 4, int],
-            ['seup',    6, 2, int],
-            ['semin',   3, 4, int]
-        ])
-
-class DriveStatusRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x6F, 'drv_status', spi, status_cb, [
-            ['stst',       31, 1, bool, TMCRegister.READONLY],
-            ['olb',        30, 1, bool, TMCRegister.READONLY],
-            ['ola',        29, 1, bool, TMCRegister.READONLY],
-            ['s2gb',       28, 1, bool, TMCRegister.READONLY],
-            ['s2ga',       27, 1, bool, TMCRegister.READONLY],
-            ['optw',       26, 1, bool, TMCRegister.READONLY],
-            ['ot',         25, 1, bool, TMCRegister.READONLY],
-            ['stallguard', 24, 1, bool, TMCRegister.READONLY],
-            ['cs_actual',  20, 5, int,  TMCRegister.READONLY],
-            ['fsactive',   15, 1, bool, TMCRegister.READONLY],
-            ['stealth',    14, 1, bool, TMCRegister.READONLY],
-            ['s2vsb',      13, 1, bool, TMCRegister.READONLY],
-            ['s2vsa',      12, 1, bool, TMCRegister.READONLY],
-            ['sg_result',   9, 10, int, TMCRegister.READONLY],
-        ])
-
-class PWMConfigRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x70, 'pwmconf', spi, status_cb, [
-            ['pwm_lim',            31, 4, int],
-            ['pwm_reg',            27, 4, int],
-            ['pwm_dis_reg_stst',   24, 1, bool],
-            ['pwm_meas_sd_enable', 23, 1, bool],
-            ['freewheel',          24, 2, int],
-            ['pwm_autograd',       19, 1, bool],
-            ['pwm_autoscale',      18, 1, bool],
-            ['pwm_freq',           17, 2, int],
-            ['pwm_grad',           15, 8, int],
-            ['pwm_ofs',             7, 8, int],
-        ])
-
-class PWMScaleRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x71, 'pwm_scale', spi, status_cb, [
-            ['pwm_scale_auto', 24, 9, int, TMCRegister.READONLY],
-            ['pwm_scale_sum',  9, 10, int, TMCRegister.READONLY],
-        ])
-
-class PWMAutoRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x72, 'pwm_auto', spi, status_cb, [
-            ['pwm_grad_auto', 23, 8, int, TMCRegister.READONLY],
-            ['pwm_ofs_auto',   7, 8, int, TMCRegister.READONLY],
-        ])
-
-class StallguardThresholdRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x74, 'sg4_thrs', spi, status_cb, [
-            ['sg_angle_offset', 9, 1, bool],
-            ['sg4_filt_en',     8, 1, bool],
-            ['sf4_thrs',        7, 8, int]
-        ])
-
-class StallguardResultRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x75, 'sg4_result', spi, status_cb, [
-            ['sg4_result', 9, 10, int, TMCRegister.READONLY],
-        ])
-
-class StallguardIndependentRegister(TMCRegister):
-    def __init__(self, spi: TMCSPIWrapper, status_cb: Callable[[str, str], int]):
-        super().__init__(0x76, 'sg4_ind', spi, status_cb, [
-            ['sg4_ind_3', 31, 8, int, TMCRegister.READONLY],
-            ['sg4_ind_2', 23, 8, int, TMCRegister.READONLY],
-            ['sg4_ind_1', 15, 8, int, TMCRegister.READONLY],
-            ['sg4_ind_0',  7, 8, int, TMCRegister.READONLY],
-        ])
+        return DriverSnapshot(
+            tuple(self.REGISTERS),
+            tuple(self.__register(RegisterClass.name).word for RegisterClass in self.REGISTERS),
+            self.__status_byte or 0,
+            time.perf_counter())
 
-class TMCDriver():
-    def __init__(self, spi_bus, spi_device):
-        self.__spi: TMCSPIWrapper = TMCSPIWrapper(spi_bus, spi_device)
-
-        registers = [
-            GlobalConfigRegister,
-            GlobalStatusRegister,
-            IOInputRegister,
-            DriveConfigRegister,
-            GlobalScalerRegister,
-            CurrentRegister,
-            PowerdownRegister,
-            TStepRegister,
-            TPWMThresholdRegister,
-            TCoolThreshold,
-            THighRegister,
-            DirectModeRegister,
-            EncoderModeRegister,
-            XEncoderRegister,
-            EncoderConstantRegister,
-            EncoderStatusRegister,
-            EncoderLatchRegister,
-            ADCRegister,
-            ADCTempRegister,
-            OvertempOvervoltageRegister,
-            MicrostepCounterRegister,
-            MicrostepCurrentRegister,
-            ChopperConfigRegister,
-            CoolstepConfigRegister,
-            DriveStatusRegister,
-            PWMConfigRegister,
-            PWMScaleRegister,
-            PWMAutoRegister,
-            StallguardThresholdRegister,
-            StallguardResultRegister,
-            StallguardIndependentRegister
-        ]
+    def flush(self, verify = False):
+        registers = [register for register in self.__instantiated() if register.dirty]
+        replies = self.__spi.write_many([(register.address, register._encode()) for register in registers])
 
-        self.__registers = {}
+        for register, data in zip(registers, replies):
+            register._written(data)
 
-        for RegisterClass in registers:
-            register = RegisterClass(self.__spi, self.__set_status)
-            name = register.name
-            self.__registers[name] = register
-            getter = lambda self, name=name: self.__registers[name]
-            setattr(self.__class__, name, property(getter))
+        if not verify:
+            return
+
+        registers = [register for register in registers if not register.writeonly]
+        replies = self.__spi.read_many([register.address for register in registers])
+
+        failed = [register.name for register, data in zip(registers, replies) if not register._verify(data)]
+
+        for register, data in zip(registers, replies):
+            register._update(data)
+
+        if len(failed) > 0:
+            raise Exception(f"Verify failed for {', '.join(failed)}")
+
+    def set_refresh(self, ttl: float, *names):
+        # How long a read stays valid for field access, in milliseconds: TMCRegister.NEVER (the
+        # default) reads once on first use, TMCRegister.ALWAYS re-reads on every access. Applies
+        # to the given registers, or to all of them
+        for name in (names or self.__classes):
+            if name not in self.__classes:
+                raise Exception(f"{name} is not a register of {type(self).__name__}")
+
+            self.__ttl[name] = ttl
+            if name in self.__registers:
+                self.__registers[name].ttl = ttl
+
+    def enable_metrics(self, label: str):
+        from TMCMetrics import TMCMetrics
+
+        self.__spi.metrics = TMCMetrics(label, self.REGISTERS)
+        return self.__spi.metrics
+
+    def disable_metrics(self):
+        self.__spi.metrics = None
+
+    def enable_trace(self, path: str):
+        from TMCTrace import TraceRecorder
+
+        self.__spi.trace = TraceRecorder(path)
+        return self.__spi.trace
 
-    def read(self):
-        for name in self.__registers:
-            self.__registers[name].read()
+    def disable_trace(self):
+        if self.__spi.trace is not None:
+            self.__spi.trace.close()
+        self.__spi.trace = None
+
+    def poll_status(self) -> TMCStatus:
+        # One transfer that only refreshes the status flags
+        self.__set_status(self.__spi.status())
+        return self.status
+
+    def subscribe(self, flag: TMCStatus, callback: Callable[[TMCStatus, bool], None], edge = BOTH):
+        # Calls callback(flag, state) whenever one of the given status flags changes on any transfer,
+        # from the thread that made the transfer. Flags already set on the first transfer count as
+        # rising edges, so a reset that happened before the driver was created is reported too
+        self.__subscribers = self.__subscribers + [(int(flag), callback, edge)]
+
+    def unsubscribe(self, callback: Callable[[TMCStatus, bool], None]):
+        self.__subscribers = [subscriber for subscriber in self.__subscribers if subscriber[1] != callback]
 
     def close(self):
         self.__spi.close()
         self = None
 
+    def __register(self, name: str) -> TMCRegister:
+        register = self.__registers.get(name)
+
+        if register is None:
+            register = self.__classes[name](self.__spi, self.__set_status, self.__ttl.get(name))
+            self.__registers[name] = register
+            setattr(self, name, register)
+
+        return register
+
+    def __instantiated(self) -> [TMCRegister]:
+        # Registers that have been touched, in map order
+        return [self.__registers[RegisterClass.name] for RegisterClass in self.REGISTERS if RegisterClass.name in self.__registers]
+
     def __set_status(self, status: hex):
-        self.__status = {
-            'standstill':   bool((status >> 3) & 1),
-            'sg2':          bool((status >> 2) & 1),
-            'driver_error': bool((status >> 1) & 1),
-            'reset_flag':   bool(status & 1)
-        }
+        # Runs on every transfer: keep the raw byte and only do more work when a subscribed flag moved
+        status &= self.STATUS_MASK
+        previous, self.__status_byte = self.__status_byte, status
+
+        if previous != status and self.__subscribers:
+            self.__notify((previous or 0) ^ status, status)
+
+    def __notify(self, changed: int, status: int):
+        for flag, callback, edge in self.__subscribers:
+            for bit in TMCStatus:
+                if not changed & flag & bit:
+                    continue
+
+                state = bool(status & bit)
+                if edge & (RISING if state else FALLING):
+                    try:
+                        callback(bit, state)
+                    except Exception:
+                        logging.exception(f"Status callback for {bit.name} failed")
+
+    @property
+    def status(self) -> TMCStatus:
+        return TMCStatus(self.__status_byte or 0)
 
     @property
     def standstill(self):
-        return self.__status['standstill']
-    
+        return bool((self.__status_byte or 0) & TMCStatus.STANDSTILL)
+
     @property
     def sg2(self):
-        return self.__status['sg2']
+        return bool((self.__status_byte or 0) & TMCStatus.SG2)
 
     @property
     def driver_error(self):
-        return self.__status['driver_error']
+        return bool((self.__status_byte or 0) & TMCStatus.DRIVER_ERROR)
 
     @property
     def reset_flag(self):
-        return self.__status['reset_flag']
+        return bool((self.__status_byte or 0) & TMCStatus.RESET_FLAG)
 
     def __str__(self):
-        if self.__status == None:
-            return 'Status not yet read.'
+        registers = '\n\n'.join([str(self.__register(RegisterClass.name)) for RegisterClass in self.REGISTERS])
 
-        return tabulate(list(self.__status.items()), headers=['Status Flags', ''], tablefmt='pretty') + '\n\n' \
-            + '\n\n'.join([str(register) for _, register in self.__registers.items()])
+        if self.__status_byte == None:
+            return 'Status not yet read.'
 
+        flags = [(flag.name.lower(), bool(self.__status_byte & flag)) for flag in TMCStatus if flag & self.STATUS_MASK]
+        return tabulate(flags, headers=['Status Flags', ''], tablefmt='pretty') + '\n\n' + registers
@@ -0,0 +1,182 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from TMCStatus import STATUS_FLAGS
+
+# Upper bounds of the transfer latency histogram, in seconds
+LATENCY_BUCKETS = [0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01]
+
+
+class _RegisterStats():
+    __slots__ = ('reads', 'writes', 'bytes', 'latency_sum', 'buckets')
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+class TMCMetrics():
+    # Attached to a TMCSPIWrapper through its metrics attribute; the wrapper only takes the
+    # measured path while one is attached
+    def __init__(self, label: str, registers = []):
+        self.label = label
+        self.__names = {RegisterClass.address: RegisterClass.name for RegisterClass in registers}
+        self.__registers = {}
+        self.__lock = threading.Lock()
+
+        self.__transfers = 0
+        self.__bytes = 0
+        self.__busy = 0.0
+        self.__status = None
+        self.__rising = [0] * 8
+        self.__falling = [0] * 8
+
+    def record_read(self, address: hex, latency: float, status: hex):
+        with self.__lock:
+            stats = self.__stats(address)
+            stats.reads += 1
+            self.__record_transfer(stats, latency, status)
+
+    def record_write(self, address: hex, latency: float, status: hex):
+        with self.__lock:
+            stats = self.__stats(address)
+            stats.writes += 1
+            self.__record_transfer(stats, latency, status)
+
+    def record_overhead(self, latency: float, status: hex):
+        # The transfer that primes a read pipeline carries no register data
+        with self.__lock:
+            self.__transfers += 1
+            self.__bytes += 5
+            self.__busy += latency
+            self.__record_status(status)
+
+    def snapshot(self) -> {str: object}:
+        with self.__lock:
+            return {
+                'driver':    self.label,
+                'transfers': self.__transfers,
+                'bytes':     self.__bytes,
+                'busy_s':    self.__busy,
+                'registers': {
+                    self.__name(address): {
+                        'reads':       stats.reads,
+                        'writes':      stats.writes,
+                        'bytes':       stats.bytes,
+                        'latency_sum': stats.latency_sum,
+                        'buckets':     dict(zip([*LATENCY_BUCKETS, float('inf')], stats.buckets)),
+                    }
+                    for address, stats in self.__registers.items()
+                },
+                'status_transitions': {
+                    flag: {'rising': self.__rising[bit], 'falling': self.__falling[bit]}
+                    for bit, flag in enumerate(STATUS_FLAGS)
+                },
+            }
+
+    def prometheus(self) -> str:
+        return prometheus([self])
+
+    def __stats(self, address: hex) -> _RegisterStats:
+        stats = self.__registers.get(address)
+        if stats is None:
+            stats = self.__registers[address] = _RegisterStats()
+        return stats
+
+    def __name(self, address: hex) -> str:
+        return self.__names.get(address, f'0x{address:02X}')
+
+    def __record_transfer(self, stats: _RegisterStats, latency: float, status: hex):
+        stats.bytes += 5
+        stats.latency_sum += latency
+        stats.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        self.__transfers += 1
+        self.__bytes += 5
+        self.__busy += latency
+        self.__record_status(status)
+
+    def __record_status(self, status: hex):
+        previous, self.__status = self.__status, status
+        if previous is None or previous == status:
+            return
+
+        changed = previous ^ status
+        for bit in range(8):
+            if (changed >> bit) & 1:
+                if (status >> bit) & 1:
+                    self.__rising[bit] += 1
+                else:
+                    self.__falling[bit] += 1
+
+
+def prometheus(metrics: [TMCMetrics]) -> str:
+    # Renders any number of drivers in the Prometheus text exposition format
+    snapshots = [m.snapshot() for m in metrics]
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family('tmc_spi_transfers_total', 'counter', 'SPI datagrams exchanged with the driver.')
+    for s in snapshots:
+        lines.append(f'tmc_spi_transfers_total{{driver="{s["driver"]}"}} {s["transfers"]}')
+
+    family('tmc_spi_bytes_total', 'counter', 'Bytes clocked over SPI for the driver.')
+    for s in snapshots:
+        lines.append(f'tmc_spi_bytes_total{{driver="{s["driver"]}"}} {s["bytes"]}')
+
+    family('tmc_spi_busy_seconds_total', 'counter', 'Time spent inside SPI transfers for the driver.')
+    for s in snapshots:
+        lines.append(f'tmc_spi_busy_seconds_total{{driver="{s["driver"]}"}} {s["busy_s"]}')
+
+    for key, name, help_text in [('reads', 'tmc_register_reads_total', 'Register reads.'),
+                                 ('writes', 'tmc_register_writes_total', 'Register writes.'),
+                                 ('bytes', 'tmc_register_bytes_total', 'Bytes transferred for a register.')]:
+        family(name, 'counter', help_text)
+        for s in snapshots:
+            for register, stats in s['registers'].items():
+                lines.append(f'{name}{{driver="{s["driver"]}",register="{register}"}} {stats[key]}')
+
+    family('tmc_register_transfer_seconds', 'histogram', 'Latency of the transfer that carried a register.')
+    for s in snapshots:
+        for register, stats in s['registers'].items():
+            labels = f'driver="{s["driver"]}",register="{register}"'
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'tmc_register_transfer_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'tmc_register_transfer_seconds_sum{{{labels}}} {stats["latency_sum"]}')
+            lines.append(f'tmc_register_transfer_seconds_count{{{labels}}} {cumulative}')
+
+    family('tmc_status_transitions_total', 'counter', 'Edges of the status byte flags.')
+    for s in snapshots:
+        for flag, edges in s['status_transitions'].items():
+            for edge, count in edges.items():
+                lines.append(f'tmc_status_transitions_total{{driver="{s["driver"]}",flag="{flag}",edge="{edge}"}} {count}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def serve_prometheus(metrics: [TMCMetrics], port: int, host = '') -> ThreadingHTTPServer:
+    # Serves /metrics from a daemon thread; call shutdown() on the returned server to stop it
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus(metrics).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='TMCMetrics', daemon=True).start()
+    return server
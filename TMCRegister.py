@@ -0,0 +1,276 @@
+import logging
+import math
+import threading
+import time
+from tabulate import tabulate
+from typing import Callable
+
+_clock = time.monotonic
+
+# Read-only subclasses of each register class, made on first use by _frozen_class
+_frozen_classes = {}
+
+
+class TMCRegisterType(type):
+    # Compiles the value_map of a hand-written register class once, when the class is defined,
+    # into field properties with precomputed shifts and masks over a single packed data word.
+    # Classes generated by regmapgen.py already carry their properties and are left alone
+    def __new__(mcs, class_name, bases, namespace):
+        namespace.setdefault('__slots__', ())
+        cls = super().__new__(mcs, class_name, bases, namespace)
+
+        if '_fields' in namespace:
+            return cls
+
+        cls._fields = tuple(name for name, *_ in cls.value_map)
+        cls._write_mask = 0
+
+        for name, start, length, T, *optional in cls.value_map:
+            shift = start - length + 1
+            mask = (1 << length) - 1
+
+            flags = optional[0] if len(optional) > 0 else 0
+
+            prop = property(TMCRegisterType.__getter(shift, mask, T, flags & TMCRegister.SIGNED))
+
+            if not flags & TMCRegister.READONLY:
+                prop = prop.setter(field_setter(shift, mask))
+                cls._write_mask |= mask << shift
+
+            setattr(cls, name, prop)
+
+        return cls
+
+    @staticmethod
+    def __getter(shift, mask, T, signed):
+        if signed:
+            # Two's complement: subtract the sign bit's weight twice when it is set
+            sign = (mask + 1) >> 1
+            return lambda self: (((self._current() if self._volatile else self._word) >> shift) & mask ^ sign) - sign
+        if T is bool:
+            return lambda self: ((self._current() if self._volatile else self._word) >> shift) & mask != 0
+        if T is int:
+            return lambda self: ((self._current() if self._volatile else self._word) >> shift) & mask
+        return lambda self: T(((self._current() if self._volatile else self._word) >> shift) & mask)
+
+
+def field_setter(shift: int, mask: int):
+    keep = ~(mask << shift) & 0xFFFFFFFF
+
+    def setter(self, value):
+        self._word = ((self._current() if self._volatile else self._word) & keep) | ((int(value) & mask) << shift)
+        self._dirty = True
+
+    return setter
+
+
+class TMCRegister(metaclass=TMCRegisterType):
+    READONLY = 0x01
+    WRITEONLY = 0x02
+    SIGNED = 0x04
+
+    # Freshness policies, as ttl values: load once on first use, or re-read on every access.
+    # Anything in between is a time to live in milliseconds
+    NEVER = None
+    ALWAYS = 0
+
+    __slots__ = ('__spi', '__status_cb', '__lock', '__owner', '_word', '_dirty', '_known', '_ttl', '_expires', '_volatile')
+
+    address: hex = None
+    name: str = None
+    flags = 0
+    value_map = []
+
+    def __init__(self, spi: 'TMCSPIWrapper', status_cb: Callable[[str, str], int], ttl: float = NEVER):
+        if (self.address == None):
+            raise Exception("Must specify the register address")
+
+        self.__spi = spi
+        self.__status_cb: Callable[[hex], None] = status_cb
+        self.__lock = threading.Lock()
+        self.__owner = None
+
+        self._word = 0
+        self._dirty = False
+        self._known = not self.writeonly
+
+        # Nothing is read here: the first field access loads the word. Write-only registers
+        # read back as zero, so they are served from the shadow copy and never expire
+        self._expires = math.inf if self.writeonly else -math.inf
+        self.ttl = ttl
+
+    @property
+    def writeonly(self) -> bool:
+        return bool(self.flags & TMCRegister.WRITEONLY)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def known(self) -> bool:
+        # Whether the shadow copy of a write-only register holds what the chip has, or will once
+        # flushed: it starts as zeros, not as the chip's configuration. Always true for the others
+        return self._known or self._dirty
+
+    @property
+    def word(self) -> int:
+        # The cached word, as last read or assigned; unlike the fields it never triggers a read
+        return self._word
+
+    @property
+    def ttl(self) -> float:
+        return None if self._ttl is None else self._ttl * 1000
+
+    @ttl.setter
+    def ttl(self, ttl: float):
+        # A finite ttl takes effect from a fresh read; NEVER keeps a word that was already loaded
+        self._ttl = None if ttl is None else ttl / 1000
+        if self._ttl is not None and not self.writeonly:
+            self._expires = -math.inf
+        elif self._ttl is None and self._expires != -math.inf:
+            self._expires = math.inf
+
+        # Only volatile registers look at the clock on field access: those with a finite ttl,
+        # and those that have not been loaded yet
+        self._volatile = self._expires != math.inf
+
+    @property
+    def stale(self) -> bool:
+        # Whether the next field access would read the bus
+        return self._volatile and not self._dirty and _clock() >= self._expires
+
+    def cached(self) -> 'TMCRegister':
+        # A detached, read-only copy of the cached word; its fields never touch the bus, and
+        # setting one or calling read/write/refresh/assign on it raises
+        return self.decode(self._word)
+
+    @classmethod
+    def decode(cls, word: int) -> 'TMCRegister':
+        # A read-only instance over a word from elsewhere, such as a snapshot or a trace
+        frozen = object.__new__(_frozen_class(cls))
+        frozen._word, frozen._volatile, frozen._dirty, frozen._known = word, False, False, True
+        return frozen
+
+    def refresh(self):
+        # Concurrent refreshes are coalesced: a thread that finds one in flight waits for its
+        # result instead of reading again. The refreshing thread itself can get back here from a
+        # status callback; it then uses the word it already has rather than waiting on itself
+        if self.__lock.acquire(blocking=False):
+            self.__owner = threading.get_ident()
+            try:
+                self.read()
+            finally:
+                self.__owner = None
+                self.__lock.release()
+        elif self.__owner != threading.get_ident():
+            with self.__lock:
+                pass
+
+    def read(self):
+        if self.writeonly:
+            return
+
+        self._update(self.__spi.read(self.address))
+
+    def write(self):
+        data = self.__spi.write(self.address, self._encode())
+        self._written(data)
+
+    def assign(self, values: {str: object}, dirty: bool = None) -> bool:
+        # Sets several fields at once. By default the register only becomes dirty if a writable
+        # bit actually changed; dirty=True always marks it, dirty=False only updates the shadow.
+        # Returns whether the register is dirty. A forced write of every field does not load the
+        # register first, since none of the old word survives it
+        was_dirty = self._dirty
+        if dirty and all(field in values for field in self._fields):
+            self._dirty = True
+            word = self._word
+        else:
+            word = self._current()
+
+        for name, value in values.items():
+            setattr(self, name, value)
+
+        if dirty is None:
+            dirty = (word ^ self._word) & self._write_mask != 0
+
+        self._dirty = was_dirty or dirty
+        self._known = True
+        return self._dirty
+
+    def _written(self, data: [hex, hex, hex, hex, hex]):
+        # Settle the register before the status callback, which may read it back
+        self._dirty = False
+        self._known = True
+        self.__status_cb(data[0])
+
+    def _verify(self, data: [hex, hex, hex, hex, hex]) -> bool:
+        read_word = (data[1] << 24) | (data[2] << 16) | (data[3] << 8) | data[4]
+        return (read_word ^ self._word) & self._write_mask == 0
+
+    def _update(self, data: [hex, hex, hex, hex, hex]):
+        if logging.root.isEnabledFor(logging.DEBUG):
+            formatted_data = "".join([f"{format(i, '02X')}" for i in data])
+            logging.debug(f"Read from 0x{format(self.address, '02X')} : 0x{formatted_data}")
+
+        self._word = (data[1] << 24) | (data[2] << 16) | (data[3] << 8) | data[4]
+        if self._volatile:
+            self._loaded()
+        self.__status_cb(data[0])
+
+    def _decode(self, data: [hex, hex, hex, hex]):
+        self._word = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
+        if self._volatile:
+            self._loaded()
+
+    def _loaded(self):
+        if self._ttl is None:
+            self._expires = math.inf
+            self._volatile = False
+        else:
+            self._expires = _clock() + self._ttl
+
+    def _current(self) -> int:
+        # The word behind field access on volatile registers: re-read first when the freshness
+        # policy says it has expired, unless it holds changes that have not been written yet
+        if self._volatile and not self._dirty and _clock() >= self._expires:
+            self.refresh()
+        return self._word
+
+    def values(self) -> {str: object}:
+        # Every field decoded from one word, refreshed at most once, so the fields are consistent
+        # with each other even when the ttl would expire between them
+        frozen = self.decode(self._current())
+        return {name: getattr(frozen, name) for name in self._fields}
+
+    def _encode(self) -> [hex, hex, hex, hex]:
+        data_word = self._word
+        return [(data_word >> 24) & 0xFF, (data_word >> 16) & 0xFF, (data_word >> 8) & 0xFF, data_word & 0xFF]
+
+    def __str__(self):
+        return tabulate(list(self.values().items()), headers=[self.name, ''], tablefmt='pretty')
+
+
+def _frozen_class(cls):
+    # The same fields over a plain word, with every setter and bus method replaced by one that
+    # raises: a change made to a copy would otherwise be lost without the driver seeing it
+    FrozenClass = _frozen_classes.get(cls)
+    if FrozenClass is not None:
+        return FrozenClass
+
+    namespace = {'_fields': cls._fields}
+    for name in cls._fields:
+        prop = getattr(cls, name)
+        if prop.fset is not None:
+            namespace[name] = property(prop.fget, _read_only)
+    for method in ('read', 'write', 'refresh', 'assign'):
+        namespace[method] = _read_only
+
+    FrozenClass = type(cls)(cls.__name__, (cls,), namespace)
+    _frozen_classes[cls] = _frozen_classes[FrozenClass] = FrozenClass
+    return FrozenClass
+
+
+def _read_only(self, *args):
+    raise Exception(f"This {self.name} is a read-only copy of a cached word; set fields with assign() on the driver's register and write them with flush()")
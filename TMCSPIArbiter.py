@@ -0,0 +1,180 @@
+import threading
+import time
+from contextlib import contextmanager
+from TMCDriver import TMCSPIWrapper
+
+
+class TMCSPIArbiter():
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+    def __init__(self, spi: TMCSPIWrapper, chunk_size = 8):
+        self.__spi = spi
+        self.__chunk_size = chunk_size
+
+        self.__condition = threading.Condition()
+        self.__busy = False
+        self.__waiting = [0, 0, 0]
+        self.__local = threading.local()
+
+        self.__acquired = [0, 0, 0]
+        self.__wait_total = [0.0, 0.0, 0.0]
+        self.__wait_max = [0.0, 0.0, 0.0]
+
+    @contextmanager
+    def priority(self, level: int):
+        # Sets the lane used by the calling thread's transfers for the duration of the block
+        previous = self.__priority()
+        self.__local.priority = level
+        try:
+            yield self
+        finally:
+            self.__local.priority = previous
+
+    @property
+    def metrics(self):
+        return self.__spi.metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        self.__spi.metrics = metrics
+
+    @property
+    def trace(self):
+        return self.__spi.trace
+
+    @trace.setter
+    def trace(self, trace):
+        self.__spi.trace = trace
+
+    def read(self, address: hex) -> [hex, hex, hex, hex, hex]:
+        return self.read_many([address])[0]
+
+    def read_many(self, addresses: [hex]) -> [[hex, hex, hex, hex, hex]]:
+        return self.__chunked(self.__spi.read_many, addresses)
+
+    def write(self, address: hex, data: [hex, hex, hex, hex]) -> [hex, hex, hex, hex, hex]:
+        return self.write_many([(address, data)])[0]
+
+    def write_many(self, writes: [[hex, [hex, hex, hex, hex]]]) -> [[hex, hex, hex, hex, hex]]:
+        return self.__chunked(self.__spi.write_many, writes)
+
+    def status(self) -> hex:
+        self.__acquire()
+        try:
+            return self.__spi.status()
+        finally:
+            self.__release()
+
+    @property
+    def speed_hz(self) -> int:
+        return self.__spi.speed_hz
+
+    @speed_hz.setter
+    def speed_hz(self, speed_hz: int):
+        # Changing the clock between the halves of another thread's pipelined read would corrupt it
+        self.__acquire()
+        try:
+            self.__spi.speed_hz = speed_hz
+        finally:
+            self.__release()
+
+    @contextmanager
+    def writer(self):
+        # Holds the bus on the high lane while streaming, so no other transfer can land between
+        # the halves of a pipelined read. Each datagram is a complete write, so the stream steps
+        # aside between datagrams whenever another high-lane transfer is waiting
+        with self.priority(TMCSPIArbiter.HIGH):
+            self.__acquire()
+        try:
+            with self.__spi.writer() as raw:
+                waiting = self.__waiting
+
+                def write(data):
+                    if waiting[TMCSPIArbiter.HIGH] > 0:
+                        self.__yield()
+                    return raw(data)
+
+                yield write
+        finally:
+            self.__release()
+
+    def close(self):
+        self.__acquire()
+        try:
+            self.__spi.close()
+        finally:
+            self.__release()
+
+    def stats(self) -> {str: {str: float}}:
+        with self.__condition:
+            return {
+                name: {
+                    'queue_depth':  self.__waiting[level],
+                    'transactions': self.__acquired[level],
+                    'mean_wait_s':  self.__wait_total[level] / self.__acquired[level] if self.__acquired[level] > 0 else 0.0,
+                    'max_wait_s':   self.__wait_max[level],
+                }
+                for name, level in [('high', TMCSPIArbiter.HIGH), ('normal', TMCSPIArbiter.NORMAL), ('low', TMCSPIArbiter.LOW)]
+            }
+
+    def __priority(self) -> int:
+        return getattr(self.__local, 'priority', TMCSPIArbiter.NORMAL)
+
+    def __chunked(self, transaction, items):
+        # The high lane runs its whole batch as one transaction. Lower lanes run it in pipelined
+        # chunks and hand the bus over between chunks when a more urgent lane is waiting
+        priority = self.__acquire()
+        try:
+            if priority == TMCSPIArbiter.HIGH:
+                return transaction(items)
+
+            results = []
+            for start in range(0, len(items), self.__chunk_size):
+                if start > 0 and self.__preempted(priority):
+                    self.__release()
+                    self.__acquire()
+                results.extend(transaction(items[start:start + self.__chunk_size]))
+            return results
+        finally:
+            self.__release()
+
+    def __preempted(self, priority: int) -> bool:
+        with self.__condition:
+            return any(self.__waiting[:priority])
+
+    def __acquire(self) -> int:
+        priority = self.__priority()
+        start = time.perf_counter()
+
+        with self.__condition:
+            self.__waiting[priority] += 1
+            while self.__busy or any(self.__waiting[:priority]):
+                self.__condition.wait()
+            self.__waiting[priority] -= 1
+            self.__busy = True
+
+            waited = time.perf_counter() - start
+            self.__acquired[priority] += 1
+            self.__wait_total[priority] += waited
+            self.__wait_max[priority] = max(self.__wait_max[priority], waited)
+
+        return priority
+
+    def __yield(self):
+        # Lets every waiting high-lane transfer through, then takes the bus back ahead of the
+        # lower lanes by counting as a high-lane waiter meanwhile
+        with self.__condition:
+            self.__busy = False
+            self.__waiting[TMCSPIArbiter.HIGH] += 1
+            self.__condition.notify_all()
+            while self.__busy or self.__waiting[TMCSPIArbiter.HIGH] > 1:
+                self.__condition.wait()
+            self.__waiting[TMCSPIArbiter.HIGH] -= 1
+            self.__busy = True
+
+    def __release(self):
+        with self.__condition:
+            self.__busy = False
+            self.__condition.notify_all()
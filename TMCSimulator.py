@@ -0,0 +1,169 @@
+import random
+import time
+from TMCDriver import TMCDriver, TMCRegister, TMCTransport
+
+
+class LatencyModel():
+    # Time one transfer occupies the bus: a fixed per-transfer overhead (chip select, syscall)
+    # plus the bits clocked at the configured SPI speed
+    def __init__(self, overhead_s = 0.00002, realtime = True):
+        self.overhead_s = overhead_s
+        self.realtime = realtime
+
+    def duration(self, length: int, speed_hz: int) -> float:
+        return self.overhead_s + length * 8 / speed_hz
+
+
+class SimulatedTMC(TMCTransport):
+    GSTAT = 0x01
+
+    def __init__(self, registers = TMCDriver.REGISTERS, latency: LatencyModel = None, gstat_clear_on_read = True,
+                 unreliable_above_hz: int = None, error_rate = 0.5):
+        self.max_speed_hz = 500000
+        self.mode = 0b11
+        self.lsbfirst = False
+
+        self.latency = latency if latency is not None else LatencyModel(realtime=False)
+        self.gstat_clear_on_read = gstat_clear_on_read
+
+        # Models a long cable: above this clock, a transfer has error_rate chance of one flipped
+        # data bit in either direction
+        self.unreliable_above_hz = unreliable_above_hz
+        self.error_rate = error_rate
+
+        self.__words = {}
+        self.__write_masks = {}
+        self.__writeonly = set()
+
+        for RegisterClass in registers:
+            self.__words[RegisterClass.address] = 0
+            self.__write_masks[RegisterClass.address] = RegisterClass._write_mask
+            if RegisterClass.flags & TMCRegister.WRITEONLY:
+                self.__writeonly.add(RegisterClass.address)
+
+        # A chip that just powered up reports the reset flag until gstat is cleared
+        self.__words[SimulatedTMC.GSTAT] = 0x01
+        self.__status = 0x00
+        self.__reply = 0x00000000
+
+        self.transfers = 0
+        self.bytes = 0
+        self.bus_time = 0.0
+
+    def peek(self, address: hex) -> int:
+        return self.__words.get(address, 0)
+
+    def poke(self, address: hex, word: int):
+        # Sets a register as the chip itself would, bypassing read-only masks
+        self.__words[address] = word & 0xFFFFFFFF
+
+    def set_status(self, status: hex):
+        # Status bits that are not derived from gstat: sg2, standstill and the TMC5160 ramp flags
+        self.__status = status & 0xFC
+
+    def xfer2(self, data: [hex]) -> [hex]:
+        if self.unreliable_above_hz is None or self.max_speed_hz <= self.unreliable_above_hz or random.random() >= self.error_rate:
+            return _timed(self, self.latency, data, self.exchange)
+
+        # Flip one bit after the address byte, on the way in or on the way out
+        bit = random.randrange(64)
+        if bit < 32:
+            data = list(data)
+            data[1 + bit // 8] ^= 1 << (bit % 8)
+            return _timed(self, self.latency, data, self.exchange)
+
+        reply = _timed(self, self.latency, data, self.exchange)
+        reply[1 + (bit - 32) // 8] ^= 1 << (bit % 8)
+        return reply
+
+    def exchange(self, data: [hex]) -> [hex]:
+        # One datagram through the chip's shift register, without any bus timing
+        reply = [self.__status_byte()] + list(self.__reply.to_bytes(4, 'big'))
+        address = data[0] & 0x7F
+        word = (data[1] << 24) | (data[2] << 16) | (data[3] << 8) | data[4]
+
+        if data[0] & 0x80:
+            self.__write(address, word)
+            self.__reply = word
+        else:
+            self.__reply = self.__read(address)
+
+        return reply
+
+    def close(self):
+        pass
+
+    def __status_byte(self) -> hex:
+        gstat = self.__words.get(SimulatedTMC.GSTAT, 0)
+        # reset_flag mirrors gstat.reset, driver_error mirrors gstat.drv_err
+        return self.__status | (gstat & 0x03)
+
+    def __read(self, address: hex) -> int:
+        if address in self.__writeonly:
+            return 0
+
+        word = self.__words.get(address, 0)
+        if address == SimulatedTMC.GSTAT and self.gstat_clear_on_read:
+            self.__words[address] = 0
+
+        return word
+
+    def __write(self, address: hex, word: int):
+        if address not in self.__words:
+            return
+
+        if address == SimulatedTMC.GSTAT:
+            # Write one to clear
+            self.__words[address] &= ~word
+            return
+
+        mask = self.__write_masks[address]
+        self.__words[address] = (self.__words[address] & ~mask) | (word & mask)
+
+
+class SimulatedChain(TMCTransport):
+    # Daisy-chained chips behind one chip select; position 0 is wired to the host's MOSI
+    def __init__(self, chips: [SimulatedTMC], latency: LatencyModel = None):
+        self.chips = chips
+        self.max_speed_hz = 500000
+        self.mode = 0b11
+        self.lsbfirst = False
+
+        self.latency = latency if latency is not None else LatencyModel(realtime=False)
+
+        self.transfers = 0
+        self.bytes = 0
+        self.bus_time = 0.0
+
+    def xfer2(self, data: [hex]) -> [hex]:
+        return _timed(self, self.latency, data, self.exchange)
+
+    def exchange(self, data: [hex]) -> [hex]:
+        reply = []
+        length = len(self.chips)
+
+        for index in range(length):
+            reply.extend(self.chips[length - 1 - index].exchange(data[index * 5:(index + 1) * 5]))
+
+        return reply
+
+    def close(self):
+        pass
+
+
+def _timed(transport, latency: LatencyModel, data: [hex], exchange) -> [hex]:
+    duration = latency.duration(len(data), transport.max_speed_hz)
+    started = time.perf_counter()
+
+    reply = exchange(data)
+
+    transport.transfers += 1
+    transport.bytes += len(data)
+    transport.bus_time += duration
+
+    # Busy-wait: sleep granularity is far coarser than a 40-bit transfer
+    if latency.realtime:
+        while time.perf_counter() - started < duration:
+            pass
+
+    return reply
@@ -0,0 +1,23 @@
+from enum import IntFlag
+
+# Edges a status subscription fires on
+RISING = 0x01
+FALLING = 0x02
+BOTH = RISING | FALLING
+
+
+class TMCStatus(IntFlag):
+    # The status byte that leads every SPI reply. The upper four bits come from the TMC5160's
+    # ramp generator and are masked off on chips without one
+    RESET_FLAG = 0x01
+    DRIVER_ERROR = 0x02
+    SG2 = 0x04
+    STANDSTILL = 0x08
+    VELOCITY_REACHED = 0x10
+    POSITION_REACHED = 0x20
+    STATUS_STOP_L = 0x40
+    STATUS_STOP_R = 0x80
+
+
+# Flag names by bit, LSB first, as used for metric labels and snapshot diffs
+STATUS_FLAGS = [flag.name.lower() for flag in TMCStatus]
@@ -0,0 +1,103 @@
+import mmap
+import os
+import struct
+import time
+import numpy as np
+from bulk_decode import decode_array
+
+READ = 0
+WRITE = 1
+
+HEADER = struct.Struct('<8sII')  # magic, version, record size
+MAGIC = b'TMCTRACE'
+VERSION = 1
+
+# timestamp (ns since the epoch), direction, address, data word, status byte, padding
+RECORD = struct.Struct('<QBBIBx')
+RECORD_DTYPE = np.dtype([('timestamp', '<u8'), ('direction', 'u1'), ('address', 'u1'), ('data', '<u4'), ('status', 'u1'), ('pad', 'u1')])
+
+
+class TraceRecorder():
+    # Appends fixed-size records to a memory-mapped file that grows in chunks. Unused space is
+    # zero-filled, so a trace cut short by a crash ends at the first zero timestamp
+    def __init__(self, path: str, chunk_records = 1 << 20):
+        self.__chunk = chunk_records * RECORD.size
+        self.__file = open(path, 'w+b')
+        self.__file.truncate(HEADER.size + self.__chunk)
+        self.__map = mmap.mmap(self.__file.fileno(), 0)
+        HEADER.pack_into(self.__map, 0, MAGIC, VERSION, RECORD.size)
+
+        self.__offset = HEADER.size
+        self.count = 0
+
+    def record(self, direction: int, address: hex, data: [hex, hex, hex, hex], status: hex):
+        if self.__offset + RECORD.size > len(self.__map):
+            self.__map.resize(len(self.__map) + self.__chunk)
+
+        word = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
+        RECORD.pack_into(self.__map, self.__offset, time.time_ns(), direction, address, word, status)
+        self.__offset += RECORD.size
+        self.count += 1
+
+    def flush(self):
+        self.__map.flush()
+
+    def close(self):
+        self.__map.flush()
+        self.__map.close()
+        self.__file.truncate(self.__offset)
+        self.__file.close()
+
+
+class TraceReplay():
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise Exception(f"{path} is not a version {VERSION} TMC trace")
+
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+
+        end = np.flatnonzero(records['timestamp'] == 0)
+        self.records = records[:end[0]] if len(end) > 0 else records
+
+    def history(self, register_class, direction = READ) -> (np.ndarray, {str: np.ndarray}):
+        # Timestamps and per-field columns of every read (or write) of one register
+        selected = self.records[(self.records['address'] == register_class.address) & (self.records['direction'] == direction)]
+        return selected['timestamp'], decode_array(register_class, selected['data'])
+
+    def replay(self, registers) -> {str: (np.ndarray, {str: np.ndarray})}:
+        return {RegisterClass.name: self.history(RegisterClass) for RegisterClass in registers}
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Reconstructs field-level register history from an SPI trace.')
+    parser.add_argument('trace', help='Trace file written by TraceRecorder')
+    parser.add_argument('--chip', default='tmc2240', choices=['tmc2240', 'tmc5160'], help='Register map to decode with (default: %(default)s)')
+    parser.add_argument('--register', action='append', help='Register name to print; repeat for several (default: all)')
+    parser.add_argument('--writes', action='store_true', help='Show host writes instead of chip replies')
+    args = parser.parse_args()
+
+    if args.chip == 'tmc5160':
+        from TMC5160 import TMC5160 as Driver
+    else:
+        from TMCDriver import TMCDriver as Driver
+
+    replay = TraceReplay(args.trace)
+    print(f'{len(replay.records)} records')
+
+    for RegisterClass in Driver.REGISTERS:
+        if args.register and RegisterClass.name not in args.register:
+            continue
+
+        timestamps, columns = replay.history(RegisterClass, WRITE if args.writes else READ)
+        if len(timestamps) == 0:
+            continue
+
+        print(f'\n{RegisterClass.name}')
+        print('\t'.join(['timestamp_ns', *columns]))
+        for index in range(len(timestamps)):
+            print('\t'.join([str(timestamps[index]), *[str(values[index]) for values in columns.values()]]))
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+import numpy as np
+from bulk_decode import decode_array
+
+
+class TelemetrySampler():
+    def __init__(self, driver, rates: {str: float}, capacity = 65536):
+        self.__driver = driver
+        self.__names = list(rates)
+        self.__registers = [getattr(driver, name) for name in self.__names]
+        self.__rates = np.array([rates[name] for name in self.__names], dtype=np.float64)
+        self.__periods = 1.0 / self.__rates
+        self.__capacity = capacity
+
+        # One preallocated ring per register, indexed by the running sample count
+        self.__timestamps = np.zeros((len(self.__names), capacity), dtype=np.float64)
+        self.__words = np.zeros((len(self.__names), capacity), dtype=np.uint32)
+        self.__counts = np.zeros(len(self.__names), dtype=np.int64)
+        self.__drained = np.zeros(len(self.__names), dtype=np.int64)
+        self.__missed = np.zeros(len(self.__names), dtype=np.int64)
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__started = None
+        self.__stopped = None
+        self.__error = None
+
+    def start(self):
+        if self.__thread is not None:
+            raise Exception("Sampler already running")
+
+        self.__stop.clear()
+        self.__started = time.perf_counter()
+        self.__stopped = None
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__run, name='TelemetrySampler', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        # Raises if sampling ended on a failed read; the samples taken before it are kept
+        if self.__thread is None:
+            return
+
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+
+        if self.__error is not None:
+            raise Exception("Telemetry sampling failed") from self.__error
+
+    @property
+    def error(self) -> Exception:
+        # The exception that ended sampling early, or None
+        return self.__error
+
+    def latest(self, name: str) -> (float, int):
+        index = self.__names.index(name)
+
+        with self.__lock:
+            count = self.__counts[index]
+            if count == 0:
+                return None
+
+            position = (count - 1) % self.__capacity
+            return float(self.__timestamps[index, position]), int(self.__words[index, position])
+
+    def snapshot(self, name: str, decode = False):
+        index = self.__names.index(name)
+
+        with self.__lock:
+            count = self.__counts[index]
+            return self.__copy(index, max(0, count - self.__capacity), count, decode)
+
+    def drain(self, name: str, decode = False):
+        # Returns the samples taken since the previous drain; anything older than the ring was lost
+        index = self.__names.index(name)
+
+        with self.__lock:
+            count = self.__counts[index]
+            start = max(self.__drained[index], count - self.__capacity)
+            self.__drained[index] = count
+            return self.__copy(index, start, count, decode)
+
+    def stats(self) -> {str: {str: float}}:
+        # Rates are over the time sampling ran, so they hold still once it has ended
+        end = self.__stopped if self.__stopped is not None else time.perf_counter()
+        elapsed = end - self.__started if self.__started is not None else 0.0
+
+        with self.__lock:
+            return {
+                name: {
+                    'requested_hz': float(self.__rates[index]),
+                    'actual_hz':    float(self.__counts[index] / elapsed) if elapsed > 0 else 0.0,
+                    'samples':      int(self.__counts[index]),
+                    'missed':       int(self.__missed[index]),
+                }
+                for index, name in enumerate(self.__names)
+            }
+
+    def __copy(self, index: int, start: int, end: int, decode: bool):
+        positions = np.arange(start, end) % self.__capacity
+        timestamps = self.__timestamps[index, positions]
+        words = self.__words[index, positions]
+
+        if decode:
+            return timestamps, decode_array(type(self.__registers[index]), words)
+
+        return timestamps, words
+
+    def __run(self):
+        try:
+            self.__sample()
+        except Exception as error:
+            logging.exception("Telemetry sampling failed")
+            self.__error = error
+        finally:
+            self.__stopped = time.perf_counter()
+
+    def __sample(self):
+        deadlines = np.full(len(self.__names), time.perf_counter())
+
+        while not self.__stop.is_set():
+            now = time.perf_counter()
+            due = np.flatnonzero(deadlines <= now)
+
+            if len(due) > 0:
+                # All registers due on this tick go out as one pipelined batch
+                self.__driver.read(*[self.__names[index] for index in due])
+                timestamp = time.perf_counter()
+
+                with self.__lock:
+                    for index in due:
+                        position = self.__counts[index] % self.__capacity
+                        self.__timestamps[index, position] = timestamp
+                        self.__words[index, position] = self.__registers[index].word
+                        self.__counts[index] += 1
+
+                    # A deadline that slipped by whole periods skips those slots instead of bursting
+                    skipped = ((now - deadlines[due]) // self.__periods[due]).astype(np.int64)
+                    self.__missed[due] += skipped
+                    deadlines[due] += (skipped + 1) * self.__periods[due]
+
+            # Sleep rather than spin so polling does not hold the GIL against step generation
+            self.__stop.wait(max(0.0, deadlines.min() - time.perf_counter()))
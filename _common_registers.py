@@ -0,0 +1,282 @@
+# Generated by regmapgen.py from register_maps.py; do not edit.
+from TMCRegister import TMCRegister, field_setter
+
+
+class GlobalScalerRegister(TMCRegister):
+    address = 0x0B
+    name = 'global_scaler'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['globalscaler',  7,  8, int],
+    ]
+    _fields = ('globalscaler',)
+    _write_mask = 0x000000FF
+
+    globalscaler = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF, field_setter(0, 0xFF))
+
+
+class PowerdownRegister(TMCRegister):
+    address = 0x11
+    name = 'tpowerdown'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['tpowerdown',  7,  8, int],
+    ]
+    _fields = ('tpowerdown',)
+    _write_mask = 0x000000FF
+
+    tpowerdown = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF, field_setter(0, 0xFF))
+
+
+class TStepRegister(TMCRegister):
+    address = 0x12
+    name = 'tstep'
+    flags = 0
+    value_map = [
+        ['tstep', 19, 20, int, TMCRegister.READONLY],
+    ]
+    _fields = ('tstep',)
+    _write_mask = 0x00000000
+
+    tstep = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF)
+
+
+class TPWMThresholdRegister(TMCRegister):
+    address = 0x13
+    name = 'tpwmthrs'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['tpwmthrs', 19, 20, int],
+    ]
+    _fields = ('tpwmthrs',)
+    _write_mask = 0x000FFFFF
+
+    tpwmthrs = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF, field_setter(0, 0xFFFFF))
+
+
+class TCoolThreshold(TMCRegister):
+    address = 0x14
+    name = 'tcoolthrs'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['tcoolthrs', 19, 20, int],
+    ]
+    _fields = ('tcoolthrs',)
+    _write_mask = 0x000FFFFF
+
+    tcoolthrs = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF, field_setter(0, 0xFFFFF))
+
+
+class THighRegister(TMCRegister):
+    address = 0x15
+    name = 'thigh'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['thigh', 19, 20, int],
+    ]
+    _fields = ('thigh',)
+    _write_mask = 0x000FFFFF
+
+    thigh = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF, field_setter(0, 0xFFFFF))
+
+
+class XEncoderRegister(TMCRegister):
+    address = 0x39
+    name = 'x_enc'
+    flags = 0
+    value_map = [
+        ['x_enc', 31, 32, int, TMCRegister.SIGNED],
+    ]
+    _fields = ('x_enc',)
+    _write_mask = 0xFFFFFFFF
+
+    x_enc = property(lambda self: ((self._current() if self._volatile else self._word) ^ 0x80000000) - 0x80000000, field_setter(0, 0xFFFFFFFF))
+
+
+class EncoderConstantRegister(TMCRegister):
+    address = 0x3A
+    name = 'enc_const'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['enc_const', 31, 32, int],
+    ]
+    _fields = ('enc_const',)
+    _write_mask = 0xFFFFFFFF
+
+    enc_const = property(lambda self: (self._current() if self._volatile else self._word), field_setter(0, 0xFFFFFFFF))
+
+
+class EncoderStatusRegister(TMCRegister):
+    address = 0x3B
+    name = 'enc_status'
+    flags = 0
+    value_map = [
+        ['deviation_warn',  1,  1, bool],
+        ['n_event',         0,  1, bool],
+    ]
+    _fields = ('deviation_warn', 'n_event')
+    _write_mask = 0x00000003
+
+    deviation_warn = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    n_event = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class EncoderLatchRegister(TMCRegister):
+    address = 0x3C
+    name = 'enc_latch'
+    flags = 0
+    value_map = [
+        ['enc_latch', 31, 32, int, TMCRegister.READONLY],
+    ]
+    _fields = ('enc_latch',)
+    _write_mask = 0x00000000
+
+    enc_latch = property(lambda self: (self._current() if self._volatile else self._word))
+
+
+class MicrostepCounterRegister(TMCRegister):
+    address = 0x6A
+    name = 'mscnt'
+    flags = 0
+    value_map = [
+        ['mscnt',  9, 10, int, TMCRegister.READONLY],
+    ]
+    _fields = ('mscnt',)
+    _write_mask = 0x00000000
+
+    mscnt = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FF)
+
+
+class MicrostepCurrentRegister(TMCRegister):
+    address = 0x6B
+    name = 'mscuract'
+    flags = 0
+    value_map = [
+        ['cur_a', 24,  9, int, TMCRegister.READONLY | TMCRegister.SIGNED],
+        ['cur_b',  8,  9, int, TMCRegister.READONLY | TMCRegister.SIGNED],
+    ]
+    _fields = ('cur_a', 'cur_b')
+    _write_mask = 0x00000000
+
+    cur_a = property(lambda self: ((self._current() if self._volatile else self._word) >> 16 & 0x1FF ^ 0x100) - 0x100)
+    cur_b = property(lambda self: ((self._current() if self._volatile else self._word) & 0x1FF ^ 0x100) - 0x100)
+
+
+class ChopperConfigRegister(TMCRegister):
+    address = 0x6C
+    name = 'chopconf'
+    flags = 0
+    value_map = [
+        ['diss2vs',      31,  1, bool],
+        ['diss2g',       30,  1, bool],
+        ['dedge',        29,  1, bool],
+        ['intpol',       28,  1, bool],
+        ['mres',         27,  4, int],
+        ['tpfd',         23,  4, int],
+        ['vhighchm',     19,  1, bool],
+        ['vhighfs',      18,  1, bool],
+        ['tbl',          16,  2, int],
+        ['chm',          14,  1, bool],
+        ['disfdcc',      12,  1, bool],
+        ['fd3',          11,  1, bool],
+        ['hend_offset',  10,  4, int],
+        ['hstrt_tfd210',  6,  3, int],
+        ['toff',          3,  4, int],
+    ]
+    _fields = ('diss2vs', 'diss2g', 'dedge', 'intpol', 'mres', 'tpfd', 'vhighchm', 'vhighfs', 'tbl', 'chm', 'disfdcc', 'fd3', 'hend_offset', 'hstrt_tfd210', 'toff')
+    _write_mask = 0xFFFDDFFF
+
+    diss2vs = property(lambda self: (self._current() if self._volatile else self._word) >> 31 != 0, field_setter(31, 0x1))
+    diss2g = property(lambda self: (self._current() if self._volatile else self._word) >> 30 & 0x1 != 0, field_setter(30, 0x1))
+    dedge = property(lambda self: (self._current() if self._volatile else self._word) >> 29 & 0x1 != 0, field_setter(29, 0x1))
+    intpol = property(lambda self: (self._current() if self._volatile else self._word) >> 28 & 0x1 != 0, field_setter(28, 0x1))
+    mres = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0xF, field_setter(24, 0xF))
+    tpfd = property(lambda self: (self._current() if self._volatile else self._word) >> 20 & 0xF, field_setter(20, 0xF))
+    vhighchm = property(lambda self: (self._current() if self._volatile else self._word) >> 19 & 0x1 != 0, field_setter(19, 0x1))
+    vhighfs = property(lambda self: (self._current() if self._volatile else self._word) >> 18 & 0x1 != 0, field_setter(18, 0x1))
+    tbl = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x3, field_setter(15, 0x3))
+    chm = property(lambda self: (self._current() if self._volatile else self._word) >> 14 & 0x1 != 0, field_setter(14, 0x1))
+    disfdcc = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0, field_setter(12, 0x1))
+    fd3 = property(lambda self: (self._current() if self._volatile else self._word) >> 11 & 0x1 != 0, field_setter(11, 0x1))
+    hend_offset = property(lambda self: (self._current() if self._volatile else self._word) >> 7 & 0xF, field_setter(7, 0xF))
+    hstrt_tfd210 = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x7, field_setter(4, 0x7))
+    toff = property(lambda self: (self._current() if self._volatile else self._word) & 0xF, field_setter(0, 0xF))
+
+
+class CoolstepConfigRegister(TMCRegister):
+    address = 0x6D
+    name = 'coolconf'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['sfilt',  24,  1, bool],
+        ['sgt',    22,  7, int, TMCRegister.SIGNED],
+        ['seimin', 15,  1, bool],
+        ['sedn',   14,  2, int],
+        ['semax',  11,  4, int],
+        ['seup',    6,  2, int],
+        ['semin',   3,  4, int],
+    ]
+    _fields = ('sfilt', 'sgt', 'seimin', 'sedn', 'semax', 'seup', 'semin')
+    _write_mask = 0x017FEF6F
+
+    sfilt = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0x1 != 0, field_setter(24, 0x1))
+    sgt = property(lambda self: ((self._current() if self._volatile else self._word) >> 16 & 0x7F ^ 0x40) - 0x40, field_setter(16, 0x7F))
+    seimin = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x1 != 0, field_setter(15, 0x1))
+    sedn = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x3, field_setter(13, 0x3))
+    semax = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0xF, field_setter(8, 0xF))
+    seup = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x3, field_setter(5, 0x3))
+    semin = property(lambda self: (self._current() if self._volatile else self._word) & 0xF, field_setter(0, 0xF))
+
+
+class DriveStatusRegister(TMCRegister):
+    address = 0x6F
+    name = 'drv_status'
+    flags = 0
+    value_map = [
+        ['stst',       31,  1, bool, TMCRegister.READONLY],
+        ['olb',        30,  1, bool, TMCRegister.READONLY],
+        ['ola',        29,  1, bool, TMCRegister.READONLY],
+        ['s2gb',       28,  1, bool, TMCRegister.READONLY],
+        ['s2ga',       27,  1, bool, TMCRegister.READONLY],
+        ['optw',       26,  1, bool, TMCRegister.READONLY],
+        ['ot',         25,  1, bool, TMCRegister.READONLY],
+        ['stallguard', 24,  1, bool, TMCRegister.READONLY],
+        ['cs_actual',  20,  5, int, TMCRegister.READONLY],
+        ['fsactive',   15,  1, bool, TMCRegister.READONLY],
+        ['stealth',    14,  1, bool, TMCRegister.READONLY],
+        ['s2vsb',      13,  1, bool, TMCRegister.READONLY],
+        ['s2vsa',      12,  1, bool, TMCRegister.READONLY],
+        ['sg_result',   9, 10, int, TMCRegister.READONLY],
+    ]
+    _fields = ('stst', 'olb', 'ola', 's2gb', 's2ga', 'optw', 'ot', 'stallguard', 'cs_actual', 'fsactive', 'stealth', 's2vsb', 's2vsa', 'sg_result')
+    _write_mask = 0x00000000
+
+    stst = property(lambda self: (self._current() if self._volatile else self._word) >> 31 != 0)
+    olb = property(lambda self: (self._current() if self._volatile else self._word) >> 30 & 0x1 != 0)
+    ola = property(lambda self: (self._current() if self._volatile else self._word) >> 29 & 0x1 != 0)
+    s2gb = property(lambda self: (self._current() if self._volatile else self._word) >> 28 & 0x1 != 0)
+    s2ga = property(lambda self: (self._current() if self._volatile else self._word) >> 27 & 0x1 != 0)
+    optw = property(lambda self: (self._current() if self._volatile else self._word) >> 26 & 0x1 != 0)
+    ot = property(lambda self: (self._current() if self._volatile else self._word) >> 25 & 0x1 != 0)
+    stallguard = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0x1 != 0)
+    cs_actual = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x1F)
+    fsactive = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x1 != 0)
+    stealth = property(lambda self: (self._current() if self._volatile else self._word) >> 14 & 0x1 != 0)
+    s2vsb = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x1 != 0)
+    s2vsa = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0)
+    sg_result = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FF)
+
+
+class PWMAutoRegister(TMCRegister):
+    address = 0x72
+    name = 'pwm_auto'
+    flags = 0
+    value_map = [
+        ['pwm_grad_auto', 23,  8, int, TMCRegister.READONLY],
+        ['pwm_ofs_auto',   7,  8, int, TMCRegister.READONLY],
+    ]
+    _fields = ('pwm_grad_auto', 'pwm_ofs_auto')
+    _write_mask = 0x00000000
+
+    pwm_grad_auto = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0xFF)
+    pwm_ofs_auto = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF)
@@ -0,0 +1,378 @@
+# Generated by regmapgen.py from register_maps.py; do not edit.
+from TMCRegister import TMCRegister, field_setter
+from _common_registers import (
+    GlobalScalerRegister,
+    PowerdownRegister,
+    TStepRegister,
+    TPWMThresholdRegister,
+    TCoolThreshold,
+    THighRegister,
+    XEncoderRegister,
+    EncoderConstantRegister,
+    EncoderStatusRegister,
+    EncoderLatchRegister,
+    MicrostepCounterRegister,
+    MicrostepCurrentRegister,
+    ChopperConfigRegister,
+    CoolstepConfigRegister,
+    DriveStatusRegister,
+    PWMAutoRegister,
+)
+
+
+class GlobalConfigRegister(TMCRegister):
+    address = 0x00
+    name = 'gconf'
+    flags = 0
+    value_map = [
+        ['direct_mode',      16,  1, bool],
+        ['stop_enable',      15,  1, bool],
+        ['small_hysteresis', 14,  1, bool],
+        ['diag1_pushpull',   13,  1, bool],
+        ['diag0_pushpull',   12,  1, bool],
+        ['diag1_onstate',    10,  1, bool],
+        ['diag1_index',       9,  1, bool],
+        ['diag1_stall',       8,  1, bool],
+        ['diag0_stall',       7,  1, bool],
+        ['diag0_otpw',        6,  1, bool],
+        ['diag0_error',       5,  1, bool],
+        ['shaft',             4,  1, bool],
+        ['multistep_filt',    3,  1, bool],
+        ['en_pwm_mode',       2,  1, bool],
+        ['fast_standstill',   1,  1, bool],
+    ]
+    _fields = ('direct_mode', 'stop_enable', 'small_hysteresis', 'diag1_pushpull', 'diag0_pushpull', 'diag1_onstate', 'diag1_index', 'diag1_stall', 'diag0_stall', 'diag0_otpw', 'diag0_error', 'shaft', 'multistep_filt', 'en_pwm_mode', 'fast_standstill')
+    _write_mask = 0x0001F7FE
+
+    direct_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x1 != 0, field_setter(16, 0x1))
+    stop_enable = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x1 != 0, field_setter(15, 0x1))
+    small_hysteresis = property(lambda self: (self._current() if self._volatile else self._word) >> 14 & 0x1 != 0, field_setter(14, 0x1))
+    diag1_pushpull = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x1 != 0, field_setter(13, 0x1))
+    diag0_pushpull = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0, field_setter(12, 0x1))
+    diag1_onstate = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0, field_setter(10, 0x1))
+    diag1_index = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0, field_setter(9, 0x1))
+    diag1_stall = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0, field_setter(8, 0x1))
+    diag0_stall = property(lambda self: (self._current() if self._volatile else self._word) >> 7 & 0x1 != 0, field_setter(7, 0x1))
+    diag0_otpw = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x1 != 0, field_setter(6, 0x1))
+    diag0_error = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0, field_setter(5, 0x1))
+    shaft = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    multistep_filt = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    en_pwm_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    fast_standstill = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+
+
+class GlobalStatusRegister(TMCRegister):
+    address = 0x01
+    name = 'gstat'
+    flags = 0
+    value_map = [
+        ['vm_uvlo',         4,  1, bool],
+        ['register_reset',  3,  1, bool],
+        ['uv_cp',           2,  1, bool],
+        ['drv_err',         1,  1, bool],
+        ['reset',           0,  1, bool],
+    ]
+    _fields = ('vm_uvlo', 'register_reset', 'uv_cp', 'drv_err', 'reset')
+    _write_mask = 0x0000001F
+
+    vm_uvlo = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    register_reset = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    uv_cp = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    drv_err = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    reset = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class IOInputRegister(TMCRegister):
+    address = 0x04
+    name = 'ioin'
+    flags = 0
+    value_map = [
+        ['version',     31,  8, int, TMCRegister.READONLY],
+        ['silicon_rev', 18,  3, int, TMCRegister.READONLY],
+        ['adc_err',     15,  1, bool, TMCRegister.READONLY],
+        ['ext_clk',     14,  1, bool, TMCRegister.READONLY],
+        ['ext_res_det', 13,  1, bool, TMCRegister.READONLY],
+        ['output',      12,  1, bool],
+        ['comp_b1_b2',  11,  1, bool, TMCRegister.READONLY],
+        ['comp_a1_a2',  10,  1, bool, TMCRegister.READONLY],
+        ['comp_b',       9,  1, bool, TMCRegister.READONLY],
+        ['comp_a',       8,  1, bool, TMCRegister.READONLY],
+        ['uart_en',      6,  1, bool, TMCRegister.READONLY],
+        ['encn',         5,  1, bool, TMCRegister.READONLY],
+        ['drv_enn',      4,  1, bool, TMCRegister.READONLY],
+        ['enca',         3,  1, bool, TMCRegister.READONLY],
+        ['encb',         2,  1, bool, TMCRegister.READONLY],
+        ['dir',          1,  1, bool, TMCRegister.READONLY],
+        ['step',         0,  1, bool, TMCRegister.READONLY],
+    ]
+    _fields = ('version', 'silicon_rev', 'adc_err', 'ext_clk', 'ext_res_det', 'output', 'comp_b1_b2', 'comp_a1_a2', 'comp_b', 'comp_a', 'uart_en', 'encn', 'drv_enn', 'enca', 'encb', 'dir', 'step')
+    _write_mask = 0x00001000
+
+    version = property(lambda self: (self._current() if self._volatile else self._word) >> 24)
+    silicon_rev = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x7)
+    adc_err = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x1 != 0)
+    ext_clk = property(lambda self: (self._current() if self._volatile else self._word) >> 14 & 0x1 != 0)
+    ext_res_det = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x1 != 0)
+    output = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0, field_setter(12, 0x1))
+    comp_b1_b2 = property(lambda self: (self._current() if self._volatile else self._word) >> 11 & 0x1 != 0)
+    comp_a1_a2 = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0)
+    comp_b = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0)
+    comp_a = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0)
+    uart_en = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x1 != 0)
+    encn = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0)
+    drv_enn = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0)
+    enca = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0)
+    encb = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0)
+    dir = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0)
+    step = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0)
+
+
+class DriveConfigRegister(TMCRegister):
+    address = 0x0A
+    name = 'drv_conf'
+    flags = 0
+    value_map = [
+        ['slope_control',  5,  2, int],
+        ['current_range',  1,  2, int],
+    ]
+    _fields = ('slope_control', 'current_range')
+    _write_mask = 0x00000033
+
+    slope_control = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x3, field_setter(4, 0x3))
+    current_range = property(lambda self: (self._current() if self._volatile else self._word) & 0x3, field_setter(0, 0x3))
+
+
+class CurrentRegister(TMCRegister):
+    address = 0x10
+    name = 'ihold_irun'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['irundelay',  27,  4, int],
+        ['iholddelay', 19,  4, int],
+        ['irun',       12,  5, int],
+        ['ihold',       4,  5, int],
+    ]
+    _fields = ('irundelay', 'iholddelay', 'irun', 'ihold')
+    _write_mask = 0x0F0F1F1F
+
+    irundelay = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0xF, field_setter(24, 0xF))
+    iholddelay = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0xF, field_setter(16, 0xF))
+    irun = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1F, field_setter(8, 0x1F))
+    ihold = property(lambda self: (self._current() if self._volatile else self._word) & 0x1F, field_setter(0, 0x1F))
+
+
+class DirectModeRegister(TMCRegister):
+    address = 0x2D
+    name = 'direct_mode'
+    flags = 0
+    value_map = [
+        ['direct_coil_b', 24,  9, int, TMCRegister.SIGNED],
+        ['direct_coil_a',  8,  9, int, TMCRegister.SIGNED],
+    ]
+    _fields = ('direct_coil_b', 'direct_coil_a')
+    _write_mask = 0x01FF01FF
+
+    direct_coil_b = property(lambda self: ((self._current() if self._volatile else self._word) >> 16 & 0x1FF ^ 0x100) - 0x100, field_setter(16, 0x1FF))
+    direct_coil_a = property(lambda self: ((self._current() if self._volatile else self._word) & 0x1FF ^ 0x100) - 0x100, field_setter(0, 0x1FF))
+
+
+class EncoderModeRegister(TMCRegister):
+    address = 0x38
+    name = 'encmode'
+    flags = 0
+    value_map = [
+        ['enc_sel_decimal', 10,  1, bool],
+        ['clr_enc_x',        8,  1, bool],
+        ['pos_neg_edge',     7,  2, int],
+        ['clr_once',         5,  1, bool],
+        ['clr_cont',         4,  1, bool],
+        ['ignore_ab',        3,  1, bool],
+        ['pol_n',            2,  1, bool],
+        ['pol_b',            1,  1, bool],
+        ['pol_a',            0,  1, bool],
+    ]
+    _fields = ('enc_sel_decimal', 'clr_enc_x', 'pos_neg_edge', 'clr_once', 'clr_cont', 'ignore_ab', 'pol_n', 'pol_b', 'pol_a')
+    _write_mask = 0x000005FF
+
+    enc_sel_decimal = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0, field_setter(10, 0x1))
+    clr_enc_x = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0, field_setter(8, 0x1))
+    pos_neg_edge = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x3, field_setter(6, 0x3))
+    clr_once = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0, field_setter(5, 0x1))
+    clr_cont = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    ignore_ab = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    pol_n = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    pol_b = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    pol_a = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class ADCRegister(TMCRegister):
+    address = 0x50
+    name = 'adc_vsupply_ain'
+    flags = 0
+    value_map = [
+        ['adc_ain',     28, 13, int, TMCRegister.READONLY],
+        ['adc_vsupply', 12, 13, int, TMCRegister.READONLY],
+    ]
+    _fields = ('adc_ain', 'adc_vsupply')
+    _write_mask = 0x00000000
+
+    adc_ain = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x1FFF)
+    adc_vsupply = property(lambda self: (self._current() if self._volatile else self._word) & 0x1FFF)
+
+
+class ADCTempRegister(TMCRegister):
+    address = 0x51
+    name = 'adc_temp'
+    flags = 0
+    value_map = [
+        ['adc_temp', 12, 13, int, TMCRegister.READONLY],
+    ]
+    _fields = ('adc_temp',)
+    _write_mask = 0x00000000
+
+    adc_temp = property(lambda self: (self._current() if self._volatile else self._word) & 0x1FFF)
+
+
+class OvertempOvervoltageRegister(TMCRegister):
+    address = 0x52
+    name = 'otw_ov_vth'
+    flags = 0
+    value_map = [
+        ['overtempprewarning_vth', 28, 13, int],
+        ['overvoltage_vth',        12, 13, int],
+    ]
+    _fields = ('overtempprewarning_vth', 'overvoltage_vth')
+    _write_mask = 0x1FFF1FFF
+
+    overtempprewarning_vth = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x1FFF, field_setter(16, 0x1FFF))
+    overvoltage_vth = property(lambda self: (self._current() if self._volatile else self._word) & 0x1FFF, field_setter(0, 0x1FFF))
+
+
+class PWMConfigRegister(TMCRegister):
+    address = 0x70
+    name = 'pwmconf'
+    flags = 0
+    value_map = [
+        ['pwm_lim',            31,  4, int],
+        ['pwm_reg',            27,  4, int],
+        ['pwm_dis_reg_stst',   23,  1, bool],
+        ['pwm_meas_sd_enable', 22,  1, bool],
+        ['freewheel',          21,  2, int],
+        ['pwm_autograd',       19,  1, bool],
+        ['pwm_autoscale',      18,  1, bool],
+        ['pwm_freq',           17,  2, int],
+        ['pwm_grad',           15,  8, int],
+        ['pwm_ofs',             7,  8, int],
+    ]
+    _fields = ('pwm_lim', 'pwm_reg', 'pwm_dis_reg_stst', 'pwm_meas_sd_enable', 'freewheel', 'pwm_autograd', 'pwm_autoscale', 'pwm_freq', 'pwm_grad', 'pwm_ofs')
+    _write_mask = 0xFFFFFFFF
+
+    pwm_lim = property(lambda self: (self._current() if self._volatile else self._word) >> 28, field_setter(28, 0xF))
+    pwm_reg = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0xF, field_setter(24, 0xF))
+    pwm_dis_reg_stst = property(lambda self: (self._current() if self._volatile else self._word) >> 23 & 0x1 != 0, field_setter(23, 0x1))
+    pwm_meas_sd_enable = property(lambda self: (self._current() if self._volatile else self._word) >> 22 & 0x1 != 0, field_setter(22, 0x1))
+    freewheel = property(lambda self: (self._current() if self._volatile else self._word) >> 20 & 0x3, field_setter(20, 0x3))
+    pwm_autograd = property(lambda self: (self._current() if self._volatile else self._word) >> 19 & 0x1 != 0, field_setter(19, 0x1))
+    pwm_autoscale = property(lambda self: (self._current() if self._volatile else self._word) >> 18 & 0x1 != 0, field_setter(18, 0x1))
+    pwm_freq = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x3, field_setter(16, 0x3))
+    pwm_grad = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0xFF, field_setter(8, 0xFF))
+    pwm_ofs = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF, field_setter(0, 0xFF))
+
+
+class PWMScaleRegister(TMCRegister):
+    address = 0x71
+    name = 'pwm_scale'
+    flags = 0
+    value_map = [
+        ['pwm_scale_auto', 24,  9, int, TMCRegister.READONLY | TMCRegister.SIGNED],
+        ['pwm_scale_sum',   9, 10, int, TMCRegister.READONLY],
+    ]
+    _fields = ('pwm_scale_auto', 'pwm_scale_sum')
+    _write_mask = 0x00000000
+
+    pwm_scale_auto = property(lambda self: ((self._current() if self._volatile else self._word) >> 16 & 0x1FF ^ 0x100) - 0x100)
+    pwm_scale_sum = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FF)
+
+
+class StallguardThresholdRegister(TMCRegister):
+    address = 0x74
+    name = 'sg4_thrs'
+    flags = 0
+    value_map = [
+        ['sg_angle_offset',  9,  1, bool],
+        ['sg4_filt_en',      8,  1, bool],
+        ['sg4_thrs',         7,  8, int],
+    ]
+    _fields = ('sg_angle_offset', 'sg4_filt_en', 'sg4_thrs')
+    _write_mask = 0x000003FF
+
+    sg_angle_offset = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0, field_setter(9, 0x1))
+    sg4_filt_en = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0, field_setter(8, 0x1))
+    sg4_thrs = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF, field_setter(0, 0xFF))
+
+
+class StallguardResultRegister(TMCRegister):
+    address = 0x75
+    name = 'sg4_result'
+    flags = 0
+    value_map = [
+        ['sg4_result',  9, 10, int, TMCRegister.READONLY],
+    ]
+    _fields = ('sg4_result',)
+    _write_mask = 0x00000000
+
+    sg4_result = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FF)
+
+
+class StallguardIndependentRegister(TMCRegister):
+    address = 0x76
+    name = 'sg4_ind'
+    flags = 0
+    value_map = [
+        ['sg4_ind_3', 31,  8, int, TMCRegister.READONLY],
+        ['sg4_ind_2', 23,  8, int, TMCRegister.READONLY],
+        ['sg4_ind_1', 15,  8, int, TMCRegister.READONLY],
+        ['sg4_ind_0',  7,  8, int, TMCRegister.READONLY],
+    ]
+    _fields = ('sg4_ind_3', 'sg4_ind_2', 'sg4_ind_1', 'sg4_ind_0')
+    _write_mask = 0x00000000
+
+    sg4_ind_3 = property(lambda self: (self._current() if self._volatile else self._word) >> 24)
+    sg4_ind_2 = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0xFF)
+    sg4_ind_1 = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0xFF)
+    sg4_ind_0 = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF)
+
+
+REGISTERS = (
+    GlobalConfigRegister,
+    GlobalStatusRegister,
+    IOInputRegister,
+    DriveConfigRegister,
+    GlobalScalerRegister,
+    CurrentRegister,
+    PowerdownRegister,
+    TStepRegister,
+    TPWMThresholdRegister,
+    TCoolThreshold,
+    THighRegister,
+    DirectModeRegister,
+    EncoderModeRegister,
+    XEncoderRegister,
+    EncoderConstantRegister,
+    EncoderStatusRegister,
+    EncoderLatchRegister,
+    ADCRegister,
+    ADCTempRegister,
+    OvertempOvervoltageRegister,
+    MicrostepCounterRegister,
+    MicrostepCurrentRegister,
+    ChopperConfigRegister,
+    CoolstepConfigRegister,
+    DriveStatusRegister,
+    PWMConfigRegister,
+    PWMScaleRegister,
+    PWMAutoRegister,
+    StallguardThresholdRegister,
+    StallguardResultRegister,
+    StallguardIndependentRegister,
+)
@@ -0,0 +1,474 @@
+# Generated by regmapgen.py from register_maps.py; do not edit.
+from TMCRegister import TMCRegister, field_setter
+from _common_registers import (
+    GlobalScalerRegister,
+    PowerdownRegister,
+    TStepRegister,
+    TPWMThresholdRegister,
+    TCoolThreshold,
+    THighRegister,
+    XEncoderRegister,
+    EncoderConstantRegister,
+    EncoderStatusRegister,
+    EncoderLatchRegister,
+    MicrostepCounterRegister,
+    MicrostepCurrentRegister,
+    ChopperConfigRegister,
+    CoolstepConfigRegister,
+    DriveStatusRegister,
+    PWMAutoRegister,
+)
+
+
+class GlobalConfigRegister(TMCRegister):
+    address = 0x00
+    name = 'gconf'
+    flags = 0
+    value_map = [
+        ['test_mode',           17,  1, bool],
+        ['direct_mode',         16,  1, bool],
+        ['stop_enable',         15,  1, bool],
+        ['small_hysteresis',    14,  1, bool],
+        ['diag1_pushpull',      13,  1, bool],
+        ['diag0_pushpull',      12,  1, bool],
+        ['diag1_steps_skipped', 11,  1, bool],
+        ['diag1_onstate',       10,  1, bool],
+        ['diag1_index',          9,  1, bool],
+        ['diag1_stall',          8,  1, bool],
+        ['diag0_stall',          7,  1, bool],
+        ['diag0_otpw',           6,  1, bool],
+        ['diag0_error',          5,  1, bool],
+        ['shaft',                4,  1, bool],
+        ['multistep_filt',       3,  1, bool],
+        ['en_pwm_mode',          2,  1, bool],
+        ['fast_standstill',      1,  1, bool],
+        ['recalibrate',          0,  1, bool],
+    ]
+    _fields = ('test_mode', 'direct_mode', 'stop_enable', 'small_hysteresis', 'diag1_pushpull', 'diag0_pushpull', 'diag1_steps_skipped', 'diag1_onstate', 'diag1_index', 'diag1_stall', 'diag0_stall', 'diag0_otpw', 'diag0_error', 'shaft', 'multistep_filt', 'en_pwm_mode', 'fast_standstill', 'recalibrate')
+    _write_mask = 0x0003FFFF
+
+    test_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 17 & 0x1 != 0, field_setter(17, 0x1))
+    direct_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x1 != 0, field_setter(16, 0x1))
+    stop_enable = property(lambda self: (self._current() if self._volatile else self._word) >> 15 & 0x1 != 0, field_setter(15, 0x1))
+    small_hysteresis = property(lambda self: (self._current() if self._volatile else self._word) >> 14 & 0x1 != 0, field_setter(14, 0x1))
+    diag1_pushpull = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x1 != 0, field_setter(13, 0x1))
+    diag0_pushpull = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0, field_setter(12, 0x1))
+    diag1_steps_skipped = property(lambda self: (self._current() if self._volatile else self._word) >> 11 & 0x1 != 0, field_setter(11, 0x1))
+    diag1_onstate = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0, field_setter(10, 0x1))
+    diag1_index = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0, field_setter(9, 0x1))
+    diag1_stall = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0, field_setter(8, 0x1))
+    diag0_stall = property(lambda self: (self._current() if self._volatile else self._word) >> 7 & 0x1 != 0, field_setter(7, 0x1))
+    diag0_otpw = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x1 != 0, field_setter(6, 0x1))
+    diag0_error = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0, field_setter(5, 0x1))
+    shaft = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    multistep_filt = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    en_pwm_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    fast_standstill = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    recalibrate = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class GlobalStatusRegister(TMCRegister):
+    address = 0x01
+    name = 'gstat'
+    flags = 0
+    value_map = [
+        ['uv_cp',    2,  1, bool],
+        ['drv_err',  1,  1, bool],
+        ['reset',    0,  1, bool],
+    ]
+    _fields = ('uv_cp', 'drv_err', 'reset')
+    _write_mask = 0x00000007
+
+    uv_cp = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    drv_err = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    reset = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class IOInputRegister(TMCRegister):
+    address = 0x04
+    name = 'ioin'
+    flags = 0
+    value_map = [
+        ['version',        31,  8, int, TMCRegister.READONLY],
+        ['swcomp_in',       7,  1, bool, TMCRegister.READONLY],
+        ['sd_mode',         6,  1, bool, TMCRegister.READONLY],
+        ['enc_n_dco_cfg6',  5,  1, bool, TMCRegister.READONLY],
+        ['drv_enn',         4,  1, bool, TMCRegister.READONLY],
+        ['enca_dcin_cfg5',  3,  1, bool, TMCRegister.READONLY],
+        ['encb_dcen_cfg4',  2,  1, bool, TMCRegister.READONLY],
+        ['refr_dir',        1,  1, bool, TMCRegister.READONLY],
+        ['refl_step',       0,  1, bool, TMCRegister.READONLY],
+    ]
+    _fields = ('version', 'swcomp_in', 'sd_mode', 'enc_n_dco_cfg6', 'drv_enn', 'enca_dcin_cfg5', 'encb_dcen_cfg4', 'refr_dir', 'refl_step')
+    _write_mask = 0x00000000
+
+    version = property(lambda self: (self._current() if self._volatile else self._word) >> 24)
+    swcomp_in = property(lambda self: (self._current() if self._volatile else self._word) >> 7 & 0x1 != 0)
+    sd_mode = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x1 != 0)
+    enc_n_dco_cfg6 = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0)
+    drv_enn = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0)
+    enca_dcin_cfg5 = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0)
+    encb_dcen_cfg4 = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0)
+    refr_dir = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0)
+    refl_step = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0)
+
+
+class DriveConfigRegister(TMCRegister):
+    address = 0x0A
+    name = 'drv_conf'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['filt_isense', 21,  2, int],
+        ['drvstrength', 19,  2, int],
+        ['otselect',    17,  2, int],
+        ['bbmclks',     11,  4, int],
+        ['bbmtime',      4,  5, int],
+    ]
+    _fields = ('filt_isense', 'drvstrength', 'otselect', 'bbmclks', 'bbmtime')
+    _write_mask = 0x003F0F1F
+
+    filt_isense = property(lambda self: (self._current() if self._volatile else self._word) >> 20 & 0x3, field_setter(20, 0x3))
+    drvstrength = property(lambda self: (self._current() if self._volatile else self._word) >> 18 & 0x3, field_setter(18, 0x3))
+    otselect = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x3, field_setter(16, 0x3))
+    bbmclks = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0xF, field_setter(8, 0xF))
+    bbmtime = property(lambda self: (self._current() if self._volatile else self._word) & 0x1F, field_setter(0, 0x1F))
+
+
+class CurrentRegister(TMCRegister):
+    address = 0x10
+    name = 'ihold_irun'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['iholddelay', 19,  4, int],
+        ['irun',       12,  5, int],
+        ['ihold',       4,  5, int],
+    ]
+    _fields = ('iholddelay', 'irun', 'ihold')
+    _write_mask = 0x000F1F1F
+
+    iholddelay = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0xF, field_setter(16, 0xF))
+    irun = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1F, field_setter(8, 0x1F))
+    ihold = property(lambda self: (self._current() if self._volatile else self._word) & 0x1F, field_setter(0, 0x1F))
+
+
+class RampModeRegister(TMCRegister):
+    address = 0x20
+    name = 'rampmode'
+    flags = 0
+    value_map = [
+        ['rampmode',  1,  2, int],
+    ]
+    _fields = ('rampmode',)
+    _write_mask = 0x00000003
+
+    rampmode = property(lambda self: (self._current() if self._volatile else self._word) & 0x3, field_setter(0, 0x3))
+
+
+class XActualRegister(TMCRegister):
+    address = 0x21
+    name = 'xactual'
+    flags = 0
+    value_map = [
+        ['xactual', 31, 32, int, TMCRegister.SIGNED],
+    ]
+    _fields = ('xactual',)
+    _write_mask = 0xFFFFFFFF
+
+    xactual = property(lambda self: ((self._current() if self._volatile else self._word) ^ 0x80000000) - 0x80000000, field_setter(0, 0xFFFFFFFF))
+
+
+class VActualRegister(TMCRegister):
+    address = 0x22
+    name = 'vactual'
+    flags = 0
+    value_map = [
+        ['vactual', 23, 24, int, TMCRegister.READONLY | TMCRegister.SIGNED],
+    ]
+    _fields = ('vactual',)
+    _write_mask = 0x00000000
+
+    vactual = property(lambda self: ((self._current() if self._volatile else self._word) & 0xFFFFFF ^ 0x800000) - 0x800000)
+
+
+class VStartRegister(TMCRegister):
+    address = 0x23
+    name = 'vstart'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['vstart', 17, 18, int],
+    ]
+    _fields = ('vstart',)
+    _write_mask = 0x0003FFFF
+
+    vstart = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FFFF, field_setter(0, 0x3FFFF))
+
+
+class A1Register(TMCRegister):
+    address = 0x24
+    name = 'a1'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['a1', 15, 16, int],
+    ]
+    _fields = ('a1',)
+    _write_mask = 0x0000FFFF
+
+    a1 = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFF, field_setter(0, 0xFFFF))
+
+
+class V1Register(TMCRegister):
+    address = 0x25
+    name = 'v1'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['v1', 19, 20, int],
+    ]
+    _fields = ('v1',)
+    _write_mask = 0x000FFFFF
+
+    v1 = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF, field_setter(0, 0xFFFFF))
+
+
+class AMaxRegister(TMCRegister):
+    address = 0x26
+    name = 'amax'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['amax', 15, 16, int],
+    ]
+    _fields = ('amax',)
+    _write_mask = 0x0000FFFF
+
+    amax = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFF, field_setter(0, 0xFFFF))
+
+
+class VMaxRegister(TMCRegister):
+    address = 0x27
+    name = 'vmax'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['vmax', 22, 23, int],
+    ]
+    _fields = ('vmax',)
+    _write_mask = 0x007FFFFF
+
+    vmax = property(lambda self: (self._current() if self._volatile else self._word) & 0x7FFFFF, field_setter(0, 0x7FFFFF))
+
+
+class DMaxRegister(TMCRegister):
+    address = 0x28
+    name = 'dmax'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['dmax', 15, 16, int],
+    ]
+    _fields = ('dmax',)
+    _write_mask = 0x0000FFFF
+
+    dmax = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFF, field_setter(0, 0xFFFF))
+
+
+class D1Register(TMCRegister):
+    address = 0x2A
+    name = 'd1'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['d1', 15, 16, int],
+    ]
+    _fields = ('d1',)
+    _write_mask = 0x0000FFFF
+
+    d1 = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFF, field_setter(0, 0xFFFF))
+
+
+class VStopRegister(TMCRegister):
+    address = 0x2B
+    name = 'vstop'
+    flags = TMCRegister.WRITEONLY
+    value_map = [
+        ['vstop', 17, 18, int],
+    ]
+    _fields = ('vstop',)
+    _write_mask = 0x0003FFFF
+
+    vstop = property(lambda self: (self._current() if self._volatile else self._word) & 0x3FFFF, field_setter(0, 0x3FFFF))
+
+
+class XTargetRegister(TMCRegister):
+    address = 0x2D
+    name = 'xtarget'
+    flags = 0
+    value_map = [
+        ['xtarget', 31, 32, int, TMCRegister.SIGNED],
+    ]
+    _fields = ('xtarget',)
+    _write_mask = 0xFFFFFFFF
+
+    xtarget = property(lambda self: ((self._current() if self._volatile else self._word) ^ 0x80000000) - 0x80000000, field_setter(0, 0xFFFFFFFF))
+
+
+class RampStatusRegister(TMCRegister):
+    address = 0x35
+    name = 'ramp_stat'
+    flags = 0
+    value_map = [
+        ['status_sg',         13,  1, bool, TMCRegister.READONLY],
+        ['second_move',       12,  1, bool],
+        ['t_zerowait_active', 11,  1, bool, TMCRegister.READONLY],
+        ['vzero',             10,  1, bool, TMCRegister.READONLY],
+        ['position_reached',   9,  1, bool, TMCRegister.READONLY],
+        ['velocity_reached',   8,  1, bool, TMCRegister.READONLY],
+        ['event_pos_reached',  7,  1, bool],
+        ['event_stop_sg',      6,  1, bool],
+        ['event_stop_r',       5,  1, bool],
+        ['event_stop_l',       4,  1, bool],
+        ['status_latch_r',     3,  1, bool],
+        ['status_latch_l',     2,  1, bool],
+        ['status_stop_r',      1,  1, bool, TMCRegister.READONLY],
+        ['status_stop_l',      0,  1, bool, TMCRegister.READONLY],
+    ]
+    _fields = ('status_sg', 'second_move', 't_zerowait_active', 'vzero', 'position_reached', 'velocity_reached', 'event_pos_reached', 'event_stop_sg', 'event_stop_r', 'event_stop_l', 'status_latch_r', 'status_latch_l', 'status_stop_r', 'status_stop_l')
+    _write_mask = 0x000010FC
+
+    status_sg = property(lambda self: (self._current() if self._volatile else self._word) >> 13 & 0x1 != 0)
+    second_move = property(lambda self: (self._current() if self._volatile else self._word) >> 12 & 0x1 != 0, field_setter(12, 0x1))
+    t_zerowait_active = property(lambda self: (self._current() if self._volatile else self._word) >> 11 & 0x1 != 0)
+    vzero = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0)
+    position_reached = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0)
+    velocity_reached = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0)
+    event_pos_reached = property(lambda self: (self._current() if self._volatile else self._word) >> 7 & 0x1 != 0, field_setter(7, 0x1))
+    event_stop_sg = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x1 != 0, field_setter(6, 0x1))
+    event_stop_r = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0, field_setter(5, 0x1))
+    event_stop_l = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    status_latch_r = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    status_latch_l = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    status_stop_r = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0)
+    status_stop_l = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0)
+
+
+class EncoderModeRegister(TMCRegister):
+    address = 0x38
+    name = 'encmode'
+    flags = 0
+    value_map = [
+        ['enc_sel_decimal', 10,  1, bool],
+        ['latch_x_act',      9,  1, bool],
+        ['clr_enc_x',        8,  1, bool],
+        ['pos_neg_edge',     7,  2, int],
+        ['clr_once',         5,  1, bool],
+        ['clr_cont',         4,  1, bool],
+        ['ignore_ab',        3,  1, bool],
+        ['pol_n',            2,  1, bool],
+        ['pol_b',            1,  1, bool],
+        ['pol_a',            0,  1, bool],
+    ]
+    _fields = ('enc_sel_decimal', 'latch_x_act', 'clr_enc_x', 'pos_neg_edge', 'clr_once', 'clr_cont', 'ignore_ab', 'pol_n', 'pol_b', 'pol_a')
+    _write_mask = 0x000007FF
+
+    enc_sel_decimal = property(lambda self: (self._current() if self._volatile else self._word) >> 10 & 0x1 != 0, field_setter(10, 0x1))
+    latch_x_act = property(lambda self: (self._current() if self._volatile else self._word) >> 9 & 0x1 != 0, field_setter(9, 0x1))
+    clr_enc_x = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0x1 != 0, field_setter(8, 0x1))
+    pos_neg_edge = property(lambda self: (self._current() if self._volatile else self._word) >> 6 & 0x3, field_setter(6, 0x3))
+    clr_once = property(lambda self: (self._current() if self._volatile else self._word) >> 5 & 0x1 != 0, field_setter(5, 0x1))
+    clr_cont = property(lambda self: (self._current() if self._volatile else self._word) >> 4 & 0x1 != 0, field_setter(4, 0x1))
+    ignore_ab = property(lambda self: (self._current() if self._volatile else self._word) >> 3 & 0x1 != 0, field_setter(3, 0x1))
+    pol_n = property(lambda self: (self._current() if self._volatile else self._word) >> 2 & 0x1 != 0, field_setter(2, 0x1))
+    pol_b = property(lambda self: (self._current() if self._volatile else self._word) >> 1 & 0x1 != 0, field_setter(1, 0x1))
+    pol_a = property(lambda self: (self._current() if self._volatile else self._word) & 0x1 != 0, field_setter(0, 0x1))
+
+
+class PWMConfigRegister(TMCRegister):
+    address = 0x70
+    name = 'pwmconf'
+    flags = 0
+    value_map = [
+        ['pwm_lim',       31,  4, int],
+        ['pwm_reg',       27,  4, int],
+        ['freewheel',     21,  2, int],
+        ['pwm_autograd',  19,  1, bool],
+        ['pwm_autoscale', 18,  1, bool],
+        ['pwm_freq',      17,  2, int],
+        ['pwm_grad',      15,  8, int],
+        ['pwm_ofs',        7,  8, int],
+    ]
+    _fields = ('pwm_lim', 'pwm_reg', 'freewheel', 'pwm_autograd', 'pwm_autoscale', 'pwm_freq', 'pwm_grad', 'pwm_ofs')
+    _write_mask = 0xFF3FFFFF
+
+    pwm_lim = property(lambda self: (self._current() if self._volatile else self._word) >> 28, field_setter(28, 0xF))
+    pwm_reg = property(lambda self: (self._current() if self._volatile else self._word) >> 24 & 0xF, field_setter(24, 0xF))
+    freewheel = property(lambda self: (self._current() if self._volatile else self._word) >> 20 & 0x3, field_setter(20, 0x3))
+    pwm_autograd = property(lambda self: (self._current() if self._volatile else self._word) >> 19 & 0x1 != 0, field_setter(19, 0x1))
+    pwm_autoscale = property(lambda self: (self._current() if self._volatile else self._word) >> 18 & 0x1 != 0, field_setter(18, 0x1))
+    pwm_freq = property(lambda self: (self._current() if self._volatile else self._word) >> 16 & 0x3, field_setter(16, 0x3))
+    pwm_grad = property(lambda self: (self._current() if self._volatile else self._word) >> 8 & 0xFF, field_setter(8, 0xFF))
+    pwm_ofs = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF, field_setter(0, 0xFF))
+
+
+class PWMScaleRegister(TMCRegister):
+    address = 0x71
+    name = 'pwm_scale'
+    flags = 0
+    value_map = [
+        ['pwm_scale_auto', 24,  9, int, TMCRegister.READONLY | TMCRegister.SIGNED],
+        ['pwm_scale_sum',   7,  8, int, TMCRegister.READONLY],
+    ]
+    _fields = ('pwm_scale_auto', 'pwm_scale_sum')
+    _write_mask = 0x00000000
+
+    pwm_scale_auto = property(lambda self: ((self._current() if self._volatile else self._word) >> 16 & 0x1FF ^ 0x100) - 0x100)
+    pwm_scale_sum = property(lambda self: (self._current() if self._volatile else self._word) & 0xFF)
+
+
+class LostStepsRegister(TMCRegister):
+    address = 0x73
+    name = 'lost_steps'
+    flags = 0
+    value_map = [
+        ['lost_steps', 19, 20, int, TMCRegister.READONLY],
+    ]
+    _fields = ('lost_steps',)
+    _write_mask = 0x00000000
+
+    lost_steps = property(lambda self: (self._current() if self._volatile else self._word) & 0xFFFFF)
+
+
+REGISTERS = (
+    GlobalConfigRegister,
+    GlobalStatusRegister,
+    IOInputRegister,
+    DriveConfigRegister,
+    GlobalScalerRegister,
+    CurrentRegister,
+    PowerdownRegister,
+    TStepRegister,
+    TPWMThresholdRegister,
+    TCoolThreshold,
+    THighRegister,
+    RampModeRegister,
+    XActualRegister,
+    VActualRegister,
+    VStartRegister,
+    A1Register,
+    V1Register,
+    AMaxRegister,
+    VMaxRegister,
+    DMaxRegister,
+    D1Register,
+    VStopRegister,
+    XTargetRegister,
+    RampStatusRegister,
+    EncoderModeRegister,
+    XEncoderRegister,
+    EncoderConstantRegister,
+    EncoderStatusRegister,
+    EncoderLatchRegister,
+    MicrostepCounterRegister,
+    MicrostepCurrentRegister,
+    ChopperConfigRegister,
+    CoolstepConfigRegister,
+    DriveStatusRegister,
+    PWMConfigRegister,
+    PWMScaleRegister,
+    PWMAutoRegister,
+    LostStepsRegister,
+)
@@ -0,0 +1,94 @@
+import argparse
+parser = argparse.ArgumentParser(description='Benchmarks the TMC register stack against the simulated SPI transport.')
+parser.add_argument('--save', metavar='PATH', help='Write the results as a baseline JSON file')
+parser.add_argument('--compare', metavar='PATH', help='Compare against a baseline JSON file and flag regressions')
+parser.add_argument('--threshold', type=float, default=0.20,
+                    help='Relative slowdown that counts as a regression (default: %(default)s)')
+parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions, the best is kept (default: %(default)s)')
+args = parser.parse_args()
+
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from TMCDriver import TMCDriver, TMCSPIWrapper
+from TMCSimulator import SimulatedTMC
+
+
+def best_ns(statement, number: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=args.repeat)) / number * 1e9
+
+
+def peak_allocated_bytes(statement, number = 100) -> float:
+    # Python keeps no allocation counter, so report the largest amount of memory a single call
+    # has allocated at once, transient objects included
+    statement()
+    tracemalloc.start()
+    peak = 0
+    for _ in range(number):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        statement()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return peak
+
+
+def new_driver(simulator: SimulatedTMC) -> TMCDriver:
+    return TMCDriver(spi=TMCSPIWrapper(transport=simulator))
+
+
+simulator = SimulatedTMC()
+driver = new_driver(simulator)
+drv_status = driver.drv_status
+reply = [0x08, 0x80, 0x1F, 0x01, 0x2C]
+
+results = {}
+
+results['decode_ns'] = best_ns(lambda: drv_status._update(reply), 100000)
+results['field_ns'] = best_ns(lambda: drv_status.sg_result, 100000)
+results['encode_ns'] = best_ns(lambda: drv_status._encode(), 100000)
+results['register_read_ns'] = best_ns(lambda: drv_status.read(), 20000)
+results['register_read_peak_bytes'] = peak_allocated_bytes(lambda: drv_status.read())
+results['snapshot_peak_bytes'] = peak_allocated_bytes(lambda: driver.read())
+
+# The simulator adds up the modelled wire time of each transfer without waiting for it
+start, start_bus_time = simulator.transfers, simulator.bus_time
+driver.read()
+results['snapshot_transfers'] = simulator.transfers - start
+results['snapshot_bus_time_ns'] = (simulator.bus_time - start_bus_time) * 1e9
+results['snapshot_ns'] = best_ns(lambda: driver.read(), 2000)
+
+results['construction_ns'] = best_ns(lambda: new_driver(simulator), 200)
+start = simulator.transfers
+new_driver(simulator)
+results['construction_transfers'] = simulator.transfers - start
+
+results['render_ns'] = best_ns(lambda: str(driver), 50)
+
+width = max(len(name) for name in results)
+for name, value in results.items():
+    print(f'{name:<{width}}  {value:,.1f}')
+
+if args.save:
+    with open(args.save, 'w') as f:
+        json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results}, f, indent=2)
+
+if args.compare:
+    with open(args.compare) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous in (None, 0):
+            continue
+        change = value / previous - 1
+        if change > args.threshold:
+            regressions.append(f'{name}: {previous:,.1f} -> {value:,.1f} (+{change:.0%})')
+
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+
+    sys.exit(1 if len(regressions) > 0 else 0)
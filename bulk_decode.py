@@ -0,0 +1,36 @@
+import numpy as np
+from TMCDriver import TMCRegister
+
+
+def decode_array(register_class, words: np.ndarray) -> {str: np.ndarray}:
+    # Decodes raw 32-bit register words into one column per field, using the same value_map
+    # the register class is built from, without constructing any register objects
+    words = np.asarray(words, dtype=np.uint32)
+    columns = {}
+
+    for name, start, length, T, *optional in register_class.value_map:
+        flags = optional[0] if len(optional) > 0 else 0
+        shift = start - length + 1
+
+        if flags & TMCRegister.SIGNED:
+            # Move the field to the top of the word, then sign-extend with an arithmetic shift
+            values = (words << np.uint32(31 - start)).view(np.int32) >> np.int32(32 - length)
+            columns[name] = values.astype(_dtype(length, signed=True))
+            continue
+
+        values = (words >> np.uint32(shift)) & np.uint32((1 << length) - 1)
+
+        if T is bool:
+            columns[name] = values != 0
+        else:
+            columns[name] = values.astype(_dtype(length, signed=False))
+
+    return columns
+
+
+def _dtype(length: int, signed: bool):
+    for bits, unsigned_type, signed_type in [(8, np.uint8, np.int8), (16, np.uint16, np.int16)]:
+        if length <= bits:
+            return signed_type if signed else unsigned_type
+
+    return np.int32 if signed else np.uint32
@@ -0,0 +1,2 @@
+# test.py and test_new.py are manual scripts for real hardware, not test modules
+collect_ignore = ['test.py', 'test_new.py']
@@ -0,0 +1,536 @@
+# Register maps of the supported chips, described as data. regmapgen.py validates them and
+# generates the _*_registers.py modules the drivers import; rerun it after editing this file.
+#
+# Each register is a dict with the generated class name, the register name used as the driver
+# attribute, its address and its fields. 'writeonly' registers are never read back.
+# Fields are [name, msb, width, type, *flags] with type 'bool' or 'int' and the optional flags
+# 'readonly' and 'signed' (two's complement).
+#
+# Registers in COMMON have the same layout on every chip that lists them and are generated once.
+
+COMMON = {
+    'global_scaler': {
+        'class': 'GlobalScalerRegister', 'name': 'global_scaler', 'address': 0x0B, 'writeonly': True,
+        'fields': [
+            ['globalscaler', 7, 8, 'int'],
+        ],
+    },
+    'tpowerdown': {
+        'class': 'PowerdownRegister', 'name': 'tpowerdown', 'address': 0x11, 'writeonly': True,
+        'fields': [
+            ['tpowerdown', 7, 8, 'int'],
+        ],
+    },
+    'tstep': {
+        'class': 'TStepRegister', 'name': 'tstep', 'address': 0x12,
+        'fields': [
+            ['tstep', 19, 20, 'int', 'readonly'],
+        ],
+    },
+    'tpwmthrs': {
+        'class': 'TPWMThresholdRegister', 'name': 'tpwmthrs', 'address': 0x13, 'writeonly': True,
+        'fields': [
+            ['tpwmthrs', 19, 20, 'int'],
+        ],
+    },
+    'tcoolthrs': {
+        'class': 'TCoolThreshold', 'name': 'tcoolthrs', 'address': 0x14, 'writeonly': True,
+        'fields': [
+            ['tcoolthrs', 19, 20, 'int'],
+        ],
+    },
+    'thigh': {
+        'class': 'THighRegister', 'name': 'thigh', 'address': 0x15, 'writeonly': True,
+        'fields': [
+            ['thigh', 19, 20, 'int'],
+        ],
+    },
+    'x_enc': {
+        'class': 'XEncoderRegister', 'name': 'x_enc', 'address': 0x39,
+        'fields': [
+            ['x_enc', 31, 32, 'int', 'signed'],
+        ],
+    },
+    'enc_const': {
+        'class': 'EncoderConstantRegister', 'name': 'enc_const', 'address': 0x3A, 'writeonly': True,
+        'fields': [
+            ['enc_const', 31, 32, 'int'],  # or fixed point, based on enc_sel_decimal
+        ],
+    },
+    'enc_status': {
+        'class': 'EncoderStatusRegister', 'name': 'enc_status', 'address': 0x3B,
+        'fields': [
+            ['deviation_warn', 1, 1, 'bool'],
+            ['n_event',        0, 1, 'bool'],
+        ],
+    },
+    'enc_latch': {
+        'class': 'EncoderLatchRegister', 'name': 'enc_latch', 'address': 0x3C,
+        'fields': [
+            ['enc_latch', 31, 32, 'int', 'readonly'],
+        ],
+    },
+    'mscnt': {
+        'class': 'MicrostepCounterRegister', 'name': 'mscnt', 'address': 0x6A,
+        'fields': [
+            ['mscnt', 9, 10, 'int', 'readonly'],
+        ],
+    },
+    'mscuract': {
+        'class': 'MicrostepCurrentRegister', 'name': 'mscuract', 'address': 0x6B,
+        'fields': [
+            ['cur_a', 24, 9, 'int', 'readonly', 'signed'],
+            ['cur_b',  8, 9, 'int', 'readonly', 'signed'],
+        ],
+    },
+    'chopconf': {
+        'class': 'ChopperConfigRegister', 'name': 'chopconf', 'address': 0x6C,
+        'fields': [
+            ['diss2vs',      31, 1, 'bool'],
+            ['diss2g',       30, 1, 'bool'],
+            ['dedge',        29, 1, 'bool'],
+            ['intpol',       28, 1, 'bool'],
+            ['mres',         27, 4, 'int'],
+            ['tpfd',         23, 4, 'int'],
+            ['vhighchm',     19, 1, 'bool'],
+            ['vhighfs',      18, 1, 'bool'],
+            ['tbl',          16, 2, 'int'],
+            ['chm',          14, 1, 'bool'],
+            ['disfdcc',      12, 1, 'bool'],
+            ['fd3',          11, 1, 'bool'],
+            ['hend_offset',  10, 4, 'int'],
+            ['hstrt_tfd210',  6, 3, 'int'],
+            ['toff',          3, 4, 'int'],
+        ],
+    },
+    'coolconf': {
+        'class': 'CoolstepConfigRegister', 'name': 'coolconf', 'address': 0x6D, 'writeonly': True,
+        'fields': [
+            ['sfilt',  24, 1, 'bool'],
+            ['sgt',    22, 7, 'int', 'signed'],
+            ['seimin', 15, 1, 'bool'],
+            ['sedn',   14, 2, 'int'],
+            ['semax',  11, 4, 'int'],
+            ['seup',    6, 2, 'int'],
+            ['semin',   3, 4, 'int'],
+        ],
+    },
+    'drv_status': {
+        'class': 'DriveStatusRegister', 'name': 'drv_status', 'address': 0x6F,
+        'fields': [
+            ['stst',       31, 1,  'bool', 'readonly'],
+            ['olb',        30, 1,  'bool', 'readonly'],
+            ['ola',        29, 1,  'bool', 'readonly'],
+            ['s2gb',       28, 1,  'bool', 'readonly'],
+            ['s2ga',       27, 1,  'bool', 'readonly'],
+            ['optw',       26, 1,  'bool', 'readonly'],
+            ['ot',         25, 1,  'bool', 'readonly'],
+            ['stallguard', 24, 1,  'bool', 'readonly'],
+            ['cs_actual',  20, 5,  'int',  'readonly'],
+            ['fsactive',   15, 1,  'bool', 'readonly'],
+            ['stealth',    14, 1,  'bool', 'readonly'],
+            ['s2vsb',      13, 1,  'bool', 'readonly'],
+            ['s2vsa',      12, 1,  'bool', 'readonly'],
+            ['sg_result',   9, 10, 'int',  'readonly'],
+        ],
+    },
+    'pwm_auto': {
+        'class': 'PWMAutoRegister', 'name': 'pwm_auto', 'address': 0x72,
+        'fields': [
+            ['pwm_grad_auto', 23, 8, 'int', 'readonly'],
+            ['pwm_ofs_auto',   7, 8, 'int', 'readonly'],
+        ],
+    },
+}
+
+TMC2240 = [
+    {
+        'class': 'GlobalConfigRegister', 'name': 'gconf', 'address': 0x00,
+        'fields': [
+            ['direct_mode',      16, 1, 'bool'],
+            ['stop_enable',      15, 1, 'bool'],
+            ['small_hysteresis', 14, 1, 'bool'],
+            ['diag1_pushpull',   13, 1, 'bool'],
+            ['diag0_pushpull',   12, 1, 'bool'],
+            ['diag1_onstate',    10, 1, 'bool'],
+            ['diag1_index',       9, 1, 'bool'],
+            ['diag1_stall',       8, 1, 'bool'],
+            ['diag0_stall',       7, 1, 'bool'],
+            ['diag0_otpw',        6, 1, 'bool'],
+            ['diag0_error',       5, 1, 'bool'],
+            ['shaft',             4, 1, 'bool'],
+            ['multistep_filt',    3, 1, 'bool'],
+            ['en_pwm_mode',       2, 1, 'bool'],
+            ['fast_standstill',   1, 1, 'bool'],
+        ],
+    },
+    {
+        'class': 'GlobalStatusRegister', 'name': 'gstat', 'address': 0x01,
+        'fields': [
+            ['vm_uvlo',        4, 1, 'bool'],
+            ['register_reset', 3, 1, 'bool'],
+            ['uv_cp',          2, 1, 'bool'],
+            ['drv_err',        1, 1, 'bool'],
+            ['reset',          0, 1, 'bool'],
+        ],
+    },
+    {
+        'class': 'IOInputRegister', 'name': 'ioin', 'address': 0x04,
+        'fields': [
+            ['version',     31, 8, 'int',  'readonly'],
+            ['silicon_rev', 18, 3, 'int',  'readonly'],
+            ['adc_err',     15, 1, 'bool', 'readonly'],
+            ['ext_clk',     14, 1, 'bool', 'readonly'],
+            ['ext_res_det', 13, 1, 'bool', 'readonly'],
+            ['output',      12, 1, 'bool'],
+            ['comp_b1_b2',  11, 1, 'bool', 'readonly'],
+            ['comp_a1_a2',  10, 1, 'bool', 'readonly'],
+            ['comp_b',       9, 1, 'bool', 'readonly'],
+            ['comp_a',       8, 1, 'bool', 'readonly'],
+            ['uart_en',      6, 1, 'bool', 'readonly'],
+            ['encn',         5, 1, 'bool', 'readonly'],
+            ['drv_enn',      4, 1, 'bool', 'readonly'],
+            ['enca',         3, 1, 'bool', 'readonly'],
+            ['encb',         2, 1, 'bool', 'readonly'],
+            ['dir',          1, 1, 'bool', 'readonly'],
+            ['step',         0, 1, 'bool', 'readonly'],
+        ],
+    },
+    {
+        'class': 'DriveConfigRegister', 'name': 'drv_conf', 'address': 0x0A,
+        'fields': [
+            ['slope_control', 5, 2, 'int'],
+            ['current_range', 1, 2, 'int'],
+        ],
+    },
+    COMMON['global_scaler'],
+    {
+        'class': 'CurrentRegister', 'name': 'ihold_irun', 'address': 0x10, 'writeonly': True,
+        'fields': [
+            ['irundelay',  27, 4, 'int'],
+            ['iholddelay', 19, 4, 'int'],
+            ['irun',       12, 5, 'int'],
+            ['ihold',       4, 5, 'int'],
+        ],
+    },
+    COMMON['tpowerdown'],
+    COMMON['tstep'],
+    COMMON['tpwmthrs'],
+    COMMON['tcoolthrs'],
+    COMMON['thigh'],
+    {
+        'class': 'DirectModeRegister', 'name': 'direct_mode', 'address': 0x2D,
+        'fields': [
+            ['direct_coil_b', 24, 9, 'int', 'signed'],
+            ['direct_coil_a',  8, 9, 'int', 'signed'],
+        ],
+    },
+    {
+        'class': 'EncoderModeRegister', 'name': 'encmode', 'address': 0x38,
+        'fields': [
+            ['enc_sel_decimal', 10, 1, 'bool'],
+            ['clr_enc_x',        8, 1, 'bool'],
+            ['pos_neg_edge',     7, 2, 'int'],
+            ['clr_once',         5, 1, 'bool'],
+            ['clr_cont',         4, 1, 'bool'],
+            ['ignore_ab',        3, 1, 'bool'],
+            ['pol_n',            2, 1, 'bool'],
+            ['pol_b',            1, 1, 'bool'],
+            ['pol_a',            0, 1, 'bool'],
+        ],
+    },
+    COMMON['x_enc'],
+    COMMON['enc_const'],
+    COMMON['enc_status'],
+    COMMON['enc_latch'],
+    {
+        'class': 'ADCRegister', 'name': 'adc_vsupply_ain', 'address': 0x50,
+        'fields': [
+            ['adc_ain',     28, 13, 'int', 'readonly'],
+            ['adc_vsupply', 12, 13, 'int', 'readonly'],
+        ],
+    },
+    {
+        'class': 'ADCTempRegister', 'name': 'adc_temp', 'address': 0x51,
+        'fields': [
+            ['adc_temp', 12, 13, 'int', 'readonly'],
+        ],
+    },
+    {
+        'class': 'OvertempOvervoltageRegister', 'name': 'otw_ov_vth', 'address': 0x52,
+        'fields': [
+            ['overtempprewarning_vth', 28, 13, 'int'],
+            ['overvoltage_vth',        12, 13, 'int'],
+        ],
+    },
+    COMMON['mscnt'],
+    COMMON['mscuract'],
+    COMMON['chopconf'],
+    COMMON['coolconf'],
+    COMMON['drv_status'],
+    {
+        'class': 'PWMConfigRegister', 'name': 'pwmconf', 'address': 0x70,
+        'fields': [
+            ['pwm_lim',            31, 4, 'int'],
+            ['pwm_reg',            27, 4, 'int'],
+            ['pwm_dis_reg_stst',   23, 1, 'bool'],
+            ['pwm_meas_sd_enable', 22, 1, 'bool'],
+            ['freewheel',          21, 2, 'int'],
+            ['pwm_autograd',       19, 1, 'bool'],
+            ['pwm_autoscale',      18, 1, 'bool'],
+            ['pwm_freq',           17, 2, 'int'],
+            ['pwm_grad',           15, 8, 'int'],
+            ['pwm_ofs',             7, 8, 'int'],
+        ],
+    },
+    {
+        'class': 'PWMScaleRegister', 'name': 'pwm_scale', 'address': 0x71,
+        'fields': [
+            ['pwm_scale_auto', 24, 9,  'int', 'readonly', 'signed'],
+            ['pwm_scale_sum',   9, 10, 'int', 'readonly'],
+        ],
+    },
+    COMMON['pwm_auto'],
+    {
+        'class': 'StallguardThresholdRegister', 'name': 'sg4_thrs', 'address': 0x74,
+        'fields': [
+            ['sg_angle_offset', 9, 1, 'bool'],
+            ['sg4_filt_en',     8, 1, 'bool'],
+            ['sg4_thrs',        7, 8, 'int'],
+        ],
+    },
+    {
+        'class': 'StallguardResultRegister', 'name': 'sg4_result', 'address': 0x75,
+        'fields': [
+            ['sg4_result', 9, 10, 'int', 'readonly'],
+        ],
+    },
+    {
+        'class': 'StallguardIndependentRegister', 'name': 'sg4_ind', 'address': 0x76,
+        'fields': [
+            ['sg4_ind_3', 31, 8, 'int', 'readonly'],
+            ['sg4_ind_2', 23, 8, 'int', 'readonly'],
+            ['sg4_ind_1', 15, 8, 'int', 'readonly'],
+            ['sg4_ind_0',  7, 8, 'int', 'readonly'],
+        ],
+    },
+]
+
+TMC5160 = [
+    {
+        'class': 'GlobalConfigRegister', 'name': 'gconf', 'address': 0x00,
+        'fields': [
+            ['test_mode',           17, 1, 'bool'],
+            ['direct_mode',         16, 1, 'bool'],
+            ['stop_enable',         15, 1, 'bool'],
+            ['small_hysteresis',    14, 1, 'bool'],
+            ['diag1_pushpull',      13, 1, 'bool'],
+            ['diag0_pushpull',      12, 1, 'bool'],
+            ['diag1_steps_skipped', 11, 1, 'bool'],
+            ['diag1_onstate',       10, 1, 'bool'],
+            ['diag1_index',          9, 1, 'bool'],
+            ['diag1_stall',          8, 1, 'bool'],
+            ['diag0_stall',          7, 1, 'bool'],
+            ['diag0_otpw',           6, 1, 'bool'],
+            ['diag0_error',          5, 1, 'bool'],
+            ['shaft',                4, 1, 'bool'],
+            ['multistep_filt',       3, 1, 'bool'],
+            ['en_pwm_mode',          2, 1, 'bool'],
+            ['fast_standstill',      1, 1, 'bool'],
+            ['recalibrate',          0, 1, 'bool'],
+        ],
+    },
+    {
+        'class': 'GlobalStatusRegister', 'name': 'gstat', 'address': 0x01,
+        'fields': [
+            ['uv_cp',   2, 1, 'bool'],
+            ['drv_err', 1, 1, 'bool'],
+            ['reset',   0, 1, 'bool'],
+        ],
+    },
+    {
+        'class': 'IOInputRegister', 'name': 'ioin', 'address': 0x04,
+        'fields': [
+            ['version',        31, 8, 'int',  'readonly'],
+            ['swcomp_in',       7, 1, 'bool', 'readonly'],
+            ['sd_mode',         6, 1, 'bool', 'readonly'],
+            ['enc_n_dco_cfg6',  5, 1, 'bool', 'readonly'],
+            ['drv_enn',         4, 1, 'bool', 'readonly'],
+            ['enca_dcin_cfg5',  3, 1, 'bool', 'readonly'],
+            ['encb_dcen_cfg4',  2, 1, 'bool', 'readonly'],
+            ['refr_dir',        1, 1, 'bool', 'readonly'],
+            ['refl_step',       0, 1, 'bool', 'readonly'],
+        ],
+    },
+    {
+        'class': 'DriveConfigRegister', 'name': 'drv_conf', 'address': 0x0A, 'writeonly': True,
+        'fields': [
+            ['filt_isense', 21, 2, 'int'],
+            ['drvstrength', 19, 2, 'int'],
+            ['otselect',    17, 2, 'int'],
+            ['bbmclks',     11, 4, 'int'],
+            ['bbmtime',      4, 5, 'int'],
+        ],
+    },
+    COMMON['global_scaler'],
+    {
+        'class': 'CurrentRegister', 'name': 'ihold_irun', 'address': 0x10, 'writeonly': True,
+        'fields': [
+            ['iholddelay', 19, 4, 'int'],
+            ['irun',       12, 5, 'int'],
+            ['ihold',       4, 5, 'int'],
+        ],
+    },
+    COMMON['tpowerdown'],
+    COMMON['tstep'],
+    COMMON['tpwmthrs'],
+    COMMON['tcoolthrs'],
+    COMMON['thigh'],
+    {
+        'class': 'RampModeRegister', 'name': 'rampmode', 'address': 0x20,
+        'fields': [
+            ['rampmode', 1, 2, 'int'],  # 0 positioning, 1 velocity +, 2 velocity -, 3 hold
+        ],
+    },
+    {
+        'class': 'XActualRegister', 'name': 'xactual', 'address': 0x21,
+        'fields': [
+            ['xactual', 31, 32, 'int', 'signed'],
+        ],
+    },
+    {
+        'class': 'VActualRegister', 'name': 'vactual', 'address': 0x22,
+        'fields': [
+            ['vactual', 23, 24, 'int', 'readonly', 'signed'],
+        ],
+    },
+    {
+        'class': 'VStartRegister', 'name': 'vstart', 'address': 0x23, 'writeonly': True,
+        'fields': [
+            ['vstart', 17, 18, 'int'],
+        ],
+    },
+    {
+        'class': 'A1Register', 'name': 'a1', 'address': 0x24, 'writeonly': True,
+        'fields': [
+            ['a1', 15, 16, 'int'],
+        ],
+    },
+    {
+        'class': 'V1Register', 'name': 'v1', 'address': 0x25, 'writeonly': True,
+        'fields': [
+            ['v1', 19, 20, 'int'],
+        ],
+    },
+    {
+        'class': 'AMaxRegister', 'name': 'amax', 'address': 0x26, 'writeonly': True,
+        'fields': [
+            ['amax', 15, 16, 'int'],
+        ],
+    },
+    {
+        'class': 'VMaxRegister', 'name': 'vmax', 'address': 0x27, 'writeonly': True,
+        'fields': [
+            ['vmax', 22, 23, 'int'],
+        ],
+    },
+    {
+        'class': 'DMaxRegister', 'name': 'dmax', 'address': 0x28, 'writeonly': True,
+        'fields': [
+            ['dmax', 15, 16, 'int'],
+        ],
+    },
+    {
+        'class': 'D1Register', 'name': 'd1', 'address': 0x2A, 'writeonly': True,
+        'fields': [
+            ['d1', 15, 16, 'int'],
+        ],
+    },
+    {
+        'class': 'VStopRegister', 'name': 'vstop', 'address': 0x2B, 'writeonly': True,
+        'fields': [
+            ['vstop', 17, 18, 'int'],
+        ],
+    },
+    {
+        'class': 'XTargetRegister', 'name': 'xtarget', 'address': 0x2D,
+        'fields': [
+            ['xtarget', 31, 32, 'int', 'signed'],
+        ],
+    },
+    {
+        'class': 'RampStatusRegister', 'name': 'ramp_stat', 'address': 0x35,
+        'fields': [
+            ['status_sg',         13, 1, 'bool', 'readonly'],
+            ['second_move',       12, 1, 'bool'],
+            ['t_zerowait_active', 11, 1, 'bool', 'readonly'],
+            ['vzero',             10, 1, 'bool', 'readonly'],
+            ['position_reached',   9, 1, 'bool', 'readonly'],
+            ['velocity_reached',   8, 1, 'bool', 'readonly'],
+            ['event_pos_reached',  7, 1, 'bool'],
+            ['event_stop_sg',      6, 1, 'bool'],
+            ['event_stop_r',       5, 1, 'bool'],
+            ['event_stop_l',       4, 1, 'bool'],
+            ['status_latch_r',     3, 1, 'bool'],
+            ['status_latch_l',     2, 1, 'bool'],
+            ['status_stop_r',      1, 1, 'bool', 'readonly'],
+            ['status_stop_l',      0, 1, 'bool', 'readonly'],
+        ],
+    },
+    {
+        'class': 'EncoderModeRegister', 'name': 'encmode', 'address': 0x38,
+        'fields': [
+            ['enc_sel_decimal', 10, 1, 'bool'],
+            ['latch_x_act',      9, 1, 'bool'],
+            ['clr_enc_x',        8, 1, 'bool'],
+            ['pos_neg_edge',     7, 2, 'int'],
+            ['clr_once',         5, 1, 'bool'],
+            ['clr_cont',         4, 1, 'bool'],
+            ['ignore_ab',        3, 1, 'bool'],
+            ['pol_n',            2, 1, 'bool'],
+            ['pol_b',            1, 1, 'bool'],
+            ['pol_a',            0, 1, 'bool'],
+        ],
+    },
+    COMMON['x_enc'],
+    COMMON['enc_const'],
+    COMMON['enc_status'],
+    COMMON['enc_latch'],
+    COMMON['mscnt'],
+    COMMON['mscuract'],
+    COMMON['chopconf'],
+    COMMON['coolconf'],
+    COMMON['drv_status'],
+    {
+        'class': 'PWMConfigRegister', 'name': 'pwmconf', 'address': 0x70,
+        'fields': [
+            ['pwm_lim',       31, 4, 'int'],
+            ['pwm_reg',       27, 4, 'int'],
+            ['freewheel',     21, 2, 'int'],
+            ['pwm_autograd',  19, 1, 'bool'],
+            ['pwm_autoscale', 18, 1, 'bool'],
+            ['pwm_freq',      17, 2, 'int'],
+            ['pwm_grad',      15, 8, 'int'],
+            ['pwm_ofs',        7, 8, 'int'],
+        ],
+    },
+    {
+        'class': 'PWMScaleRegister', 'name': 'pwm_scale', 'address': 0x71,
+        'fields': [
+            ['pwm_scale_auto', 24, 9, 'int', 'readonly', 'signed'],
+            ['pwm_scale_sum',   7, 8, 'int', 'readonly'],
+        ],
+    },
+    COMMON['pwm_auto'],
+    {
+        'class': 'LostStepsRegister', 'name': 'lost_steps', 'address': 0x73,
+        'fields': [
+            ['lost_steps', 19, 20, 'int', 'readonly'],
+        ],
+    },
+]
+
+CHIPS = {
+    'tmc2240': TMC2240,
+    'tmc5160': TMC5160,
+}
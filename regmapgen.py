@@ -0,0 +1,163 @@
+import argparse
+import os
+import sys
+import register_maps
+from TMCRegister import TMCRegister
+
+# Turns the register maps in register_maps.py into plain Python modules with every shift, mask and
+# field property written out, so importing a driver only executes class statements. Run it after
+# editing the maps; --check fails when the generated modules are out of date.
+
+HEADER = '# Generated by regmapgen.py from register_maps.py; do not edit.\n'
+COMMON_MODULE = '_common_registers'
+FLAGS = {'readonly': 'TMCRegister.READONLY', 'signed': 'TMCRegister.SIGNED'}
+TYPES = ['bool', 'int']
+
+
+def validate(chip: str, registers: [dict]):
+    seen = {'address': {}, 'name': {}, 'class': {}}
+
+    for register in registers:
+        label = f"{chip} {register['name']}"
+
+        if not 0 <= register['address'] <= 0x7F:
+            raise Exception(f"{label}: address 0x{register['address']:02X} is out of range")
+
+        for key, owners in seen.items():
+            if register[key] in owners:
+                raise Exception(f"{label}: {key} {register[key]!r} is already used by {owners[register[key]]}")
+            owners[register[key]] = register['name']
+
+        masks = {}
+        for name, msb, width, T, *flags in register['fields']:
+            field = f"{label}.{name}"
+
+            if name in masks:
+                raise Exception(f"{field}: defined twice")
+            if hasattr(TMCRegister, name):
+                raise Exception(f"{field}: name clashes with a TMCRegister attribute")
+            if T not in TYPES:
+                raise Exception(f"{field}: unknown type {T!r}")
+            if any(flag not in FLAGS for flag in flags):
+                raise Exception(f"{field}: unknown flags {flags}")
+            if width < 1 or msb > 31 or msb - width + 1 < 0:
+                raise Exception(f"{field}: bits {msb}:{msb - width + 1} do not fit a 32-bit word")
+            if T == 'bool' and width != 1:
+                raise Exception(f"{field}: bool fields must be one bit wide")
+            if 'signed' in flags and (T != 'int' or width < 2):
+                raise Exception(f"{field}: signed fields must be int and at least two bits wide")
+
+            mask = ((1 << width) - 1) << (msb - width + 1)
+            for other, other_mask in masks.items():
+                if mask & other_mask:
+                    raise Exception(f"{field}: overlaps {other}")
+            masks[name] = mask
+
+
+def generate_class(register: dict) -> str:
+    fields = register['fields']
+    pad = max(len(repr(name)) for name, *_ in fields)
+
+    lines = [
+        f"class {register['class']}(TMCRegister):",
+        f"    address = 0x{register['address']:02X}",
+        f"    name = {register['name']!r}",
+        f"    flags = {'TMCRegister.WRITEONLY' if register.get('writeonly') else 0}",
+        f"    value_map = [",
+    ]
+
+    for name, msb, width, T, *flags in fields:
+        flag_expr = ''.join(f", {FLAGS[flag]}" if index == 0 else f" | {FLAGS[flag]}" for index, flag in enumerate(flags))
+        lines.append(f"        [{repr(name) + ',':<{pad + 1}} {msb:>2}, {width:>2}, {T}{flag_expr}],")
+
+    write_mask = 0
+    for name, msb, width, T, *flags in fields:
+        if 'readonly' not in flags:
+            write_mask |= ((1 << width) - 1) << (msb - width + 1)
+
+    lines += [
+        f"    ]",
+        f"    _fields = {tuple(name for name, *_ in fields)!r}",
+        f"    _write_mask = 0x{write_mask:08X}",
+        "",
+    ]
+
+    for name, msb, width, T, *flags in fields:
+        shift = msb - width + 1
+        mask = (1 << width) - 1
+
+        word = "(self._current() if self._volatile else self._word)"
+        value = f"{word} >> {shift}" if shift > 0 else word
+        if msb < 31:
+            value += f" & 0x{mask:X}"
+
+        if 'signed' in flags:
+            sign = (mask + 1) >> 1
+            value = f"({value} ^ 0x{sign:X}) - 0x{sign:X}"
+        elif T == 'bool':
+            value += " != 0"
+
+        setter = '' if 'readonly' in flags else f", field_setter({shift}, 0x{mask:X})"
+        lines.append(f"    {name} = property(lambda self: {value}{setter})")
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_common() -> str:
+    classes = [generate_class(register) for register in register_maps.COMMON.values()]
+    return HEADER + "from TMCRegister import TMCRegister, field_setter\n\n\n" + '\n\n'.join(classes)
+
+
+def generate_chip(registers: [dict]) -> str:
+    common = [register for register in registers if any(register is shared for shared in register_maps.COMMON.values())]
+    own = [register for register in registers if not any(register is shared for shared in common)]
+
+    source = HEADER + "from TMCRegister import TMCRegister, field_setter\n"
+    if len(common) > 0:
+        source += f"from {COMMON_MODULE} import (\n" + ''.join(f"    {register['class']},\n" for register in common) + ")\n"
+
+    source += '\n\n' + '\n\n'.join(generate_class(register) for register in own)
+    source += '\n\nREGISTERS = (\n' + ''.join(f"    {register['class']},\n" for register in registers) + ')\n'
+    return source
+
+
+def generate() -> {str: str}:
+    # Validates every map and returns the generated source keyed by module name
+    for chip, registers in register_maps.CHIPS.items():
+        validate(chip, registers)
+
+    modules = {COMMON_MODULE: generate_common()}
+    for chip, registers in register_maps.CHIPS.items():
+        modules[f'_{chip}_registers'] = generate_chip(registers)
+
+    return modules
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates the register modules from register_maps.py.')
+    parser.add_argument('--check', action='store_true', help='Only report modules that are missing or out of date')
+    args = parser.parse_args()
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    stale = []
+
+    for module, source in generate().items():
+        path = os.path.join(directory, module + '.py')
+
+        current = None
+        if os.path.exists(path):
+            with open(path) as f:
+                current = f.read()
+
+        if current == source:
+            continue
+
+        stale.append(module)
+        if not args.check:
+            with open(path, 'w') as f:
+                f.write(source)
+
+    for module in stale:
+        print(f"{module}.py {'is out of date' if args.check else 'written'}")
+
+    sys.exit(1 if args.check and len(stale) > 0 else 0)
@@ -10,22 +10,32 @@ custom_logging.configure_logging(args.log_level)
 import logging
 from TMCDriver import TMCDriver
 from Motor import Motor
+from TelemetrySampler import TelemetrySampler
 
 driver = TMCDriver(spi_bus=0, spi_device=0)
 motor = Motor(stepPin=33, dirPin=31)
 
 logging.info('%s', driver)
+before = driver.snapshot(refresh=False)
 
 MICROSTEP = 4
 REVOLUTION = 200 * 90 * MICROSTEP
 
 
+sampler = TelemetrySampler(driver, {'tstep': 10})
+sampler.start()
+
 motor.forward()
 for i in range(REVOLUTION):
-    if (i%(REVOLUTION//10) == 0):
-        logging.info('TSTEP: %.1f', driver.tstep.tstep)
-        driver.tstep.read()
     motor.step()
 
+sampler.stop()
+
+_, tstep = sampler.drain('tstep', decode=True)
+for value in tstep['tstep']:
+    logging.info('TSTEP: %.1f', value)
+logging.info('%s', sampler.stats())
+logging.info('Changed: %s', driver.snapshot().diff(before))
+
 motor.close()
 driver.close()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import threading
+from TMCDriver import TMCSPIWrapper
+from TMCSPIArbiter import TMCSPIArbiter
+from TMCSimulator import SimulatedTMC, LatencyModel
+
+WORDS = {0x04: 0x40000000, 0x12: 0x000FFFFF, 0x6C: 0x10410153, 0x6F: 0x80000123}
+
+
+def new_arbiter(realtime = False) -> (TMCSPIArbiter, SimulatedTMC):
+    simulator = SimulatedTMC(latency=LatencyModel(realtime=realtime))
+    for address, word in WORDS.items():
+        simulator.poke(address, word)
+    return TMCSPIArbiter(TMCSPIWrapper(transport=simulator), chunk_size=4), simulator
+
+
+def word(reply: [hex, hex, hex, hex, hex]) -> int:
+    return (reply[1] << 24) | (reply[2] << 16) | (reply[3] << 8) | reply[4]
+
+
+def test_chunked_reads_keep_request_order():
+    arbiter, simulator = new_arbiter()
+    addresses = list(WORDS) * 5
+
+    replies = arbiter.read_many(addresses)
+
+    assert [word(reply) for reply in replies] == [WORDS[address] for address in addresses]
+
+
+def test_high_lane_preempts_a_low_lane_batch():
+    # Each transfer takes real time, so the low batch is still running when the high read arrives
+    arbiter, simulator = new_arbiter(realtime=True)
+    addresses = list(WORDS) * 100
+    finished = []
+    low_replies = []
+
+    def low():
+        with arbiter.priority(TMCSPIArbiter.LOW):
+            low_replies.extend(arbiter.read_many(addresses))
+        finished.append('low')
+
+    thread = threading.Thread(target=low)
+    thread.start()
+    while simulator.transfers < 10:
+        pass
+
+    with arbiter.priority(TMCSPIArbiter.HIGH):
+        high = arbiter.read(0x6F)
+    finished.append('high')
+    thread.join()
+
+    assert finished == ['high', 'low']
+    assert word(high) == WORDS[0x6F]
+    assert [word(reply) for reply in low_replies] == [WORDS[address] for address in addresses]
+    assert arbiter.stats()['high']['transactions'] == 1
@@ -0,0 +1,25 @@
+import numpy as np
+from bulk_decode import decode_array
+from TMCDriver import CoolstepConfigRegister, MicrostepCurrentRegister, XEncoderRegister
+
+
+def check_against_fields(RegisterClass, words: [int]):
+    columns = decode_array(RegisterClass, np.array(words, dtype=np.uint32))
+
+    for index, word in enumerate(words):
+        values = RegisterClass.decode(word).values()
+        assert {field: columns[field][index].item() for field in values} == values
+
+
+def test_signed_fields_match_the_register_properties():
+    # Both ends of each signed range, zero, -1 and a mix of neighbouring bits
+    check_against_fields(MicrostepCurrentRegister, [0x00000000, 0x01FF01FF, 0x01000100, 0x00FF00FF, 0xFFFFFFFF, 0x010000FF])
+    check_against_fields(CoolstepConfigRegister, [0x00000000, 0x003F0000, 0x00400000, 0x007F0000, 0xFFFFFFFF])
+    check_against_fields(XEncoderRegister, [0x00000000, 0x7FFFFFFF, 0x80000000, 0xFFFFFFFF])
+
+
+def test_signed_extremes():
+    columns = decode_array(MicrostepCurrentRegister, np.array([0x01000100, 0x00FF00FF], dtype=np.uint32))
+
+    assert columns['cur_a'].tolist() == [-256, 255]
+    assert columns['cur_b'].tolist() == [-256, 255]
@@ -0,0 +1,78 @@
+import sys
+import threading
+from TMCBus import TMCBus
+from TMCDriver import TMCDriver
+from TMCSimulator import SimulatedTMC, SimulatedChain
+
+
+def new_chain(length = 3) -> (TMCBus, [SimulatedTMC], SimulatedChain):
+    chips = [SimulatedTMC() for _ in range(length)]
+    for position, chip in enumerate(chips):
+        chip.poke(0x6F, 0x100 + position)
+        chip.poke(0x6C, 0x200 + position)
+
+    chain = SimulatedChain(chips)
+    bus = TMCBus(0)
+    bus.attach(0, chain)
+    bus.chain(0, length)
+    return bus, chips, chain
+
+
+def word(reply: [hex, hex, hex, hex, hex]) -> int:
+    return (reply[1] << 24) | (reply[2] << 16) | (reply[3] << 8) | reply[4]
+
+
+def test_read_many_all_returns_each_position_its_own_chip():
+    bus, chips, chain = new_chain()
+
+    replies = bus.read_many_all(0, [0x6F, 0x6C])
+
+    assert [[word(reply) for reply in chip_replies] for chip_replies in replies] == [[0x100, 0x200], [0x101, 0x201], [0x102, 0x202]]
+    assert chain.transfers == 3
+
+
+def test_write_all_writes_one_word_per_position():
+    bus, chips, chain = new_chain()
+
+    bus.write_all(0, 0x10, [[0x00, 0x00, 0x00, position + 1] for position in range(len(chips))])
+
+    assert [chip.peek(0x10) for chip in chips] == [1, 2, 3]
+
+
+def test_chip_handles_address_their_position():
+    bus, chips, chain = new_chain()
+    drivers = [TMCDriver(spi=bus.chip(0, position)) for position in range(len(chips))]
+
+    drivers[1].chopconf.toff = 5
+    drivers[1].flush()
+
+    assert [driver.drv_status.sg_result for driver in drivers] == [0x100, 0x101, 0x102]
+    assert [chip.peek(0x6C) & 0xF for chip in chips] == [0, 5, 2]
+
+
+def test_pipelined_reads_on_one_chain_do_not_interleave():
+    bus, chips, chain = new_chain(2)
+    drivers = [TMCDriver(spi=bus.chip(0, position)) for position in range(2)]
+    wrong = []
+
+    def read(driver, expected):
+        for _ in range(500):
+            driver.read('drv_status', 'chopconf')
+            if (driver.drv_status.word, driver.chopconf.word) != expected:
+                wrong.append(expected)
+
+    threads = [threading.Thread(target=read, args=(driver, (0x100 + position, 0x200 + position))) for position, driver in enumerate(drivers)]
+    threads.append(threading.Thread(target=lambda: [bus.read_all(0, 0x6F) for _ in range(500)]))
+
+    # Switch threads as often as possible, so an unlocked pipeline would be split
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert wrong == []
@@ -17,8 +17,6 @@ logging.info('%s', driver)
 driver.gconf.read()
 
 driver.gconf.diag0_pushpull = True
-
-driver.spi.write(driver.gconf.address, [0x03, 0x00, 0x00, 0x09])
-driver.gconf.read()
+driver.flush(verify=True)
 
 driver.close()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import threading
+import pytest
+from TMCDriver import TMCDriver, TMCSPIWrapper
+from TMCRegister import TMCRegister
+from TMCSimulator import SimulatedTMC
+from TMCStatus import TMCStatus
+
+
+def new_driver() -> (TMCDriver, SimulatedTMC):
+    simulator = SimulatedTMC()
+    return TMCDriver(spi=TMCSPIWrapper(transport=simulator)), simulator
+
+
+def run_with_timeout(function, timeout = 5.0):
+    # A deadlock would otherwise hang the whole run
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "deadlocked"
+
+
+def test_status_callback_reads_back_the_register_being_loaded():
+    driver, simulator = new_driver()
+    simulator.poke(0x6F, 0x80000123)
+    simulator.set_status(int(TMCStatus.SG2))
+
+    seen = []
+    driver.subscribe(TMCStatus.SG2, lambda flag, state: seen.append(driver.drv_status.sg_result))
+
+    run_with_timeout(lambda: driver.drv_status.stst)
+
+    assert seen == [0x123]
+    assert driver.drv_status.stst
+
+
+def test_status_callback_reads_back_with_always_refresh():
+    driver, simulator = new_driver()
+    simulator.poke(0x6F, 0x00000042)
+    driver.set_refresh(TMCRegister.ALWAYS, 'drv_status')
+    simulator.set_status(int(TMCStatus.SG2))
+
+    seen = []
+    driver.subscribe(TMCStatus.SG2, lambda flag, state: seen.append(driver.drv_status.sg_result))
+
+    run_with_timeout(lambda: driver.drv_status.sg_result)
+
+    assert seen == [0x42]
+
+
+def test_status_callback_reads_back_a_written_register():
+    driver, simulator = new_driver()
+    driver.chopconf.toff = 3
+    simulator.set_status(int(TMCStatus.SG2))
+
+    seen = []
+    driver.subscribe(TMCStatus.SG2, lambda flag, state: seen.append(driver.chopconf.toff))
+
+    run_with_timeout(driver.flush)
+
+    assert seen == [3]
+    assert not driver.chopconf.dirty
+
+
+def test_values_reads_the_register_once():
+    driver, simulator = new_driver()
+    simulator.poke(0x6F, 0x80000123)
+    driver.set_refresh(TMCRegister.ALWAYS, 'drv_status')
+
+    start = simulator.transfers
+    values = driver.drv_status.values()
+    str(driver.drv_status)
+
+    # One pipelined read costs two transfers
+    assert simulator.transfers - start == 4
+    assert values['stst'] and values['sg_result'] == 0x123
+
+
+def test_cached_copies_reject_changes():
+    driver, simulator = new_driver()
+    simulator.poke(0x6C, 0x00000003)
+    driver.read('chopconf')
+    copy = driver.chopconf.cached()
+
+    for change in (lambda: setattr(copy, 'toff', 5), copy.read, copy.write, lambda: copy.assign({'toff': 5})):
+        with pytest.raises(Exception, match='assign'):
+            change()
+
+    assert copy.toff == 3
+    assert not driver.chopconf.dirty
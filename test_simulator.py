@@ -0,0 +1,43 @@
+from TMCSimulator import SimulatedTMC
+from TMCStatus import TMCStatus
+
+
+def word(reply: [hex, hex, hex, hex, hex]) -> int:
+    return (reply[1] << 24) | (reply[2] << 16) | (reply[3] << 8) | reply[4]
+
+
+def test_reply_carries_the_previous_datagram():
+    simulator = SimulatedTMC()
+    simulator.poke(0x6F, 0x80000123)
+    simulator.poke(0x6C, 0x10410153)
+
+    assert word(simulator.xfer2([0x6F, 0, 0, 0, 0])) == 0
+    assert word(simulator.xfer2([0x6C, 0, 0, 0, 0])) == 0x80000123
+    assert word(simulator.xfer2([0x00, 0, 0, 0, 0])) == 0x10410153
+
+
+def test_writes_only_change_writable_bits():
+    simulator = SimulatedTMC()
+    simulator.poke(0x04, 0x40000000)
+
+    simulator.xfer2([0x04 | 0x80, 0xFF, 0xFF, 0xFF, 0xFF])
+
+    assert simulator.peek(0x04) >> 24 == 0x40
+
+
+def test_writeonly_registers_read_back_as_zero():
+    simulator = SimulatedTMC()
+
+    simulator.xfer2([0x6D | 0x80, 0x00, 0x01, 0x02, 0x03])
+    simulator.xfer2([0x6D, 0, 0, 0, 0])
+
+    assert simulator.peek(0x6D) == 0x00010203
+    assert word(simulator.xfer2([0x00, 0, 0, 0, 0])) == 0
+
+
+def test_reset_flag_until_gstat_is_cleared():
+    simulator = SimulatedTMC()
+
+    assert simulator.xfer2([0x01, 0, 0, 0, 0])[0] & TMCStatus.RESET_FLAG
+    assert word(simulator.xfer2([0x00, 0, 0, 0, 0])) & 0x01
+    assert not simulator.xfer2([0x00, 0, 0, 0, 0])[0] & TMCStatus.RESET_FLAG
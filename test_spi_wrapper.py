@@ -0,0 +1,46 @@
+from TMCDriver import TMCSPIWrapper
+from TMCMetrics import TMCMetrics
+from TMCSimulator import SimulatedTMC
+
+WORDS = {0x04: 0x40000000, 0x12: 0x000FFFFF, 0x6C: 0x10410153, 0x6F: 0x80000123}
+
+
+def new_wrapper() -> (TMCSPIWrapper, SimulatedTMC):
+    simulator = SimulatedTMC()
+    for address, word in WORDS.items():
+        simulator.poke(address, word)
+    return TMCSPIWrapper(transport=simulator), simulator
+
+
+def word(reply: [hex, hex, hex, hex, hex]) -> int:
+    return (reply[1] << 24) | (reply[2] << 16) | (reply[3] << 8) | reply[4]
+
+
+def test_read_many_returns_replies_in_request_order():
+    spi, simulator = new_wrapper()
+    addresses = [0x6F, 0x04, 0x6C, 0x12, 0x6F]
+
+    replies = spi.read_many(addresses)
+
+    assert [word(reply) for reply in replies] == [WORDS[address] for address in addresses]
+
+
+def test_read_many_costs_one_transfer_more_than_the_reads():
+    spi, simulator = new_wrapper()
+
+    spi.read_many(list(WORDS))
+    assert simulator.transfers == len(WORDS) + 1
+
+    spi.read_many([])
+    assert simulator.transfers == len(WORDS) + 1
+
+
+def test_observed_read_many_matches_the_plain_path():
+    spi, simulator = new_wrapper()
+    addresses = [0x6C, 0x6F, 0x04]
+    plain = spi.read_many(addresses)
+    spi.metrics = TMCMetrics('test')
+    observed = spi.read_many(addresses)
+
+    assert observed == plain
+    assert simulator.transfers == 2 * (len(addresses) + 1)
@@ -0,0 +1,12 @@
+import time
+
+
+def sleep_until(deadline: float, spin: float = 0.0002):
+    # time.sleep overshoots by the scheduler granularity, so sleep until just before the
+    # deadline and busy-wait the remainder against perf_counter
+    remaining = deadline - time.perf_counter()
+    if remaining > spin:
+        time.sleep(remaining - spin)
+
+    while time.perf_counter() < deadline:
+        pass
@@ -0,0 +1,228 @@
+import argparse
+import curses
+import time
+from TMCDriver import TMCDriver, TMCSPIWrapper
+from TMCStatus import TMCStatus
+from TelemetrySampler import TelemetrySampler
+
+# Refresh rates in Hz for registers that change on their own; everything else is read once.
+# Flags such as stallguard and ot live in drv_status, so that one is fast
+DEFAULT_RATES = {
+    'drv_status': 20.0,
+    'gstat':      2.0,
+    'tstep':      10.0,
+    'mscnt':      10.0,
+    'mscuract':   10.0,
+    'x_enc':      10.0,
+    'enc_status': 2.0,
+    'pwm_scale':  5.0,
+    'pwm_auto':   2.0,
+    'adc_vsupply_ain': 2.0,
+    'adc_temp':   2.0,
+    'sg4_result': 20.0,
+    'sg4_ind':    10.0,
+    'xactual':    20.0,
+    'vactual':    20.0,
+    'ramp_stat':  10.0,
+    'lost_steps': 5.0,
+}
+
+COLUMN_WIDTH = 30
+HEADER_LINES = 3
+
+
+def parse_rate(text: str) -> (str, float):
+    name, _, rate = text.partition('=')
+    if not rate:
+        raise argparse.ArgumentTypeError(f"expected name=hz, got {text!r}")
+    return name, float(rate)
+
+
+def open_driver(args):
+    if args.chip == '5160':
+        from TMC5160 import TMC5160 as Driver
+    else:
+        Driver = TMCDriver
+
+    if args.simulate:
+        from TMCSimulator import SimulatedTMC, LatencyModel
+        spi = TMCSPIWrapper(transport=SimulatedTMC(Driver.REGISTERS, latency=LatencyModel(realtime=True)), speed_hz=args.speed_hz)
+    else:
+        spi = TMCSPIWrapper(args.bus, args.device, speed_hz=args.speed_hz)
+
+    return Driver(spi=spi)
+
+
+class Monitor():
+    # Full-screen view of one driver. A TelemetrySampler re-reads each register at its own rate,
+    # and only fields whose text changed are redrawn. A rate of 0 reads the register once
+    def __init__(self, driver: TMCDriver, rates: {str: float}, names: [str] = None, fps = 20.0):
+        self.__driver = driver
+        self.__frame = 1.0 / fps
+
+        readable = driver.readable()
+        for name in list(rates) + list(names or []):
+            if name not in readable:
+                raise Exception(f"{name} is not a readable register of {type(driver).__name__}")
+
+        self.__names = names or readable
+        self.__rates = rates
+
+        self.__positions = {}
+        self.__shown = {}
+        self.__words = {}
+        self.__metrics = driver.enable_metrics('monitor')
+
+    def run(self, screen):
+        curses.curs_set(0)
+        screen.timeout(0)
+
+        # Only the registers that fit on screen are read
+        names = self.__layout(screen)
+        sampled = {name: self.__rates[name] for name in names if self.__rates.get(name, 0) > 0}
+
+        driver = self.__driver
+        driver.read(*names)
+        self.__draw(screen, {name: getattr(driver, name).word for name in names})
+
+        sampler = TelemetrySampler(driver, sampled, capacity=1) if len(sampled) > 0 else None
+        if sampler is not None:
+            sampler.start()
+
+        last = self.__metrics.snapshot()
+        last_time = time.perf_counter()
+        rates = (0.0, 0.0, 0.0)
+
+        try:
+            while True:
+                key = screen.getch()
+                if key in (ord('q'), ord('Q'), 27):
+                    return
+
+                if sampler is not None:
+                    # A failed read ends sampling; stop() below raises it once curses is gone
+                    if sampler.error is not None:
+                        return
+                    latest = {name: sampler.latest(name) for name in sampled}
+                    self.__draw(screen, {name: sample[1] for name, sample in latest.items() if sample is not None})
+
+                now = time.perf_counter()
+                if now - last_time >= 1.0:
+                    current = self.__metrics.snapshot()
+                    elapsed = now - last_time
+                    rates = ((current['transfers'] - last['transfers']) / elapsed,
+                             (current['bytes'] - last['bytes']) / elapsed,
+                             (current['busy_s'] - last['busy_s']) / elapsed)
+                    last, last_time = current, now
+
+                self.__header(screen, rates)
+                screen.refresh()
+
+                time.sleep(max(0.0, now + self.__frame - time.perf_counter()))
+        finally:
+            if sampler is not None:
+                sampler.stop()
+
+    def __layout(self, screen) -> [str]:
+        # Registers flow down columns; those that do not fit the terminal are left out. Returns
+        # the registers placed
+        height, width = screen.getmaxyx()
+        row, column = HEADER_LINES, 0
+        placed = []
+
+        for name in self.__names:
+            register = getattr(self.__driver, name)
+            lines = len(register._fields) + 2
+            if row + lines > height and row > HEADER_LINES:
+                row, column = HEADER_LINES, column + COLUMN_WIDTH
+            if column + COLUMN_WIDTH > width:
+                break
+
+            rate = f"{self.__rates[name]:g} Hz" if self.__rates.get(name, 0) > 0 else 'once'
+            _put(screen, row, column, f"{name} ({rate})"[:COLUMN_WIDTH - 1], curses.A_BOLD)
+            for index, field in enumerate(register._fields):
+                _put(screen, row + 1 + index, column, f"{field[:COLUMN_WIDTH - 12]:<{COLUMN_WIDTH - 12}}")
+                self.__positions[(name, field)] = (row + 1 + index, column + COLUMN_WIDTH - 11)
+
+            row += lines
+            placed.append(name)
+
+        return placed
+
+    def __draw(self, screen, words: {str: int}):
+        for name, word in words.items():
+            # Most reads return the same word; then no field needs formatting
+            if self.__words.get(name) == word:
+                continue
+            self.__words[name] = word
+
+            RegisterClass = type(getattr(self.__driver, name))
+            for field, value in RegisterClass.decode(word).values().items():
+                position = self.__positions.get((name, field))
+                if position is None:
+                    continue
+
+                text = f"{value!s:>10}"
+                if self.__shown.get((name, field)) == text:
+                    continue
+
+                self.__shown[(name, field)] = text
+                _put(screen, position[0], position[1], text, curses.A_REVERSE if value is True else curses.A_NORMAL)
+
+    def __header(self, screen, rates: (float, float, float)):
+        driver = self.__driver
+        transfers, throughput, busy = rates
+        flags = ' '.join(flag.name.lower() for flag in TMCStatus if flag in driver.status) or '-'
+
+        _put(screen, 0, 0, f"{type(driver).__name__} @ {driver.spi.speed_hz / 1e6:g} MHz    q to quit".ljust(80))
+        _put(screen, 1, 0, f"{transfers:8.0f} transfers/s  {throughput / 1000:8.1f} kB/s  bus {busy * 100:5.1f}%  status: {flags}".ljust(80))
+
+
+def _put(screen, row: int, column: int, text: str, attributes = 0):
+    # Writing the bottom-right cell raises in curses even though the text is drawn
+    try:
+        screen.addstr(row, column, text, attributes)
+    except curses.error:
+        pass
+
+
+def main(argv: [str] = None):
+    parser = argparse.ArgumentParser(description='Live register monitor for a TMC2240 or TMC5160.')
+    parser.add_argument('--chip', default='2240', choices=['2240', '5160'], help='Driver chip (default: %(default)s)')
+    parser.add_argument('--bus', type=int, default=0, help='SPI bus (default: %(default)s)')
+    parser.add_argument('--device', type=int, default=0, help='SPI chip select (default: %(default)s)')
+    parser.add_argument('--speed-hz', type=int, default=None, help='SPI clock (default: the calibrated or default clock)')
+    parser.add_argument('--clock-file', metavar='PATH', help='Take the SPI clock from an SPIClockCalibration file')
+    parser.add_argument('--rate', type=parse_rate, action='append', default=[], metavar='NAME=HZ',
+                        help='Refresh rate of a register, 0 to read it once; may be repeated')
+    parser.add_argument('--registers', metavar='NAMES', help='Comma-separated registers to show (default: all readable)')
+    parser.add_argument('--fps', type=float, default=20.0, help='Screen updates per second (default: %(default)s)')
+    parser.add_argument('--simulate', action='store_true', help='Run against the simulated chip instead of spidev')
+    args = parser.parse_args(argv)
+
+    if args.speed_hz is None and args.clock_file is not None:
+        from SPIClockCalibration import SPIClockCalibration
+        args.speed_hz = SPIClockCalibration.load(args.clock_file, args.bus, args.device)
+
+    driver = open_driver(args)
+    names = args.registers.split(',') if args.registers else None
+
+    readable = driver.readable()
+    for name in [name for name, _ in args.rate] + (names or []):
+        if name not in readable:
+            driver.close()
+            parser.error(f"{name} is not a readable register of {type(driver).__name__}")
+
+    rates = {name: rate for name, rate in DEFAULT_RATES.items() if name in readable and (names is None or name in names)}
+    rates.update(dict(args.rate))
+
+    try:
+        curses.wrapper(Monitor(driver, rates, names, args.fps).run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        driver.close()
+
+
+if __name__ == '__main__':
+    main()